@@ -0,0 +1,63 @@
+"""
+Time filter_dupes on generated release names (10000 by default) for a few kinds of upload.
+
+    python -m bench.dupe_filter [names] [rounds]
+"""
+import sys
+import time
+import random
+import asyncio
+import contextlib
+import bench  # noqa: F401
+from src.trackers.COMMON import COMMON
+
+PARTS = [
+    ['The.Show', 'Movie Name', 'Some-Film'],
+    ['2010', ''],
+    ['S01E02', 'S01', 'S02E05', 's01e03', ''],
+    ['1080p', '720p', '2160p', '480i', '576i', ''],
+    ['BluRay', 'WEB-DL', 'WEBDL', 'WEB DL', 'HDTV', 'UHD BluRay', 'DVD9', 'NTSC DVD'],
+    ['REMUX', ''],
+    ['HDR', 'DV', 'DoVi HDR10', 'HDR10+', ''],
+    ['REPACK', 'Repack', ''],
+    ['x264', 'x265', 'H.264', ''],
+]
+GROUPS = ['-GRP', '-FraMeSToR', '-Other', '']
+EXTENSIONS = ['', '.mkv', '.m2ts', '.iso']
+
+UPLOADS = {
+    "TV episode": dict(is_disc='', category='TV', season='S01', episode='E02', resolution='1080p', source='WEB', hdr='',
+                       tag='-GRP', uuid='The.Show.S01E02', name='The Show S01E02 1080p WEB-DL', video_encode=None, sd=0),
+    "UHD remux": dict(is_disc='', category='MOVIE', season='', episode='', resolution='2160p', source='BluRay', hdr='DV HDR',
+                      tag='-FraMeSToR', uuid='Movie.REPACK', name='Movie 2160p UHD BluRay REMUX', video_encode=None, sd=0),
+    "DVD": dict(is_disc='DVD', category='MOVIE', season='', episode='', resolution='480i', source='NTSC DVD', hdr='',
+                tag='-GRP', uuid='Movie', name='Movie NTSC DVD9', video_encode='x264', sd=1),
+}
+
+
+def release_names(count, seed=0):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        separator = rng.choice(['.', ' '])
+        name = separator.join(part for part in (rng.choice(choices) for choices in PARTS) if part)
+        names.append(f"{name}{rng.choice(GROUPS)}{rng.choice(EXTENSIONS)}")
+    return names
+
+
+async def main(count, rounds):
+    common = COMMON(config={})
+    names = release_names(count)
+    for label, meta in UPLOADS.items():
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            # filter_dupes logs the kept names, which is not what is timed here
+            with contextlib.redirect_stdout(None):
+                kept = await common.filter_dupes(list(names), dict(meta, debug=False), "BLU")
+            timings.append(time.perf_counter() - start)
+        print(f"{label}: {min(timings) * 1000:.1f} ms best of {rounds} for {count} names, {len(kept)} kept")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000, int(sys.argv[2]) if len(sys.argv) > 2 else 5))
@@ -0,0 +1,80 @@
+"""
+Time and measure giving every tracker its own meta, as a deep copy and as a MetaView, for a multi-disc BDMV upload.
+
+    python -m bench.metaview [trackers] [discs]
+"""
+import sys
+import copy
+import time
+import random
+import string
+import tracemalloc
+import bench  # noqa: F401
+from src.metaview import MetaView
+
+rng = random.Random(0)
+
+
+def text(length):
+    return ''.join(rng.choices(string.ascii_letters, k=length))
+
+
+def track(kind):
+    return {'@type': kind, 'Format': "AVC", 'BitRate': "35000000", 'extra': {text(8): text(40) for _ in range(30)}}
+
+
+def bdmv_meta(discs):
+    """
+    Meta shaped like prep's for a Blu-ray box set: BDInfo and a full summary per disc, MediaInfo, images and IMDb data.
+    """
+    disc_list = [{
+        'type': "BDMV",
+        'name': f"DISC{i}",
+        'summary': text(20000),
+        'playlists': [{'file': text(10), 'items': [text(30) for _ in range(50)]} for _ in range(40)],
+        'bdinfo': {
+            'video': [track('Video') for _ in range(3)],
+            'audio': [track('Audio') for _ in range(12)],
+            'subtitles': [text(60) for _ in range(30)],
+            'files': [{'file': text(12), 'size': rng.randint(1, 1 << 30)} for _ in range(300)],
+        },
+    } for i in range(discs)]
+    meta = {
+        'name': "Some Movie 2010 1080p BluRay", 'tag': "-GRP", 'debug': False, 'unattended': True, 'skipping': None,
+        'discs': disc_list,
+        'bdinfo': disc_list[0]['bdinfo'],
+        'mediainfo': {'media': {'track': [track('Video') for _ in range(40)]}},
+        'image_list': [{'raw_url': text(60), 'web_url': text(60), 'img_url': text(60)} for _ in range(30)],
+        'imdb_info': {'aka': text(30), 'plot': text(500), 'cast': [text(20) for _ in range(200)]},
+        'trackers': ["BLU"] * 25,
+    }
+    meta.update({f"key_{i}": text(20) for i in range(80)})
+    return meta
+
+
+def per_tracker(meta, make, trackers):
+    """
+    What process_all_trackers does with each tracker's meta: a few writes, and reads of the large parts.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    views = [make(meta) for _ in range(trackers)]
+    for view in views:
+        view['name'] = view['name'].replace(" DUPE?", "")
+        view['skipping'] = None
+        view['we_asked'] = False
+        view['discs'][0]['name']
+        view.get('trackers')
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    trackers = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    discs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    meta = bdmv_meta(discs)
+    for label, make in (("deepcopy", copy.deepcopy), ("MetaView", MetaView)):
+        elapsed, peak = per_tracker(meta, make, trackers)
+        print(f"{label}: {elapsed * 1000:.1f} ms, {peak / 1048576:.1f} MiB peak for {trackers} trackers on a {discs} disc BDMV")
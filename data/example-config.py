@@ -85,6 +85,49 @@ config = {
         # Play the bell sound effect when asking for confirmation
         "sfx_on_prompt": True,
 
+        # Before reusing a .torrent from the client, verify this many random pieces plus the first and last
+        # piece of every file against the local data. 0 disables the spot check, --rehash always hashes everything
+        "reuse_spot_check": "0",
+
+        # Start reusing/hashing BASE.torrent in the background as soon as the file list is known,
+        # instead of after metadata, dupe checking and screenshots have finished
+        "background_hashing": True,
+
+        # While the "Is this correct?" prompt waits, already search the trackers for dupes and take the screenshots.
+        # The searches are used if the name is confirmed without edits, screenshots are kept either way
+        "speculative_prep": False,
+
+        # Backend used to hash new torrents: "torf", "parallel" (multi-threaded, in process) or "mktorrent" (must be installed)
+        # "auto" uses the fastest backend measured with --bench-hash for the disk being hashed, or torf if none was measured
+        "hash_backend": "auto",
+
+        # How many disk heavy stages (hashing, screenshots, MediaInfo, BDInfo) may read from the same disk at once
+        # 0 = automatic: one at a time on spinning disks, unlimited on SSDs
+        "io_device_limit": 0,
+
+        # Per-host request limits as requests per second and burst size, a host also covers its subdomains
+        # PTP (1 per second) and SN (1 per 16 seconds, bursts of 3) are limited by default, set a rate of 0 to disable
+        "rate_limits": {
+            # "hdbits.org": {"rate": 1, "burst": 5},
+        },
+
+        # Seconds to reuse a tracker's dupe search results for later items of a queue with the same search (0 disables)
+        # UNIT3D trackers are searched once per show, the episodes of a season pack or queue are matched from that
+        # --recheck-dupes always searches again
+        "dupe_cache_ttl": 900,
+
+        # On-disk cache of TMDb, IMDb, TVmaze, AniList and srrdb answers (data/metadata_cache.db), reused across runs
+        # ttl is in seconds per source, the least recently used answers are dropped past max_size_mb
+        # offline (or --offline) only answers from the cache and never contacts those sites
+        "metadata_cache": {
+            "enabled": True,
+            "max_size_mb": 64,
+            "offline": False,
+            "ttl": {
+                # "tmdb": 259200, "imdb": 604800, "tvmaze": 86400, "anilist": 604800, "srrdb": 2592000,
+            },
+        },
+
         # How many trackers need to pass successfull checking to continue with the upload process
         # Default = 1. If 1 (or more) tracker/s pass banned_group and dupe checking, uploading will continue
         # If less than the number of trackers pass the checking, exit immediately.
@@ -364,6 +407,8 @@ config = {
 
     # enable_search to True will automatically try and find a suitable hash to save having to rehash when creating torrents
     # Should use the qbit API, but will also use the torrent_storage_dir to find suitable hashes
+    # With torrent_storage_dir set, the search uses a local index of that folder (data/torrent_index.db) for qbit, rtorrent and deluge
+    # Set "torrent_index": False on a client to use the qbit API search instead
     # If you find issue, use the "--debug" argument to print out some related details
     "TORRENT_CLIENTS": {
         # Name your torrent clients here, for example, this example is named "Client1" and is set as default_torrent_client above
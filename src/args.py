@@ -81,11 +81,14 @@ class Args():
         parser.add_argument('-hc', '--hardcoded-subs', action='store_true', required=False, help="Contains hardcoded subs", dest="hardcoded-subs")
         parser.add_argument('-pr', '--personalrelease', action='store_true', required=False, help="Personal Release")
         parser.add_argument('-sdc', '--skip-dupe-check', action='store_true', required=False, help="Pass if you know this is a dupe (Skips dupe check)", dest="dupe")
+        parser.add_argument('-rdc', '--recheck-dupes', action='store_true', required=False, help="Search trackers for dupes again instead of using results cached earlier in this run", dest="recheck_dupes")
+        parser.add_argument('-off', '--offline', action='store_true', required=False, help="Only use TMDb/IMDb/TVmaze/AniList/srrdb answers already in the metadata cache, never ask those sites")
         parser.add_argument('-debug', '--debug', action='store_true', required=False, help="Debug Mode, will run through all the motions providing extra info, but will not upload to trackers.")
         parser.add_argument('-ffdebug', '--ffdebug', action='store_true', required=False, help="Will show info from ffmpeg while taking screenshots.")
         parser.add_argument('-mps', '--max-piece-size', nargs='*', required=False, help="Set max piece size allowed in MiB for default torrent creation (default 256 MiB)", choices=['2', '4', '8', '16', '32', '64', '128', '256'])
         parser.add_argument('-nh', '--nohash', action='store_true', required=False, help="Don't hash .torrent")
         parser.add_argument('-rh', '--rehash', action='store_true', required=False, help="DO hash .torrent")
+        parser.add_argument('-sc', '--spot-check', dest='spot_check', nargs='*', required=False, help="Verify this many random pieces (plus the first and last piece of each file) before reusing a .torrent", type=str)
         parser.add_argument('-dr', '--draft', action='store_true', required=False, help="Send to drafts (BHD, LST)")
         parser.add_argument('-mq', '--modq', action='store_true', required=False, help="Send to modQ")
         parser.add_argument('-client', '--client', nargs='*', required=False, help="Use this torrent client instead of default")
@@ -98,6 +101,8 @@ class Args():
         parser.add_argument('-uac', '--unattended-confirm', action='store_true', required=False, help=argparse.SUPPRESS)
         parser.add_argument('-vs', '--vapoursynth', action='store_true', required=False, help="Use vapoursynth for screens (requires vs install)")
         parser.add_argument('-cleanup', '--cleanup', action='store_true', required=False, help="Clean up tmp directory")
+        parser.add_argument('-bii', '--build-imdb-index', dest='build_imdb_index', action='store_true', required=False, help="Index the IMDb title.basics/title.akas(/title.ratings) .tsv(.gz) dumps in the given path for offline title searches")
+        parser.add_argument('-bh', '--bench-hash', dest='bench_hash', action='store_true', required=False, help="Benchmark the hashing backends on the given path and remember the fastest for its disk")
         parser.add_argument('-fl', '--freeleech', nargs='*', required=False, help="Freeleech Percentage", default=0, dest="freeleech")
         parser.add_argument('--infohash', nargs='*', required=False, help="V1 Info Hash")
         args, before_args = parser.parse_known_args(input)
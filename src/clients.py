@@ -9,13 +9,61 @@ import base64
 from pyrobase.parts import Bunch
 import errno
 import asyncio
+import hashlib
+import random
 import ssl
 import shutil
 import time
+import threading
 from src.console import console
+from src.torrentcreate import wait_for_base_torrent
+from src.torrentindex import TorrentIndex
+from src.metainfo import Metainfo
 import re
 
 
+# One logged in qBittorrent client per configured connection, for the lifetime of the process
+_qbit_connections = {}
+
+
+class QbitConnection():
+    """
+    Shared qbittorrentapi client that logs in on first use, logs in again when the session
+    expires (403), and runs every call in a worker thread so the event loop keeps going.
+    """
+    def __init__(self, client):
+        self.client = qbittorrentapi.Client(
+            host=client['qbit_url'],
+            port=client['qbit_port'],
+            username=client['qbit_user'],
+            password=client['qbit_pass'],
+            VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
+        )
+        self._lock = threading.Lock()
+        self._logged_in = False
+
+    def _login(self, force=False):
+        with self._lock:
+            if force or not self._logged_in:
+                self._logged_in = False
+                self.client.auth_log_in()
+                self._logged_in = True
+
+    def _call(self, method, args, kwargs):
+        self._login()
+        try:
+            return getattr(self.client, method)(*args, **kwargs)
+        except qbittorrentapi.Forbidden403Error:
+            self._login(force=True)
+            return getattr(self.client, method)(*args, **kwargs)
+
+    async def login(self):
+        await asyncio.to_thread(self._login)
+
+    async def call(self, method, *args, **kwargs):
+        return await asyncio.to_thread(self._call, method, args, kwargs)
+
+
 class Clients():
     """
     Add to torrent client
@@ -24,15 +72,30 @@ class Clients():
         self.config = config
         pass
 
+    def qbit_connection(self, client):
+        key = (client['qbit_url'], str(client['qbit_port']), client['qbit_user'])
+        if key not in _qbit_connections:
+            _qbit_connections[key] = QbitConnection(client)
+        return _qbit_connections[key]
+
     async def add_to_client(self, meta, tracker):
-        torrent_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent"
+        await self.add_to_client_batch(meta, [tracker])
+
+    async def add_to_client_batch(self, meta, trackers):
+        """
+        Add the torrents of every tracker uploaded to in one go, with one confirmation round trip.
+        """
         if meta.get('no_seed', False) is True:
             console.print("[bold red]--no-seed was passed, so the torrent will not be added to the client")
             console.print("[bold yellow]Add torrent manually to the client")
             return
-        if os.path.exists(torrent_path):
-            torrent = Torrent.read(torrent_path)
-        else:
+        await wait_for_base_torrent(meta)
+        torrents = []
+        for tracker in trackers:
+            torrent_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent"
+            if os.path.exists(torrent_path):
+                torrents.append((torrent_path, Metainfo.read(torrent_path)))
+        if not torrents:
             return
         if meta.get('client', None) is None:
             default_torrent_client = self.config['DEFAULT']['default_torrent_client']
@@ -47,17 +110,19 @@ class Clients():
 
         local_path, remote_path = await self.remote_path_map(meta)
 
-        console.print(f"[bold green]Adding to {torrent_client}")
+        console.print(f"[bold green]Adding {len(torrents)} torrent(s) to {torrent_client}")
         if torrent_client.lower() == "rtorrent":
-            self.rtorrent(meta['path'], torrent_path, torrent, meta, local_path, remote_path, client)
+            await asyncio.to_thread(self.rtorrent, meta['path'], torrents, meta, local_path, remote_path, client)
         elif torrent_client == "qbit":
-            await self.qbittorrent(meta['path'], torrent, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta)
+            await self.qbittorrent(meta['path'], torrents, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta)
         elif torrent_client.lower() == "deluge":
             if meta['type'] == "DISC":
                 path = os.path.dirname(meta['path'])  # noqa F841
-            self.deluge(meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
+            for torrent_path, torrent in torrents:
+                self.deluge(meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
         elif torrent_client.lower() == "watch":
-            shutil.copy(torrent_path, client['watch_folder'])
+            for torrent_path, torrent in torrents:
+                shutil.copy(torrent_path, client['watch_folder'])
         return
 
     async def find_existing_torrent(self, meta):
@@ -106,28 +171,33 @@ class Clients():
                         console.print(f"[yellow]Storing valid torrent as best match: [bold yellow]{hash_value}")
 
         # Search the client if no pre-specified hash matches
-        if torrent_client == 'qbit' and client.get('enable_search'):
+        found_hashes = []
+        if client.get('enable_search') and client.get('torrent_index', True) and torrent_client in ('qbit', 'rtorrent', 'deluge') and os.path.isdir(str(torrent_storage_dir)):
+            # The file name keeps the hash in the client's case, rtorrent's is upper
+            found_hashes = [(os.path.basename(each['torrent_path'])[:-len('.torrent')], each) for each in await self.search_index_for_torrent(meta, client)]
+        elif torrent_client == 'qbit' and client.get('enable_search'):
             found_hash = await self.search_qbit_for_torrent(meta, client)
             if found_hash:
-                valid, torrent_path = await self.is_valid_torrent(
-                    meta, f"{torrent_storage_dir}/{found_hash}.torrent", found_hash, torrent_client, client, print_err=False
-                )
-                if valid:
-                    # Continue checking other torrents if `prefer_small_pieces` is enabled
-                    if not prefer_small_pieces:
-                        console.print(f"[green]Found a valid torrent from client search: [bold yellow]{found_hash}")
-                        return torrent_path
-
-                    # Get piece size and update the best match
-                    torrent = Torrent.read(torrent_path)
-                    piece_size = torrent.piece_size
-                    if piece_size <= 8388608:
-                        console.print(f"[green]Found a valid torrent with preferred piece size from client search: [bold yellow]{found_hash}")
-                        return torrent_path
+                found_hashes = [(found_hash, None)]
+        for found_hash, indexed in found_hashes:
+            valid, torrent_path = await self.is_valid_torrent(
+                meta, f"{torrent_storage_dir}/{found_hash}.torrent", found_hash, torrent_client, client, print_err=False, indexed=indexed
+            )
+            if valid:
+                # Continue checking other torrents if `prefer_small_pieces` is enabled
+                if not prefer_small_pieces:
+                    console.print(f"[green]Found a valid torrent from client search: [bold yellow]{found_hash}")
+                    return torrent_path
+
+                # Get piece size and update the best match
+                piece_size = indexed['piece_size'] if indexed else Torrent.read(torrent_path).piece_size
+                if piece_size <= 8388608:
+                    console.print(f"[green]Found a valid torrent with preferred piece size from client search: [bold yellow]{found_hash}")
+                    return torrent_path
 
-                    if best_match is None or piece_size < best_match['piece_size']:
-                        best_match = {'torrenthash': found_hash, 'torrent_path': torrent_path, 'piece_size': piece_size}
-                        console.print(f"[yellow]Storing valid torrent from client search as best match: [bold yellow]{found_hash}")
+                if best_match is None or piece_size < best_match['piece_size']:
+                    best_match = {'torrenthash': found_hash, 'torrent_path': torrent_path, 'piece_size': piece_size}
+                    console.print(f"[yellow]Storing valid torrent from client search as best match: [bold yellow]{found_hash}")
 
         # Use best match if no preferred torrent found
         if prefer_small_pieces and best_match:
@@ -137,9 +207,14 @@ class Clients():
         console.print("[bold yellow]No Valid .torrent found")
         return None
 
-    async def is_valid_torrent(self, meta, torrent_path, torrenthash, torrent_client, client, print_err=False):
+    async def is_valid_torrent(self, meta, torrent_path, torrenthash, torrent_client, client, print_err=False, indexed=None):
+        """
+        Check a .torrent for reuse. indexed is its row from the torrent index, which answers everything
+        but the spot check, so the file is only read when a spot check runs.
+        """
         valid = False
         wrong_file = False
+        torrent = None
 
         # Normalize the torrent hash based on the client
         if torrent_client in ('qbit', 'deluge'):
@@ -154,28 +229,35 @@ class Clients():
 
         # Check if torrent file exists
         if os.path.exists(torrent_path):
-            try:
-                torrent = Torrent.read(torrent_path)
-            except Exception as e:
-                console.print(f'[bold red]Error reading torrent file: {e}')
-                return valid, torrent_path
+            if indexed is not None:
+                torrent_name = indexed['name']
+                torrent_files = [path for path, _ in indexed['files']]
+                pieces, piece_size = indexed['piece_count'], indexed['piece_size']
+            else:
+                try:
+                    torrent = Torrent.read(torrent_path)
+                except Exception as e:
+                    console.print(f'[bold red]Error reading torrent file: {e}')
+                    return valid, torrent_path
+                torrent_name = torrent.metainfo['info']['name']
+                torrent_files = [str(each) for each in torrent.files]
+                pieces, piece_size = torrent.pieces, torrent.piece_size
 
             # Reuse if disc and basename matches or --keep-folder was specified
             if meta.get('is_disc', None) is not None or (meta['keep_folder'] and meta['isdir']):
-                torrent_name = torrent.metainfo['info']['name']
                 if meta['uuid'] != torrent_name:
                     console.print("Modified file structure, skipping hash")
                     valid = False
-                torrent_filepath = os.path.commonpath(torrent.files)
+                torrent_filepath = os.path.commonpath(torrent_files)
                 if os.path.basename(meta['path']) in torrent_filepath:
                     valid = True
                 if meta['debug']:
                     console.log(f"Torrent is valid based on disc/basename or keep-folder: {valid}")
 
             # If one file, check for folder
-            elif len(torrent.files) == len(meta['filelist']) == 1:
-                if os.path.basename(torrent.files[0]) == os.path.basename(meta['filelist'][0]):
-                    if str(torrent.files[0]) == os.path.basename(torrent.files[0]):
+            elif len(torrent_files) == len(meta['filelist']) == 1:
+                if os.path.basename(torrent_files[0]) == os.path.basename(meta['filelist'][0]):
+                    if torrent_files[0] == os.path.basename(torrent_files[0]):
                         valid = True
                     else:
                         wrong_file = True
@@ -183,8 +265,8 @@ class Clients():
                     console.log(f"Single file match status: valid={valid}, wrong_file={wrong_file}")
 
             # Check if number of files matches number of videos
-            elif len(torrent.files) == len(meta['filelist']):
-                torrent_filepath = os.path.commonpath(torrent.files)
+            elif len(torrent_files) == len(meta['filelist']):
+                torrent_filepath = os.path.commonpath(torrent_files)
                 actual_filepath = os.path.commonpath(meta['filelist'])
                 local_path, remote_path = await self.remote_path_map(meta)
 
@@ -207,24 +289,22 @@ class Clients():
         if valid:
             if os.path.exists(torrent_path):
                 try:
-                    reuse_torrent = Torrent.read(torrent_path)
-                    torrent_storage_dir_valid = torrent_path
-                    torrent_file_size_kib = os.path.getsize(torrent_storage_dir_valid) / 1024
+                    torrent_file_size_kib = os.path.getsize(torrent_path) / 1024
                     if meta['debug']:
-                        console.log(f"Checking piece size, count and size: pieces={reuse_torrent.pieces}, piece_size={reuse_torrent.piece_size}, size={torrent_file_size_kib}")
+                        console.log(f"Checking piece size, count and size: pieces={pieces}, piece_size={piece_size}, size={torrent_file_size_kib}")
 
                     # Piece size and count validations
                     if not meta.get('prefer_small_pieces', False):
-                        if reuse_torrent.pieces >= 8000 and reuse_torrent.piece_size < 8388608:
+                        if pieces >= 8000 and piece_size < 8388608:
                             console.print("[bold yellow]Too many pieces detected")
                             valid = False
-                        elif reuse_torrent.pieces >= 5000 and reuse_torrent.piece_size < 4194304:
+                        elif pieces >= 5000 and piece_size < 4194304:
                             console.print("[bold yellow]Too many pieces detected")
                             valid = False
-                    elif reuse_torrent.pieces >= 12000:
+                    elif pieces >= 12000:
                         console.print("[bold yellow]Too many pieces detected")
                         valid = False
-                    elif reuse_torrent.piece_size < 32768:
+                    elif piece_size < 32768:
                         console.print("[bold yellow]Piece size too small to reuse")
                         valid = False
                     elif torrent_file_size_kib > 250:
@@ -239,6 +319,10 @@ class Clients():
                     console.print(f'[bold red]Error checking reuse torrent: {e}')
                     valid = False
 
+            spot_check = int(meta.get('spot_check') or self.config['DEFAULT'].get('reuse_spot_check', 0) or 0)
+            if valid and spot_check > 0:
+                valid = await self.spot_check_torrent(meta, torrent_path, spot_check, torrent)
+
             if meta['debug']:
                 console.log(f"Final validity after piece checks: valid={valid}")
         else:
@@ -246,6 +330,145 @@ class Clients():
 
         return valid, torrent_path
 
+    async def spot_check_torrent(self, meta, torrent_path, sample_size, torrent=None):
+        """
+        Verify a random sample of pieces, plus the first and last piece of every file,
+        of a torrent being reused against the local data. torrent is the already parsed torrent_path, if any.
+        """
+        if torrent is None:
+            try:
+                torrent = Torrent.read(torrent_path)
+            except Exception as e:
+                console.print(f'[bold red]Error reading torrent file for spot check: {e}')
+                return False
+
+        name = torrent.metainfo['info']['name']
+        local_files = []
+        if 'files' not in torrent.metainfo['info']:
+            matches = [f for f in meta.get('filelist', []) if os.path.basename(f) == name]
+            if matches:
+                local_files.append((matches[0], torrent.files[0].size))
+            else:
+                base = meta['path'] if os.path.isdir(meta['path']) else os.path.dirname(meta['path'])
+                local_files.append((os.path.join(base, name), torrent.files[0].size))
+        else:
+            for file in torrent.files:
+                parts = file.parts
+                if os.path.basename(meta['path']) == name:
+                    local_path = os.path.join(os.path.dirname(meta['path']), *parts)
+                else:
+                    local_path = os.path.join(meta['path'], *parts[1:])
+                local_files.append((local_path, file.size))
+
+        piece_size = torrent.piece_size
+        piece_count = len(torrent.hashes)
+        to_check = set(random.sample(range(piece_count), min(sample_size, piece_count)))
+        offset = 0
+        for local_path, size in local_files:
+            if size > 0:
+                to_check.add(offset // piece_size)
+                to_check.add((offset + size - 1) // piece_size)
+            offset += size
+
+        console.print(f"[yellow]Spot checking {len(to_check)} of {piece_count} pieces before reusing .torrent")
+        try:
+            bad_piece = await asyncio.to_thread(self._verify_pieces, local_files, piece_size, torrent.hashes, sorted(to_check))
+        except OSError as e:
+            console.print(f"[bold red]Spot check failed to read local data: {e}")
+            return False
+        if bad_piece is not None:
+            console.print(f"[bold red]Spot check failed on piece {bad_piece}, not reusing .torrent")
+            return False
+        console.print("[green]Spot check passed")
+        return True
+
+    def _verify_pieces(self, local_files, piece_size, hashes, pieces):
+        """
+        Hash the given pieces from the local files. Returns the first mismatching piece index, or None.
+        """
+        spans = []
+        offset = 0
+        for local_path, size in local_files:
+            spans.append((offset, offset + size, local_path))
+            offset += size
+        total_size = offset
+
+        for index in pieces:
+            start = index * piece_size
+            end = min(start + piece_size, total_size)
+            piece_hash = hashlib.sha1()
+            for file_start, file_end, local_path in spans:
+                if file_end <= start or file_start >= end or file_start == file_end:
+                    continue
+                with open(local_path, 'rb') as f:
+                    f.seek(max(start, file_start) - file_start)
+                    remaining = min(end, file_end) - max(start, file_start)
+                    while remaining > 0:
+                        data = f.read(min(remaining, 4194304))
+                        if not data:
+                            return index
+                        piece_hash.update(data)
+                        remaining -= len(data)
+            if piece_hash.digest() != hashes[index]:
+                return index
+        return None
+
+    async def search_index_for_torrent(self, meta, client):
+        """
+        Look up candidate torrents for meta['path'] in the local index of torrent_storage_dir, best candidates first,
+        as index rows. Only name, size and file count are compared here, is_valid_torrent does the rest from the rows.
+        """
+        console.print("[green]Searching the torrent index for an existing .torrent")
+        torrent_storage_dir = client['torrent_storage_dir']
+        is_disc = meta.get('is_disc') not in ("", None)
+        single_file = not is_disc and len(meta['filelist']) == 1
+        if single_file:
+            target_path = meta['filelist'][0]
+        else:
+            target_path = meta['path']
+        name = os.path.basename(os.path.normpath(target_path))
+        if is_disc or (meta['keep_folder'] and meta['isdir']):
+            total_size = None
+        else:
+            total_size = sum(os.path.getsize(each) for each in meta['filelist'])
+
+        def lookup():
+            index = TorrentIndex(os.path.join(meta['base_dir'], "data", "torrent_index.db"))
+            try:
+                index.refresh(torrent_storage_dir, debug=meta['debug'])
+                return index.find(torrent_storage_dir, name, total_size)
+            finally:
+                index.close()
+
+        try:
+            candidates = await asyncio.to_thread(lookup)
+        except Exception as e:
+            console.print(f"[bold red]Error searching the torrent index: {e}")
+            return []
+
+        if single_file:
+            candidates = [each for each in candidates if len(each['files']) == 1]
+        elif not is_disc and not (meta['keep_folder'] and meta['isdir']):
+            candidates = [each for each in candidates if len(each['files']) == len(meta['filelist'])]
+
+        # Torrents already seeding this exact path come first, then smallest piece size
+        local_path, remote_path = await self.remote_path_map(meta)
+        target = os.path.normpath(target_path).lower()
+
+        def seeds_target(candidate):
+            content_path = candidate['content_path']
+            if not content_path:
+                return False
+            if local_path.lower() != remote_path.lower() and content_path.startswith(remote_path):
+                content_path = content_path.replace(remote_path, local_path, 1)
+            return os.path.normpath(content_path).lower() == target
+
+        if not meta.get('prefer_small_pieces', False):
+            candidates.sort(key=lambda each: not seeds_target(each))
+        if meta['debug']:
+            console.print(f"Torrent index candidates: {[each['infohash'] for each in candidates]}")
+        return candidates
+
     async def search_qbit_for_torrent(self, meta, client):
         console.print("[green]Searching qbittorrent for an existing .torrent")
         torrent_storage_dir = client.get('torrent_storage_dir', None)
@@ -261,14 +484,8 @@ class Clients():
             return None
 
         try:
-            qbt_client = qbittorrentapi.Client(
-                host=client['qbit_url'],
-                port=client['qbit_port'],
-                username=client['qbit_user'],
-                password=client['qbit_pass'],
-                VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
-            )
-            qbt_client.auth_log_in()
+            qbt_client = self.qbit_connection(client)
+            await qbt_client.login()
             if meta['debug']:
                 console.print("We logged into qbittorrent")
         except qbittorrentapi.LoginFailed:
@@ -290,7 +507,7 @@ class Clients():
 
         # Iterate through torrents and evaluate
         best_match = None
-        torrents = qbt_client.torrents.info()
+        torrents = await qbt_client.call('torrents_info')
         for torrent in torrents:
             try:
                 torrent_path = torrent.get('content_path', f"{torrent.save_path}{torrent.name}")
@@ -335,53 +552,79 @@ class Clients():
 
         return None
 
-    def rtorrent(self, path, torrent_path, torrent, meta, local_path, remote_path, client):
+    def rtorrent(self, path, torrents, meta, local_path, remote_path, client):
         rtorrent = xmlrpc.client.Server(client['rtorrent_url'], context=ssl._create_stdlib_context())
-        metainfo = bencode.bread(torrent_path)
-        try:
-            fast_resume = self.add_fast_resume(metainfo, path, torrent)
-        except EnvironmentError as exc:
-            console.print("[red]Error making fast-resume data (%s)" % (exc,))
-            raise
+        isdir = os.path.isdir(path)
+        loads = []
+        temp_files = []
+        for torrent_path, torrent in torrents:
+            metainfo = bencode.bread(torrent_path)
+            try:
+                fast_resume = self.add_fast_resume(metainfo, path, torrent)
+            except EnvironmentError as exc:
+                console.print("[red]Error making fast-resume data (%s)" % (exc,))
+                raise
 
-        new_meta = bencode.bencode(fast_resume)
-        if new_meta != metainfo:
             fr_file = torrent_path.replace('.torrent', '-resume.torrent')
             console.print("Creating fast resume")
             bencode.bwrite(fast_resume, fr_file)
 
-        isdir = os.path.isdir(path)
-        # if meta['type'] == "DISC":
-        #     path = os.path.dirname(path)
-        # Remote path mount
-        modified_fr = False
-        if local_path.lower() in path.lower() and local_path.lower() != remote_path.lower():
-            path_dir = os.path.dirname(path)
-            path = path.replace(local_path, remote_path)
-            path = path.replace(os.sep, '/')
-            shutil.copy(fr_file, f"{path_dir}/fr.torrent")
-            fr_file = f"{os.path.dirname(path)}/fr.torrent"
-            modified_fr = True
-        if isdir is False:
-            path = os.path.dirname(path)
+            # if meta['type'] == "DISC":
+            #     path = os.path.dirname(path)
+            # Remote path mount
+            load_path = path
+            if local_path.lower() in path.lower() and local_path.lower() != remote_path.lower():
+                path_dir = os.path.dirname(path)
+                load_path = path.replace(local_path, remote_path)
+                load_path = load_path.replace(os.sep, '/')
+                shutil.copy(fr_file, f"{path_dir}/fr-{torrent.infohash}.torrent")
+                temp_files.append(f"{path_dir}/fr-{torrent.infohash}.torrent")
+                fr_file = f"{os.path.dirname(load_path)}/fr-{torrent.infohash}.torrent"
+            if isdir is False:
+                load_path = os.path.dirname(load_path)
+            loads.append((fr_file, load_path))
 
         console.print("[bold yellow]Adding and starting torrent")
-        rtorrent.load.start_verbose('', fr_file, f"d.directory_base.set={path}")
-        time.sleep(1)
-        # Add labels
-        if client.get('rtorrent_label', None) is not None:
-            rtorrent.d.custom1.set(torrent.infohash, client['rtorrent_label'])
-        if meta.get('rtorrent_label') is not None:
-            rtorrent.d.custom1.set(torrent.infohash, meta['rtorrent_label'])
+        multicall = xmlrpc.client.MultiCall(rtorrent)
+        for fr_file, load_path in loads:
+            multicall.load.start_verbose('', fr_file, f"d.directory_base.set={load_path}")
+        multicall()
+
+        # Labels can only be set once rtorrent has loaded the torrents
+        hashes = [torrent.infohash.upper() for _, torrent in torrents]
+        if not self.wait_for_hashes(lambda: {h.upper() for h in rtorrent.download_list('')}, hashes):
+            console.print("[red]Torrent addition timed out.")
+        else:
+            labels = [label for label in (client.get('rtorrent_label'), meta.get('rtorrent_label')) if label is not None]
+            if labels:
+                multicall = xmlrpc.client.MultiCall(rtorrent)
+                for infohash in hashes:
+                    for label in labels:
+                        multicall.d.custom1.set(infohash, label)
+                multicall()
 
         # Delete modified fr_file location
-        if modified_fr:
-            os.remove(f"{path_dir}/fr.torrent")
+        for temp_file in temp_files:
+            os.remove(temp_file)
         if meta['debug']:
             console.print(f"[cyan]Path: {path}")
         return
 
-    async def qbittorrent(self, path, torrent, local_path, remote_path, client, is_disc, filelist, meta):
+    def wait_for_hashes(self, loaded, hashes, timeout=30):
+        """
+        Poll loaded() with exponential backoff until every hash shows up, or timeout seconds pass.
+        """
+        delay = 0.1
+        deadline = time.monotonic() + timeout
+        while True:
+            if set(hashes) <= loaded():
+                return True
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 5)
+
+    async def qbittorrent(self, path, torrents, local_path, remote_path, client, is_disc, filelist, meta):
         # Remote path mount
         if meta.get('keep_folder'):
             # Keep only the root folder (e.g., "D:\\Movies")
@@ -401,18 +644,11 @@ class Clients():
         if not path.endswith('/'):
             path += '/'
 
-        # Initialize qBittorrent client
-        qbt_client = qbittorrentapi.Client(
-            host=client['qbit_url'],
-            port=client['qbit_port'],
-            username=client['qbit_user'],
-            password=client['qbit_pass'],
-            VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
-        )
+        qbt_client = self.qbit_connection(client)
         console.print("[bold yellow]Adding and rechecking torrent")
 
         try:
-            qbt_client.auth_log_in()
+            await qbt_client.login()
         except qbittorrentapi.LoginFailed:
             console.print("[bold red]INCORRECT QBIT LOGIN CREDENTIALS")
             return
@@ -430,10 +666,12 @@ class Clients():
         qbt_category = client.get("qbit_cat") if not meta.get("qbit_cat") else meta.get('qbit_cat')
         content_layout = client.get('content_layout', 'Original')
 
-        # Add the torrent
+        # Add the torrents in one request
+        hashes = [torrent.infohash for _, torrent in torrents]
         try:
-            qbt_client.torrents_add(
-                torrent_files=torrent.dump(),
+            await qbt_client.call(
+                'torrents_add',
+                torrent_files={os.path.basename(torrent_path): torrent.dump() for torrent_path, torrent in torrents},
                 save_path=path,
                 use_auto_torrent_management=auto_management,
                 is_skip_checking=True,
@@ -444,22 +682,25 @@ class Clients():
             console.print(f"[red]Failed to add torrent: {e}")
             return
 
-        # Wait for torrent to be added
-        timeout = 30
-        for _ in range(timeout):
-            if len(qbt_client.torrents_info(torrent_hashes=torrent.infohash)) > 0:
-                break
-            await asyncio.sleep(1)
-        else:
-            console.print("[red]Torrent addition timed out.")
-            return
-
-        # Resume and tag torrent
-        qbt_client.torrents_resume(torrent.infohash)
+        # Wait until qBittorrent knows every torrent
+        async def loaded():
+            return {each.hash for each in await qbt_client.call('torrents_info', torrent_hashes=hashes)}
+
+        delay = 0.1
+        deadline = time.monotonic() + 30
+        while not set(hashes) <= await loaded():
+            if time.monotonic() + delay > deadline:
+                console.print("[red]Torrent addition timed out.")
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
+
+        # Resume and tag torrents
+        await qbt_client.call('torrents_resume', torrent_hashes=hashes)
         if client.get('qbit_tag'):
-            qbt_client.torrents_add_tags(tags=client['qbit_tag'], torrent_hashes=torrent.infohash)
+            await qbt_client.call('torrents_add_tags', tags=client['qbit_tag'], torrent_hashes=hashes)
         if meta.get('qbit_tag'):
-            qbt_client.torrents_add_tags(tags=meta['qbit_tag'], torrent_hashes=torrent.infohash)
+            await qbt_client.call('torrents_add_tags', tags=meta['qbit_tag'], torrent_hashes=hashes)
 
         console.print(f"Added to: {path}")
 
@@ -552,22 +793,16 @@ class Clients():
     async def get_ptp_from_hash(self, meta):
         default_torrent_client = self.config['DEFAULT']['default_torrent_client']
         client = self.config['TORRENT_CLIENTS'][default_torrent_client]
-        qbt_client = qbittorrentapi.Client(
-            host=client['qbit_url'],
-            port=client['qbit_port'],
-            username=client['qbit_user'],
-            password=client['qbit_pass'],
-            VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
-        )
+        qbt_client = self.qbit_connection(client)
 
         try:
-            qbt_client.auth_log_in()
+            await qbt_client.login()
         except qbittorrentapi.LoginFailed as e:
             console.print(f"[bold red]Login failed while trying to get info hash: {e}")
             exit(1)
 
         info_hash_v1 = meta.get('infohash')
-        torrents = qbt_client.torrents_info()
+        torrents = await qbt_client.call('torrents_info')
         found = False
 
         for torrent in torrents:
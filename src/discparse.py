@@ -9,6 +9,7 @@ from collections import OrderedDict
 import json
 
 from src.console import console
+from src.ioscheduler import io_slot, BDINFO
 
 
 class DiscParse():
@@ -37,16 +38,18 @@ class DiscParse():
                         try:
                             # await asyncio.subprocess.Process(['mono', "bin/BDInfo/BDInfo.exe", "-w", path, save_dir])
                             console.print(f"[bold green]Scanning {path}")
-                            proc = await asyncio.create_subprocess_exec('mono', f"{base_dir}/bin/BDInfo/BDInfo.exe", '-w', path, save_dir)
-                            await proc.wait()
+                            async with io_slot(path, BDINFO):
+                                proc = await asyncio.create_subprocess_exec('mono', f"{base_dir}/bin/BDInfo/BDInfo.exe", '-w', path, save_dir)
+                                await proc.wait()
                         except Exception:
                             console.print('[bold red]mono not found, please install mono')
 
                     elif sys.platform.startswith('win32'):
                         # await asyncio.subprocess.Process(["bin/BDInfo/BDInfo.exe", "-w", path, save_dir])
                         console.print(f"[bold green]Scanning {path}")
-                        proc = await asyncio.create_subprocess_exec(f"{base_dir}/bin/BDInfo/BDInfo.exe", "-w", path, save_dir)
-                        await proc.wait()
+                        async with io_slot(path, BDINFO):
+                            proc = await asyncio.create_subprocess_exec(f"{base_dir}/bin/BDInfo/BDInfo.exe", "-w", path, save_dir)
+                            await proc.wait()
                         await asyncio.sleep(1)
                     else:
                         console.print("[red]Not sure how to run bdinfo on your platform, get support please thanks.")
@@ -245,8 +248,7 @@ class DiscParse():
     async def get_dvdinfo(self, discs):
         for each in discs:
             path = each.get('path')
-            os.chdir(path)
-            files = glob("VTS_*.VOB")
+            files = glob("VTS_*.VOB", root_dir=path)
             files.sort()
             filesdict = OrderedDict()
             main_set = []
@@ -258,7 +260,7 @@ class DiscParse():
             main_set_duration = 0
             for vob_set in filesdict.values():
                 try:
-                    vob_set_mi = MediaInfo.parse(f"VTS_{vob_set[0][:2]}_0.IFO", output='JSON')
+                    vob_set_mi = MediaInfo.parse(f"{path}/VTS_{vob_set[0][:2]}_0.IFO", output='JSON')
                     vob_set_mi = json.loads(vob_set_mi)
                     tracks = vob_set_mi.get('media', {}).get('track', [])
                     if len(tracks) > 1:
@@ -287,12 +289,13 @@ class DiscParse():
             set = main_set[0][:2]
             each['vob'] = vob = f"{path}/VTS_{set}_1.VOB"
             each['ifo'] = ifo = f"{path}/VTS_{set}_0.IFO"
-            each['vob_mi'] = MediaInfo.parse(os.path.basename(vob), output='STRING', full=False, mediainfo_options={'inform_version': '1'}).replace('\r\n', '\n')
-            each['ifo_mi'] = MediaInfo.parse(os.path.basename(ifo), output='STRING', full=False, mediainfo_options={'inform_version': '1'}).replace('\r\n', '\n')
             each['vob_mi_full'] = MediaInfo.parse(vob, output='STRING', full=False, mediainfo_options={'inform_version': '1'}).replace('\r\n', '\n')
             each['ifo_mi_full'] = MediaInfo.parse(ifo, output='STRING', full=False, mediainfo_options={'inform_version': '1'}).replace('\r\n', '\n')
+            # The short versions name the file without the folder it is in
+            each['vob_mi'] = each['vob_mi_full'].replace(vob, os.path.basename(vob))
+            each['ifo_mi'] = each['ifo_mi_full'].replace(ifo, os.path.basename(ifo))
 
-            size = sum(os.path.getsize(f) for f in os.listdir('.') if os.path.isfile(f)) / float(1 << 30)
+            size = sum(os.path.getsize(f) for f in (os.path.join(path, name) for name in os.listdir(path)) if os.path.isfile(f)) / float(1 << 30)
             if size <= 7.95:
                 dvd_size = "DVD9"
                 if size <= 4.37:
@@ -303,16 +306,15 @@ class DiscParse():
     async def get_hddvd_info(self, discs):
         for each in discs:
             path = each.get('path')
-            os.chdir(path)
-            files = glob("*.EVO")
+            files = glob("*.EVO", root_dir=path)
             size = 0
             largest = files[0]
             # get largest file from files
             for file in files:
-                file_size = os.path.getsize(file)
+                file_size = os.path.getsize(os.path.join(path, file))
                 if file_size > size:
                     largest = file
                     size = file_size
-            each['evo_mi'] = MediaInfo.parse(os.path.basename(largest), output='STRING', full=False, mediainfo_options={'inform_version': '1'})
             each['largest_evo'] = os.path.abspath(f"{path}/{largest}")
+            each['evo_mi'] = MediaInfo.parse(each['largest_evo'], output='STRING', full=False, mediainfo_options={'inform_version': '1'}).replace(each['largest_evo'], largest)
         return discs
@@ -1,9 +1,9 @@
 from src.console import console
+from src import httpclient
 from guessit import guessit
 import anitopy
 from pathlib import Path
 import asyncio
-import requests
 import os
 import re
 from difflib import SequenceMatcher
@@ -134,7 +134,7 @@ async def get_season_episode(video, meta):
                             'absolute': str(episode_int),
                         }
                         url = "https://thexem.info/map/single"
-                        response = requests.post(url, params=params).json()
+                        response = httpclient.shared_session().post(url, params=params).json()
                         if response['result'] == "failure":
                             raise XEMNotFound  # noqa: F405
                         if meta['debug']:
@@ -148,7 +148,7 @@ async def get_season_episode(video, meta):
                         season_int = 1  # Default to 1 if error occurs
                         season = "S01"
                         names_url = f"https://thexem.info/map/names?origin=tvdb&id={str(meta['tvdb_id'])}"
-                        names_response = requests.get(names_url).json()
+                        names_response = httpclient.shared_session().get(names_url).json()
                         if meta['debug']:
                             console.log(f'[cyan]Matching Season Number from TheXEM\n{names_response}')
                         difference = 0
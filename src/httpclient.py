@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+import re
+import time
+import asyncio
+import importlib.util
+import threading
+import contextlib
+import contextvars
+from collections import Counter
+from http.cookiejar import DefaultCookiePolicy
+import httpx
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from src.console import console
+from src.ratelimit import throttle, throttle_sync, waited
+from src.responsecache import response_cache
+
+# Uploads can take a while to be processed by the tracker, connecting should not
+TIMEOUT = httpx.Timeout(120.0, connect=15.0)
+SYNC_TIMEOUT = (15.0, 120.0)
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+# HTTP/2 is negotiated over ALPN per host, and only offered when the h2 package is installed
+HTTP2 = importlib.util.find_spec('h2') is not None
+DNS_TTL = 300
+# UNIT3D's torrent search, and how many torrents of a show it is asked for at once (its page size limit)
+UNIT3D_FILTER = "/api/torrents/filter"
+SHOW_SEARCH_PAGE = 100
+
+# One connection pool per event loop, shared by every request and session
+_transports = {}
+_clients = {}
+_aiohttp_sessions = {}
+_stats = Counter()
+
+# Dupe search responses by request, kept for the whole run (and across queue items) while fresh
+_search_cache = {}
+_search_cache_ttl = contextvars.ContextVar('search_cache_ttl', default=None)
+_search_cache_url = contextvars.ContextVar('search_cache_url', default=None)
+_search_cache_refresh = contextvars.ContextVar('search_cache_refresh', default=False)
+
+
+async def _trace(event_name, info):
+    if event_name == 'connection.connect_tcp.complete':
+        _stats['httpx connections'] += 1
+
+
+def _loop_key():
+    return id(asyncio.get_running_loop())
+
+
+def shared_transport():
+    key = _loop_key()
+    if key not in _transports:
+        _transports[key] = httpx.AsyncHTTPTransport(limits=LIMITS, http2=HTTP2)
+    return _transports[key]
+
+
+def async_client():
+    key = _loop_key()
+    if key not in _clients or _clients[key].is_closed:
+        _clients[key] = httpx.AsyncClient(transport=shared_transport(), timeout=TIMEOUT, follow_redirects=True)
+    return _clients[key]
+
+
+def _form_value(value):
+    # requests sends str(value) for scalars (True -> "True") and drops None
+    if isinstance(value, (str, bytes)):
+        return value
+    return str(value)
+
+
+def _form(fields):
+    if fields is None or isinstance(fields, (str, bytes)):
+        return fields
+    items = fields.items() if isinstance(fields, dict) else fields
+    form = []
+    for key, value in items:
+        if isinstance(value, (list, tuple)):
+            form.extend((key, _form_value(each)) for each in value if each is not None)
+        elif value is not None:
+            form.append((key, _form_value(value)))
+    return form
+
+
+def _request_kwargs(kwargs):
+    """
+    Translate requests style keyword arguments to httpx ones.
+    """
+    kwargs = dict(kwargs)
+    if 'allow_redirects' in kwargs:
+        kwargs['follow_redirects'] = kwargs.pop('allow_redirects')
+    kwargs.pop('verify', None)
+    if 'params' in kwargs:
+        kwargs['params'] = _form(kwargs['params'])
+    data = kwargs.pop('data', None)
+    if isinstance(data, (str, bytes)):
+        kwargs['content'] = data
+    elif data is not None:
+        form = _form(data)
+        # httpx only takes a dict for form data, repeated keys become lists
+        merged = {}
+        for key, value in form:
+            if key in merged:
+                merged[key] = merged[key] + [value] if isinstance(merged[key], list) else [merged[key], value]
+            else:
+                merged[key] = value
+        kwargs['data'] = merged
+    return kwargs
+
+
+class HTTPResponse():
+    """
+    requests.Response-like view of an httpx.Response, so tracker code reads the same either way.
+    """
+    def __init__(self, response):
+        self.raw = response
+
+    @property
+    def status_code(self):
+        return self.raw.status_code
+
+    @property
+    def ok(self):
+        return self.raw.status_code < 400
+
+    @property
+    def reason(self):
+        return self.raw.reason_phrase
+
+    @property
+    def url(self):
+        return str(self.raw.url)
+
+    @property
+    def text(self):
+        return self.raw.text
+
+    @property
+    def content(self):
+        return self.raw.content
+
+    @property
+    def headers(self):
+        return self.raw.headers
+
+    @property
+    def cookies(self):
+        return self.raw.cookies
+
+    def json(self, **kwargs):
+        return self.raw.json(**kwargs)
+
+    def raise_for_status(self):
+        self.raw.raise_for_status()
+
+
+@contextlib.contextmanager
+def dupe_search_cache(ttl, refresh=False, search_url=None):
+    """
+    Serve repeated requests to search_url made inside this block (in this task or thread) from the dupe search cache,
+    and cache successful responses for ttl seconds. refresh=True always asks the tracker, and updates the cache.
+    Nothing else sent from the block (logins, group lookups) is cached, nor is anything when search_url is None.
+    """
+    ttl_token = _search_cache_ttl.set(float(ttl) if ttl and search_url and float(ttl) > 0 else None)
+    url_token = _search_cache_url.set(search_url)
+    refresh_token = _search_cache_refresh.set(refresh)
+    try:
+        yield
+    finally:
+        _search_cache_refresh.reset(refresh_token)
+        _search_cache_url.reset(url_token)
+        _search_cache_ttl.reset(ttl_token)
+
+
+def _in_search_scope(url):
+    return _search_cache_ttl.get() is not None and str(url).startswith(_search_cache_url.get() or '\0')
+
+
+def _search_key(method, url, body):
+    if not _in_search_scope(url):
+        return None
+    return (method.upper(), str(url), repr(body))
+
+
+def _body_key(kwargs):
+    return tuple(repr(kwargs.get(each)) for each in ('params', 'data', 'json', 'content'))
+
+
+def _cached_search(key):
+    if key is None or _search_cache_refresh.get():
+        return None
+    cached = _search_cache.get(key)
+    if cached is None or cached[0] < time.monotonic():
+        return None
+    _stats['dupe search cache hits'] += 1
+    return cached[1]
+
+
+def _store_search(key, value):
+    if key is None:
+        return
+    now = time.monotonic()
+    for stale in [each for each, (expires, _) in _search_cache.items() if expires < now]:
+        del _search_cache[stale]
+    _search_cache[key] = (now + _search_cache_ttl.get(), value)
+
+
+def _show_search_name(method, url, kwargs):
+    """
+    The name filter of a UNIT3D torrent search that the show-level search can answer, None for any other request.
+    """
+    params = kwargs.get('params')
+    if method.upper() != "GET" or not str(url).endswith(UNIT3D_FILTER) or not isinstance(params, dict):
+        return None
+    name = str(params.get('name') or '').strip()
+    if not name or not _in_search_scope(url):
+        return None
+    return name
+
+
+def _show_results(response):
+    """
+    Torrents listed by a UNIT3D search response, False if they did not fit on one page, None if it failed.
+    """
+    if response.status_code != 200:
+        return None
+    try:
+        data = response.json()
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get('data'), list):
+        return None
+    if (data.get('links') or {}).get('next'):
+        return False
+    return data['data']
+
+
+async def _show_search(client, url, kwargs, name):
+    """
+    Answer a search for one season or episode (tmdb, category, type, resolution and a name like " S01E02") from
+    the same search without the name, cached, so every episode of a queued season shares one request per tracker.
+    """
+    show_kwargs = {**kwargs, 'params': {**kwargs['params'], 'name': "", 'perPage': SHOW_SEARCH_PAGE}}
+    key = _search_key("GET", url, _body_key(show_kwargs))
+    results = _cached_search(key)
+    if results is None:
+        results = _show_results(await _fetch(client, "GET", url, show_kwargs))
+        if results is not None:
+            _store_search(key, results)
+    if results is None or results is False:
+        # The show has more torrents than a page holds (remembered, so later episodes skip the show search)
+        # or the tracker did not answer it, ask for the name itself
+        return await _fetch(client, "GET", url, kwargs)
+    # UNIT3D matches names with LIKE '%name%', the spaces in it standing for anything
+    pattern = re.compile('.*'.join(re.escape(word) for word in name.split()), re.IGNORECASE)
+    matches = [each for each in results if pattern.search(str((each.get('attributes') or {}).get('name', '')))]
+    return httpx.Response(200, json={'data': matches}, request=httpx.Request("GET", url, params=kwargs['params']))
+
+
+async def _fetch(client, method, url, kwargs):
+    _stats['httpx requests'] += 1
+    await throttle(url)
+    kwargs = {**kwargs, 'extensions': {**kwargs.get('extensions', {}), 'trace': _trace}}
+    return await client.request(method, url, **kwargs)
+
+
+async def _send(client, method, url, kwargs):
+    key = None
+    if 'files' not in kwargs:
+        name = _show_search_name(method, url, kwargs)
+        if name is not None:
+            return await _show_search(client, url, kwargs, name)
+        key = _search_key(method, url, _body_key(kwargs))
+    cached = _cached_search(key)
+    if cached is not None:
+        return cached
+    response = await _fetch(client, method, url, kwargs)
+    if response.status_code == 200:
+        _store_search(key, response)
+    return response
+
+
+async def request(method, url, **kwargs):
+    """
+    Send a request through the shared pool. Multipart file uploads are streamed from the open file objects.
+    """
+    response = await _send(async_client(), method, url, _request_kwargs(kwargs))
+    return HTTPResponse(response)
+
+
+async def get(url, **kwargs):
+    return await request("GET", url, **kwargs)
+
+
+async def post(url, **kwargs):
+    return await request("POST", url, **kwargs)
+
+
+class AsyncSession():
+    """
+    Cookie-keeping session for login based trackers, on top of the shared connection pool.
+
+        async with AsyncSession() as session:
+            session.cookies.update(cookies)
+            response = await session.post(url, data=data, files=files)
+    """
+    def __init__(self, headers=None):
+        self.client = httpx.AsyncClient(transport=shared_transport(), timeout=TIMEOUT, follow_redirects=True, headers=headers)
+
+    @property
+    def cookies(self):
+        return self.client.cookies
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    async def request(self, method, url, **kwargs):
+        return HTTPResponse(await _send(self.client, method, url, _request_kwargs(kwargs)))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        # Closing the client would close the shared transport, so only the cookies go away with it
+        self.client.cookies.clear()
+
+
+class pooled_client():
+    """
+    Drop-in for `async with httpx.AsyncClient(...) as client:` that borrows the shared pool
+    instead of opening (and tearing down) its own connections. Responses are plain httpx ones.
+    """
+    def __init__(self, timeout=None, cookies=None, headers=None):
+        self.timeout = TIMEOUT if timeout is None else timeout
+        self.cookies = cookies
+        self.headers = headers
+        self.client = None
+
+    async def __aenter__(self):
+        if self.cookies is not None or self.headers is not None:
+            self.client = httpx.AsyncClient(transport=shared_transport(), timeout=self.timeout, cookies=self.cookies,
+                                            headers=self.headers, follow_redirects=True)
+        else:
+            self.client = async_client()
+        return self
+
+    async def __aexit__(self, *exc):
+        # Never close: the client, or the transport under a cookie client, is shared
+        self.client = None
+
+    async def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return await _send(self.client, method, url, kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+
+class _SharedAdapter(HTTPAdapter):
+    """
+    One urllib3 pool manager for every requests.Session in the process, with a default timeout.
+    """
+    def send(self, request, timeout=None, **kwargs):
+        metadata_cache = None if kwargs.get('stream') else response_cache()
+        if metadata_cache is not None:
+            cached = metadata_cache.lookup(request)
+            if cached is not None:
+                return cached
+        key = None if kwargs.get('stream') else _search_key(request.method, request.url, request.body)
+        cached = _cached_search(key)
+        if cached is not None:
+            return cached
+        _stats['requests requests'] += 1
+        throttle_sync(request.url)
+        response = super().send(request, timeout=SYNC_TIMEOUT if timeout is None else timeout, **kwargs)
+        if response.status_code == 200:
+            _store_search(key, response)
+        if metadata_cache is not None:
+            metadata_cache.store(request, response)
+        return response
+
+    def close(self):
+        # Session.close() (and `with requests.Session()`) closes its adapters, this one outlives them
+        pass
+
+
+_adapter = _SharedAdapter(pool_connections=32, pool_maxsize=16)
+_shared_session = None
+_session_lock = threading.Lock()
+
+
+def new_session():
+    """
+    A requests.Session with its own cookies and headers, on the shared connection pool.
+    """
+    session = requests.Session()
+    session.mount('https://', _adapter)
+    session.mount('http://', _adapter)
+    return session
+
+
+def shared_session():
+    """
+    Cookie-less session for one-off requests.get/post calls, so they keep their connections alive.
+    """
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            _shared_session = new_session()
+            # Cookies set by one site's response must not leak into another module's requests
+            _shared_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return _shared_session
+
+
+def aiohttp_session():
+    """
+    Shared aiohttp session with a DNS cache, use as `async with httpclient.aiohttp_session() as session:`.
+    """
+    return _AiohttpSession()
+
+
+class _AiohttpSession():
+    async def __aenter__(self):
+        key = _loop_key()
+        session = _aiohttp_sessions.get(key)
+        if session is None or session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(_aiohttp_count('aiohttp requests'))
+            trace.on_request_start.append(_aiohttp_throttle)
+            trace.on_connection_create_end.append(_aiohttp_count('aiohttp connections'))
+            connector = aiohttp.TCPConnector(limit=LIMITS.max_connections, ttl_dns_cache=DNS_TTL)
+            session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+            _aiohttp_sessions[key] = session
+        return session
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+async def _aiohttp_throttle(session, context, params):
+    await throttle(params.url)
+
+
+def _aiohttp_count(name):
+    async def count(session, context, params):
+        _stats[name] += 1
+    return count
+
+
+def connection_stats():
+    """
+    Requests sent and new connections opened per client library, reused = requests - connections.
+    """
+    stats = Counter(_stats)
+    for key in list(_adapter.poolmanager.pools.keys()):
+        pool = _adapter.poolmanager.pools.get(key)
+        if pool is not None:
+            stats['requests connections'] += pool.num_connections
+    return stats
+
+
+def print_connection_stats():
+    stats = connection_stats()
+    for library in ('httpx', 'aiohttp', 'requests'):
+        sent = stats[f"{library} requests"]
+        if sent:
+            opened = stats[f"{library} connections"]
+            console.print(f"[cyan]{library}: {sent} requests over {opened} new connections ({max(sent - opened, 0)} reused)")
+    if stats['dupe search cache hits']:
+        console.print(f"[cyan]Dupe searches served from cache: {stats['dupe search cache hits']}")
+    metadata_cache = response_cache()
+    if metadata_cache is not None and (metadata_cache.hits or metadata_cache.misses):
+        console.print(f"[cyan]Metadata cache: {metadata_cache.hits} hits, {metadata_cache.misses} misses")
+    for host, seconds in waited().items():
+        console.print(f"[cyan]Rate limited {host} for {seconds:.1f} seconds")
+
+
+async def close_all(debug=False):
+    """
+    Close the pools of the running event loop, call once before it ends.
+    """
+    if debug:
+        print_connection_stats()
+    key = _loop_key()
+    session = _aiohttp_sessions.pop(key, None)
+    if session is not None:
+        await session.close()
+    client = _clients.pop(key, None)
+    if client is not None:
+        await client.aclose()
+    transport = _transports.pop(key, None)
+    if transport is not None:
+        await transport.aclose()
@@ -1,46 +1,111 @@
-import requests
+import asyncio
 from difflib import SequenceMatcher
 from imdb import Cinemagoer
 from src.console import console
+from src import httpclient
+from src import responsecache
+from src.imdbindex import imdb_index
+
+
+# GraphQL title data by imdb id, for the whole run
+_titles = {}
+
+TITLE_QUERY = """
+    query GetTitleInfo {{
+        title(id: "{imdb_id}") {{
+        id
+        titleText {{
+            text
+            isOriginalTitle
+        }}
+        originalTitleText {{
+            text
+        }}
+        countriesOfOrigin {{
+            countries {{
+                id
+            }}
+        }}
+        releaseYear {{
+            year
+        }}
+        titleType {{
+            id
+        }}
+        plot {{
+            plotText {{
+            plainText
+            }}
+        }}
+        ratingsSummary {{
+            aggregateRating
+            voteCount
+        }}
+        primaryImage {{
+            url
+        }}
+        runtime {{
+            displayableProperty {{
+            value {{
+                plainText
+            }}
+            }}
+            seconds
+        }}
+        titleGenres {{
+            genres {{
+            genre {{
+                text
+            }}
+            }}
+        }}
+        principalCredits {{
+            category {{
+            text
+            id
+            }}
+            credits {{
+            name {{
+                id
+                nameText {{
+                text
+                }}
+            }}
+            }}
+        }}
+        }}
+    }}
+"""
 
 
-async def get_imdb_aka_api(imdb_id, meta):
-    if imdb_id == "0":
-        return "", None
+async def get_imdb_title(imdb_id):
+    """
+    The title's GraphQL data with every field the aka and info lookups read, fetched once per imdb id.
+    None if IMDb has no such title or did not answer.
+    """
     if not imdb_id.startswith("tt"):
         imdb_id = f"tt{imdb_id}"
+    if imdb_id in _titles:
+        return _titles[imdb_id]
     url = "https://api.graphql.imdb.com/"
-    query = {
-        "query": f"""
-            query {{
-                title(id: "{imdb_id}") {{
-                    id
-                    titleText {{
-                        text
-                        isOriginalTitle
-                    }}
-                    originalTitleText {{
-                        text
-                    }}
-                    countriesOfOrigin {{
-                        countries {{
-                            id
-                        }}
-                    }}
-                }}
-            }}
-        """
-    }
+    headers = {"Content-Type": "application/json"}
+    response = await asyncio.to_thread(httpclient.shared_session().post, url, json={"query": TITLE_QUERY.format(imdb_id=imdb_id)}, headers=headers)
+    if response.status_code != 200:
+        return None
+    data = response.json() or {}
+    title = (data.get("data") or {}).get("title")
+    # A null title (unknown id, or an error answered with 200) is not cached, the next lookup asks again
+    if title is not None:
+        _titles[imdb_id] = title
+    return title
 
-    headers = {
-        "Content-Type": "application/json",
-    }
 
-    response = requests.post(url, headers=headers, json=query)
-    data = response.json()
+async def get_imdb_aka_api(imdb_id, meta):
+    if imdb_id == "0":
+        return "", None
+    title_data = await get_imdb_title(imdb_id)
 
     # Check if `data` and `title` exist
-    title_data = data.get("data", {}).get("title")
     if title_data is None:
         console.print("Title data is missing from response")
         return "", None
@@ -80,91 +145,10 @@ async def get_imdb_info_api(imdbID, meta):
     if len(meta.get('tmdb_directors', [])) >= 1:
         imdb_info['directors'] = meta['tmdb_directors']
 
-    if imdbID == "0":
+    if imdbID == "0" or not isinstance(imdbID, str):
         return imdb_info
-    else:
-        try:
-            if not imdbID.startswith("tt"):
-                imdbIDtt = f"tt{imdbID}"
-            else:
-                imdbIDtt = imdbID
-        except Exception:
-            return imdb_info
-        query = {
-            "query": f"""
-            query GetTitleInfo {{
-                title(id: "{imdbIDtt}") {{
-                id
-                titleText {{
-                    text
-                    isOriginalTitle
-                }}
-                originalTitleText {{
-                    text
-                }}
-                releaseYear {{
-                    year
-                }}
-                titleType {{
-                    id
-                }}
-                plot {{
-                    plotText {{
-                    plainText
-                    }}
-                }}
-                ratingsSummary {{
-                    aggregateRating
-                    voteCount
-                }}
-                primaryImage {{
-                    url
-                }}
-                runtime {{
-                    displayableProperty {{
-                    value {{
-                        plainText
-                    }}
-                    }}
-                    seconds
-                }}
-                titleGenres {{
-                    genres {{
-                    genre {{
-                        text
-                    }}
-                    }}
-                }}
-                principalCredits {{
-                    category {{
-                    text
-                    id
-                    }}
-                    credits {{
-                    name {{
-                        id
-                        nameText {{
-                        text
-                        }}
-                    }}
-                    }}
-                }}
-                }}
-            }}
-            """
-        }
-
-        url = "https://api.graphql.imdb.com/"
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(url, json=query, headers=headers)
-        data = response.json()
-
-    if response.status_code != 200:
-        return imdb_info
-
-    title_data = await safe_get(data, ["data", "title"], {})
-    if not data or "data" not in data or "title" not in data["data"]:
+    title_data = await get_imdb_title(imdbID)
+    if title_data is None:
         return imdb_info
 
     imdb_info['imdbID'] = imdbID
@@ -201,24 +185,47 @@ async def get_imdb_info_api(imdbID, meta):
 
 async def search_imdb(filename, search_year):
     imdbID = '0'
-    ia = Cinemagoer()
-    search = ia.search_movie(filename)
+    index = imdb_index()
+    if index is not None and search_year not in (None, ''):
+        # A miss goes on to imdb.com, the title may be newer than the dump the index was built from
+        for movie in index.search(filename, search_year, limit=1):
+            return movie['imdb_id'].replace('tt', '')
+
+    def search_movie():
+        ia = Cinemagoer()
+        return [{'title': movie.get('title', ''), 'year': movie.get('year'), 'movieID': movie.movieID} for movie in ia.search_movie(filename)]
+
+    search = await asyncio.to_thread(responsecache.remember, 'imdb', ['search_movie', filename], search_movie) or []
     for movie in search:
         if filename in movie.get('title', ''):
             if movie.get('year') == search_year:
-                imdbID = str(movie.movieID).replace('tt', '')
+                imdbID = str(movie['movieID']).replace('tt', '')
     return imdbID
 
 
-async def imdb_other_meta(self, meta):
-    imdb_info = meta['imdb_info'] = await self.get_imdb_info_api(meta['imdb_id'], meta)
+async def imdb_other_meta(meta):
+    imdb_info = meta['imdb_info'] = await get_imdb_info_api(meta['imdb_id'], meta)
+    if 'imdbID' not in imdb_info:
+        # IMDb did not answer, the local index still knows the title
+        index = imdb_index()
+        local = index.get(meta['imdb_id']) if index is not None else None
+        if local is not None:
+            imdb_info.update({
+                'imdbID': local['imdb_id'].replace('tt', ''),
+                'title': local['title'],
+                'year': local['year'],
+                'aka': local['original_title'],
+                'type': local['type'],
+                'runtime': str(local['runtime'] or 60),
+                'genres': local['genres'].replace(',', ', '),
+            })
     meta['title'] = imdb_info['title']
     meta['year'] = imdb_info['year']
     meta['aka'] = imdb_info['aka']
     meta['poster'] = imdb_info['cover']
-    meta['original_language'] = imdb_info['original_language']
-    meta['overview'] = imdb_info['plot']
-    meta['imdb_rating'] = imdb_info['rating']
+    meta['original_language'] = imdb_info.get('original_language', meta.get('original_language'))
+    meta['overview'] = imdb_info.get('plot', '')
+    meta['imdb_rating'] = imdb_info.get('rating', 'N/A')
 
     difference = SequenceMatcher(None, meta['title'].lower(), meta['aka'][5:].lower()).ratio()
     if difference >= 0.9 or meta['aka'][5:].strip() == "" or meta['aka'][5:].strip().lower() in meta['title'].lower():
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import gzip
+import time
+import sqlite3
+import unicodedata
+from src.console import console
+
+# Episodes, games and pilots are never what a release is named after
+TITLE_TYPES = frozenset({'movie', 'short', 'tvMovie', 'tvSeries', 'tvMiniSeries', 'tvSpecial', 'tvShort', 'video'})
+BATCH = 50000
+
+_index = None
+
+
+def normalize_title(title):
+    """
+    Lowercase ASCII words, so "Amélie" and "amelie", or "Spider-Man" and "spider man", meet in the index.
+    """
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(c for c in title if not unicodedata.combining(c)).lower().replace('&', ' and ')
+    return ' '.join(re.findall(r"[a-z0-9]+", title))
+
+
+def _dataset(source_dir, name, required=True):
+    for candidate in (f"{name}.gz", name):
+        path = os.path.join(source_dir, candidate)
+        if os.path.exists(path):
+            return path
+    if required:
+        raise FileNotFoundError(f"{name}(.gz) not found in {source_dir}")
+    return None
+
+
+def _rows(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    # The dumps have no quoting, \N marks a missing value
+    with opener(path, 'rt', encoding='utf-8', newline='\n') as f:
+        next(f, None)
+        for line in f:
+            yield line.rstrip('\n').split('\t')
+
+
+def _int(value):
+    return int(value) if value not in ('\\N', '') and value.isdigit() else None
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class IMDbIndex():
+    """
+    Local SQLite index of the public IMDb datasets (title.basics, title.akas and, if present,
+    title.ratings), for title/year searches and id lookups without asking imdb.com.
+    Titles are found by normalized name prefix, every aka of a title is a name.
+    """
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def build(db_path, source_dir, debug=False):
+        """
+        Build the index from the .tsv or .tsv.gz dumps in source_dir, replacing any earlier one.
+        """
+        basics = _dataset(source_dir, 'title.basics.tsv')
+        akas = _dataset(source_dir, 'title.akas.tsv', required=False)
+        ratings = _dataset(source_dir, 'title.ratings.tsv', required=False)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        building = f"{db_path}.building"
+        if os.path.exists(building):
+            os.remove(building)
+        db = sqlite3.connect(building)
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("""
+            CREATE TABLE titles (
+                id INTEGER PRIMARY KEY,
+                type TEXT NOT NULL,
+                title TEXT NOT NULL,
+                original_title TEXT,
+                year INTEGER,
+                runtime INTEGER,
+                genres TEXT,
+                votes INTEGER NOT NULL
+            )
+        """)
+        db.execute("CREATE TABLE names (name TEXT NOT NULL, id INTEGER NOT NULL, PRIMARY KEY (name, id)) WITHOUT ROWID")
+
+        votes = {}
+        if ratings:
+            for tconst, _, num_votes in _rows(ratings):
+                votes[int(tconst[2:])] = int(num_votes)
+
+        kept = set()
+
+        def titles():
+            for tconst, title_type, primary, original, _, start_year, _, runtime, genres in _rows(basics):
+                if title_type not in TITLE_TYPES:
+                    continue
+                title_id = int(tconst[2:])
+                kept.add(title_id)
+                yield (title_id, title_type, primary, original if original != primary else None, _int(start_year),
+                       _int(runtime), genres if genres != '\\N' else None, votes.get(title_id, 0))
+
+        def akas_names():
+            for row in _rows(akas):
+                title_id = int(row[0][2:])
+                if title_id in kept:
+                    yield (normalize_title(row[2]), title_id)
+
+        for batch in _batches(titles()):
+            db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        db.create_function('normalize_title', 1, normalize_title, deterministic=True)
+        db.execute("INSERT OR IGNORE INTO names SELECT normalize_title(title), id FROM titles")
+        db.execute("INSERT OR IGNORE INTO names SELECT normalize_title(original_title), id FROM titles WHERE original_title IS NOT NULL")
+        if akas:
+            for batch in _batches(akas_names()):
+                db.executemany("INSERT OR IGNORE INTO names VALUES (?, ?)", batch)
+        db.execute("DELETE FROM names WHERE name = ''")
+        db.commit()
+        db.execute("VACUUM")
+        db.close()
+        os.replace(building, db_path)
+        if debug:
+            console.print(f"IMDb index: {len(kept)} titles from {source_dir}")
+        return len(kept)
+
+    def search(self, title, year=None, limit=20):
+        """
+        Titles with a name starting with title (exact names first, then by votes), of that year if given.
+        """
+        name = normalize_title(str(title))
+        if not name:
+            return []
+        query = ("SELECT t.id, t.type, t.title, t.original_title, t.year, t.runtime, t.genres, t.votes, MAX(n.name = ?) AS exact "
+                 "FROM names n JOIN titles t ON t.id = n.id WHERE n.name >= ? AND n.name < ?")
+        params = [name, name, f"{name}\uffff"]
+        if year not in (None, ''):
+            query += " AND t.year = ?"
+            params.append(int(year))
+        query += " GROUP BY t.id ORDER BY exact DESC, t.votes DESC LIMIT ?"
+        params.append(limit)
+        return [self._title(row) for row in self.db.execute(query, params)]
+
+    def get(self, imdb_id):
+        imdb_id = str(imdb_id).replace('tt', '')
+        if not imdb_id.isdigit():
+            return None
+        row = self.db.execute("SELECT id, type, title, original_title, year, runtime, genres, votes, 1 FROM titles WHERE id = ?",
+                              (int(imdb_id),)).fetchone()
+        return self._title(row) if row else None
+
+    @staticmethod
+    def _title(row):
+        return {
+            'imdb_id': f"tt{row[0]:07d}",
+            'type': row[1],
+            'title': row[2],
+            'original_title': row[3] or row[2],
+            'year': row[4],
+            'runtime': row[5],
+            'genres': row[6] or '',
+            'votes': row[7],
+            'exact': bool(row[8]),
+        }
+
+    def benchmark(self, samples=1000):
+        """
+        Time searches for random indexed titles, returns (mean, 95th percentile) in milliseconds.
+        """
+        rows = self.db.execute("SELECT title, year FROM titles WHERE votes > 0 ORDER BY RANDOM() LIMIT ?", (samples,)).fetchall()
+        if not rows:
+            rows = self.db.execute("SELECT title, year FROM titles ORDER BY RANDOM() LIMIT ?", (samples,)).fetchall()
+        if not rows:
+            return 0.0, 0.0
+        timings = []
+        for title, year in rows:
+            start = time.perf_counter()
+            self.search(title, year)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return sum(timings) / len(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def index_path(base_dir):
+    return os.path.join(base_dir, "data", "imdb_index.db")
+
+
+def build_imdb_index(base_dir, source_dir, debug=False):
+    """
+    Build data/imdb_index.db from the IMDb dumps in source_dir and report build and query speed.
+    """
+    global _index
+    db_path = index_path(base_dir)
+    console.print(f"Building the IMDb index from {source_dir}")
+    start = time.perf_counter()
+    try:
+        count = IMDbIndex.build(db_path, source_dir, debug)
+    except FileNotFoundError as e:
+        console.print(f"[bold red]{e}")
+        return False
+    elapsed = time.perf_counter() - start
+    console.print(f"[green]Indexed {count} titles in {elapsed:.1f}s ({os.path.getsize(db_path) / 1048576:.0f} MiB)")
+    if _index is not None:
+        _index.close()
+        _index = None
+    index = IMDbIndex(db_path)
+    mean, p95 = index.benchmark()
+    index.close()
+    console.print(f"[green]Title searches: {mean:.2f} ms on average, {p95:.2f} ms at the 95th percentile")
+    return True
+
+
+def imdb_index(base_dir=None):
+    """
+    The built index, or None when there is none and lookups should go to imdb.com.
+    """
+    global _index
+    if _index is None:
+        if base_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        db_path = index_path(base_dir)
+        if not os.path.exists(db_path):
+            return None
+        _index = IMDbIndex(db_path)
+    return _index
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import asyncio
+import itertools
+import threading
+import contextvars
+
+# Lower runs first. Sequential hashing goes ahead of seek-heavy work on the same disk.
+HASHING = 0
+BDINFO = 1
+MEDIAINFO = 1
+SCREENSHOTS = 2
+
+# A waiter gains one priority level for every AGING seconds it has waited
+AGING = 30
+
+# Devices already held by the current task/thread, so nested slots on the same disk pass through
+_held = contextvars.ContextVar('io_held', default=frozenset())
+
+
+def _sys_block_path(dev):
+    return f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+
+
+def is_rotational(dev):
+    """
+    True/False from the kernel's queue/rotational flag for dev (or its parent disk for a partition), None if unknown.
+    """
+    base = _sys_block_path(dev)
+    for queue in (os.path.join(base, "queue", "rotational"), os.path.join(base, "..", "queue", "rotational")):
+        try:
+            with open(queue) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+class IOScheduler():
+    """
+    Per-device (st_dev) admission control for disk heavy stages, shared by every queue item in the process.
+    """
+    def __init__(self):
+        self.configured_limit = 0
+        self._lock = threading.Condition()
+        self._active = {}
+        self._waiting = {}
+        self._limits = {}
+        self._seq = itertools.count()
+
+    def configure(self, limit):
+        """
+        limit > 0 applies to every device, 0 means 1 for spinning disks and unlimited otherwise.
+        """
+        with self._lock:
+            self.configured_limit = int(limit or 0)
+            self._limits.clear()
+
+    def limit(self, dev):
+        if dev not in self._limits:
+            if self.configured_limit > 0:
+                self._limits[dev] = self.configured_limit
+            else:
+                self._limits[dev] = 1 if is_rotational(dev) else None
+        return self._limits[dev]
+
+    def _next(self, dev):
+        now = time.monotonic()
+        return min(self._waiting[dev], key=lambda w: (w[0] - (now - w[1]) / AGING, w[2]))
+
+    def acquire(self, dev, priority):
+        with self._lock:
+            limit = self.limit(dev)
+            if limit is None:
+                return
+            entry = (priority, time.monotonic(), next(self._seq))
+            waiting = self._waiting.setdefault(dev, [])
+            waiting.append(entry)
+            while self._active.get(dev, 0) >= limit or self._next(dev) is not entry:
+                self._lock.wait(timeout=AGING)
+            waiting.remove(entry)
+            self._active[dev] = self._active.get(dev, 0) + 1
+            self._lock.notify_all()
+
+    def release(self, dev):
+        with self._lock:
+            if self.limit(dev) is None:
+                return
+            self._active[dev] -= 1
+            self._lock.notify_all()
+
+    def starving(self, dev, priority):
+        """
+        True if a waiter on dev has aged to at least this priority, and would win the slot on release.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return any(w[0] - (now - w[1]) / AGING <= priority for w in self._waiting.get(dev, []))
+
+
+_scheduler = IOScheduler()
+
+
+def configure_io(config):
+    _scheduler.configure(config['DEFAULT'].get('io_device_limit', 0))
+
+
+class io_slot():
+    """
+    Hold a concurrency slot on the device backing path, with `with` or `async with`.
+    """
+    def __init__(self, path, priority):
+        try:
+            self.dev = os.stat(path).st_dev
+        except OSError:
+            self.dev = None
+        self.priority = priority
+        self._token = None
+        self._owned = False
+
+    def _claim(self):
+        if self.dev is None or self.dev in _held.get():
+            return False
+        return True
+
+    def _enter(self):
+        self._owned = True
+        self._token = _held.set(_held.get() | {self.dev})
+        return self
+
+    def __enter__(self):
+        if self._claim():
+            _scheduler.acquire(self.dev, self.priority)
+            return self._enter()
+        return self
+
+    async def __aenter__(self):
+        if self._claim():
+            waiter = asyncio.ensure_future(asyncio.to_thread(_scheduler.acquire, self.dev, self.priority))
+            try:
+                await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The acquiring thread can't be interrupted, give the slot back once it gets it
+                waiter.add_done_callback(lambda f: f.cancelled() or f.exception() or _scheduler.release(self.dev))
+                raise
+            return self._enter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._owned:
+            _held.reset(self._token)
+            self._owned = False
+            _scheduler.release(self.dev)
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
+
+    def workers(self, wanted):
+        """
+        Cap a worker pool to what the device allows, so a batch doesn't seek in parallel on a spinning disk.
+        """
+        limit = _scheduler.limit(self.dev) if self.dev is not None else None
+        return max(1, min(wanted, limit)) if limit else wanted
+
+    def checkpoint(self):
+        """
+        Briefly hand the device over if another stage has been waiting too long. Call between units of work.
+        """
+        if self._owned and _scheduler.starving(self.dev, self.priority):
+            _scheduler.release(self.dev)
+            _scheduler.acquire(self.dev, self.priority)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import time
+import asyncio
+from src.console import console
+
+
+class MetaDAG():
+    """
+    Steps of a stage declared with the steps whose output they need, run on the event loop
+    as concurrently as those dependencies allow, and timed per step.
+
+        dag = MetaDAG()
+
+        @dag.step("tmdb", requires=("category",))
+        async def tmdb():
+            ...
+
+        await dag.run()
+    """
+    def __init__(self):
+        self.steps = {}
+        self.inputs = {}
+        self.rewrites = {}
+        self.timings = {}
+
+    def step(self, name, requires=(), inputs=(), rewrites=()):
+        """
+        inputs are the meta keys (set from arguments) the step reads, rewrites the steps whose
+        output it overwrites in place, and so has to start from again when it runs once more.
+        """
+        def register(func):
+            if name in self.steps:
+                raise ValueError(f"Step {name} is already declared")
+            self.steps[name] = (func, tuple(requires))
+            self.inputs[name] = frozenset(inputs)
+            self.rewrites[name] = tuple(rewrites)
+            return func
+        return register
+
+    def known_inputs(self):
+        return frozenset().union(*self.inputs.values())
+
+    def stale(self, changed):
+        """
+        Steps to run again after the meta keys in changed were edited: the steps reading them,
+        everything downstream of those, and the steps they rewrite.
+        """
+        dependents = {name: set() for name in self.steps}
+        for name, (_, requires) in self.steps.items():
+            for each in requires:
+                dependents[each].add(name)
+        stale = set()
+        pending = [name for name, inputs in self.inputs.items() if inputs & set(changed)]
+        while pending:
+            name = pending.pop()
+            if name in stale:
+                continue
+            stale.add(name)
+            pending.extend(dependents[name])
+            pending.extend(self.rewrites[name])
+        return stale
+
+    def _check(self):
+        for name, (_, requires) in self.steps.items():
+            for each in requires:
+                if each not in self.steps:
+                    raise ValueError(f"Step {name} requires unknown step {each}")
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Steps have a cycle through {name}")
+            visiting.add(name)
+            for each in self.steps[name][1]:
+                visit(each)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    async def run(self, only=None):
+        """
+        Run every step (or the steps in only, the rest count as done) once its requirements finished.
+        The first failing step cancels the rest and is raised.
+        """
+        self._check()
+        self.timings = {}
+        started = time.perf_counter()
+        tasks = {}
+
+        async def run_step(name):
+            func, requires = self.steps[name]
+            if requires:
+                await asyncio.gather(*(tasks[each] for each in requires))
+            if only is not None and name not in only:
+                return
+            start = time.perf_counter()
+            await func()
+            self.timings[name] = (start - started, time.perf_counter() - started)
+
+        # Every task exists before any of them runs, so run_step can look up its requirements
+        tasks.update({name: asyncio.ensure_future(run_step(name)) for name in self.steps})
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    def critical_path(self):
+        """
+        The chain of steps, each waiting on the last to finish of its requirements, that ended last.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda each: self.timings[each][1])
+        path = [name]
+        while any(each in self.timings for each in self.steps[name][1]):
+            name = max((each for each in self.steps[name][1] if each in self.timings), key=lambda each: self.timings[each][1])
+            path.append(name)
+        return path[::-1]
+
+    def print_timings(self):
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            console.print(f"  {name}: {end - start:.2f}s (started at {start:.2f}s)")
+        path = self.critical_path()
+        if path:
+            steps = " -> ".join(f"{name} {self.timings[name][1] - self.timings[name][0]:.2f}s" for name in path)
+            console.print(f"  Critical path: {steps}")
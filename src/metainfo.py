@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+import os
+import hashlib
+
+_cache = {}
+
+
+def _skip(buf, pos):
+    """
+    Return the end offset of the bencoded value starting at pos, without decoding it.
+    """
+    kind = buf[pos:pos + 1]
+    if kind == b'i':
+        return buf.index(b'e', pos) + 1
+    if kind in (b'l', b'd'):
+        pos += 1
+        while buf[pos:pos + 1] != b'e':
+            pos = _skip(buf, pos)
+        return pos + 1
+    colon = buf.index(b':', pos)
+    return colon + 1 + int(buf[pos:colon])
+
+
+def _decode(buf, pos):
+    kind = buf[pos:pos + 1]
+    if kind == b'i':
+        end = buf.index(b'e', pos)
+        return int(buf[pos + 1:end]), end + 1
+    if kind == b'l':
+        pos += 1
+        items = []
+        while buf[pos:pos + 1] != b'e':
+            item, pos = _decode(buf, pos)
+            items.append(item)
+        return items, pos + 1
+    if kind == b'd':
+        pos += 1
+        items = {}
+        while buf[pos:pos + 1] != b'e':
+            key, pos = _decode(buf, pos)
+            items[key], pos = _decode(buf, pos)
+        return items, pos + 1
+    colon = buf.index(b':', pos)
+    end = colon + 1 + int(buf[pos:colon])
+    value = buf[colon + 1:end]
+    try:
+        return value.decode('utf-8'), end
+    except UnicodeDecodeError:
+        return value, end
+
+
+def _encode(value):
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b'i%de' % value
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b'%d:' % len(value) + bytes(value)
+    if isinstance(value, (list, tuple)):
+        return b'l' + b''.join(_encode(each) for each in value) + b'e'
+    if isinstance(value, dict):
+        items = sorted((key.encode('utf-8') if isinstance(key, str) else key, each) for key, each in value.items())
+        return b'd' + b''.join(_encode(key) + _encode(each) for key, each in items) + b'e'
+    raise TypeError(f"Can't bencode {type(value).__name__}")
+
+
+def _spans(buf, pos):
+    """
+    Map each key of the bencoded dict at pos to the (start, end) offsets of its value.
+    """
+    if buf[pos:pos + 1] != b'd':
+        raise ValueError("Expected a bencoded dictionary")
+    pos += 1
+    spans = {}
+    while buf[pos:pos + 1] != b'e':
+        key, pos = _decode(buf, pos)
+        end = _skip(buf, pos)
+        spans[key] = (pos, end)
+        pos = end
+    return spans
+
+
+class Metainfo():
+    """
+    A .torrent that is only parsed down to its top level and info keys. Untouched values,
+    including the pieces string, stay as memoryview slices of the original file and are
+    spliced back verbatim on write, so deriving per-tracker torrents never re-encodes them.
+    """
+    def __init__(self, top, info):
+        self._top = top
+        self._info = info
+        self._infohash = None
+
+    @classmethod
+    def read(cls, path):
+        """
+        Parse path once per modification and return a private copy of it.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = _cache.get(path)
+        if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+            with open(path, 'rb') as f:
+                buf = f.read()
+            view = memoryview(buf)
+            top = _spans(buf, 0)
+            if 'info' not in top:
+                raise ValueError(f"{path} has no info dictionary")
+            info = {key: view[start:end] for key, (start, end) in _spans(buf, top['info'][0]).items()}
+            top = {key: view[start:end] for key, (start, end) in top.items()}
+            for key in ('name', 'piece length', 'pieces'):
+                if key not in info:
+                    raise ValueError(f"{path} is missing info['{key}']")
+            if 'length' not in info and 'files' not in info:
+                raise ValueError(f"{path} has neither info['length'] nor info['files']")
+            cached = ((stat.st_mtime_ns, stat.st_size), cls(top, info))
+            _cache[path] = cached
+        return cached[1].copy()
+
+    def copy(self):
+        derived = type(self)(dict(self._top), dict(self._info))
+        derived._infohash = self._infohash
+        return derived
+
+    def get(self, key, default=None):
+        if key == 'info' or key not in self._top:
+            return default
+        return _decode(bytes(self._top[key]), 0)[0]
+
+    def get_info(self, key, default=None):
+        if key not in self._info:
+            return default
+        return _decode(bytes(self._info[key]), 0)[0]
+
+    def set(self, key, value):
+        self._top[key] = memoryview(_encode(value))
+
+    def set_info(self, key, value):
+        self._info[key] = memoryview(_encode(value))
+        self._infohash = None
+
+    def keep(self, keys):
+        for key in list(self._top):
+            if key != 'info' and key not in keys:
+                del self._top[key]
+
+    def keep_info(self, keys):
+        for key in list(self._info):
+            if key not in keys:
+                del self._info[key]
+                self._infohash = None
+
+    @property
+    def name(self):
+        return self.get_info('name')
+
+    @property
+    def piece_size(self):
+        return self.get_info('piece length')
+
+    @property
+    def pieces(self):
+        span = self._info['pieces']
+        return (len(span) - bytes(span[:21]).index(b':') - 1) // 20
+
+    def _chunks(self, spans, info):
+        yield b'd'
+        for key in sorted(spans, key=lambda each: each.encode('utf-8') if isinstance(each, str) else each):
+            yield _encode(key)
+            if key == 'info' and info is not None:
+                yield from info
+            else:
+                yield spans[key]
+        yield b'e'
+
+    def _info_chunks(self):
+        return list(self._chunks(self._info, None))
+
+    @property
+    def infohash(self):
+        if self._infohash is None:
+            sha = hashlib.sha1()
+            for chunk in self._info_chunks():
+                sha.update(chunk)
+            self._infohash = sha.hexdigest()
+        return self._infohash
+
+    def dump(self):
+        return b''.join(self._chunks(self._top, self._info_chunks()))
+
+    def write(self, path):
+        with open(path, 'wb') as f:
+            f.writelines(self._chunks(self._top, self._info_chunks()))
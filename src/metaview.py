@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import copy
+from collections import ChainMap
+
+# Large values that are only ever read after prep, shared between views instead of copied.
+# Code holding a view must replace these (meta['discs'] = [...]) rather than change them in place.
+SHARED_KEYS = frozenset({'mediainfo', 'bdinfo', 'discs', 'filelist', 'imdb_info', 'image_list', 'image_sizes'})
+
+
+class MetaView(ChainMap):
+    """
+    Copy-on-write view of meta. Writes and deletes land in the view's own layer, other mutable
+    values are deep-copied into that layer the first time they are read, and SHARED_KEYS are
+    handed out as is. Not JSON serializable, use dict(view) for that.
+    """
+    def __init__(self, base, layer=None, deleted=None):
+        super().__init__({} if layer is None else layer, base)
+        self._deleted = set() if deleted is None else deleted
+
+    @property
+    def layer(self):
+        return self.maps[0]
+
+    @property
+    def base(self):
+        return self.maps[1]
+
+    def __getitem__(self, key):
+        if key in self.layer:
+            return self.layer[key]
+        if key in self._deleted or key not in self.base:
+            return self.__missing__(key)
+        value = self.base[key]
+        if key not in SHARED_KEYS and isinstance(value, (dict, list, set)):
+            value = copy.deepcopy(value)
+            self.layer[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.layer[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key in self.layer:
+            del self.layer[key]
+            if key in self.base:
+                self._deleted.add(key)
+        elif key in self.base and key not in self._deleted:
+            self._deleted.add(key)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.layer or (key in self.base and key not in self._deleted)
+
+    def __iter__(self):
+        yield from self.layer
+        for key in self.base:
+            if key not in self.layer and key not in self._deleted:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        return any(True for _ in self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        for key in self:
+            return key, self.pop(key)
+        raise KeyError("popitem(): view is empty")
+
+    def clear(self):
+        self.layer.clear()
+        self._deleted.update(self.base)
+
+    def copy(self):
+        """
+        A sibling view over the same base with a copy of this view's layer.
+        """
+        return type(self)(self.base, copy.deepcopy(self.layer), set(self._deleted))
+
+    __copy__ = copy
+
+    def new_child(self, m=None, **kwargs):
+        raise NotImplementedError("MetaView has a single layer, use MetaView(view) to stack another")
+
+    @property
+    def parents(self):
+        return self.base
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self.layer)} changed, {len(self._deleted)} deleted)"
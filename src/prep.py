@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from src.args import Args
 from src.console import console
+from src import httpclient
 from src.exceptions import *  # noqa: F403
 from src.clients import Clients
 from data.config import config
@@ -9,12 +10,15 @@ from src.trackersetup import TRACKER_SETUP, tracker_class_map
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
 from src.tvmaze import search_tvmaze
 from src.imdb import get_imdb_info_api, search_imdb, imdb_other_meta
-from src.trackermeta import update_metadata_from_tracker
+from src.trackermeta import lookup_tracker_metadata, update_metadata_from_tracker, NOT_LOOKED_UP
 from src.tmdb import tmdb_other_meta, get_tmdb_imdb_from_mediainfo, get_tmdb_from_imdb, get_tmdb_id
 from src.region import get_region, get_distributor, get_service
 from src.exportmi import exportInfo, mi_resolution
 from src.getseasonep import get_season_episode
+from src.metadag import MetaDAG
 from src.trackerstatus import process_all_trackers
+from src.speculate import Speculation
+from src.torrentcreate import start_base_torrent, cancel_base_torrent
 
 try:
     import traceback
@@ -33,6 +37,7 @@ try:
     from pymediainfo import MediaInfo
     import tmdbsimple as tmdb
     import time
+    import asyncio
     import itertools
     import cli_ui
     import aiohttp
@@ -45,6 +50,16 @@ except KeyboardInterrupt:
     exit()
 
 
+# Arguments an edit can change without redoing any metadata, they are read when naming or uploading
+EDIT_WITHOUT_RECOMPUTE = frozenset({
+    'no_season', 'no_year', 'no_aka', 'manual_year', 'trackers', 'saved_trackers', 'anon', 'stream', 'draft', 'modq',
+    'freeleech', 'personalrelease', 'screens', 'manual_frames', 'imghost', 'skip_imghost_upload', 'desc', 'desclink',
+    'descfile', 'nfo', 'debug', 'ffdebug', 'dupe', 'recheck_dupes', 'offline', 'client', 'qbit_tag', 'qbit_cat',
+    'rtorrent_label', 'unattended', 'unattended_confirm', 'vapoursynth', 'foreign', 'opera', 'asian', 'disctype',
+    'untouched', 'no_seed', 'webdv', 'hardcoded-subs',
+})
+
+
 class Prep():
     """
     Prepare for upload:
@@ -58,6 +73,7 @@ class Prep():
         self.config = config
         self.img_host = img_host.lower()
         tmdb.API_KEY = config['DEFAULT']['tmdb_api']
+        tmdb.REQUESTS_SESSION = httpclient.shared_session()
 
     async def gather_prep(self, meta, mode):
         meta['cutoff'] = int(self.config['DEFAULT'].get('cutoff_screens', 3))
@@ -187,6 +203,14 @@ class Prep():
 
         meta['bdinfo'] = bdinfo
 
+        # The file list is known now, so BASE.torrent can be hashed while the rest of prep runs
+        client = Clients(config=config)
+        tracker_setup = TRACKER_SETUP(config=config)
+        if mode == 'cli' and meta.get('nohash', False) is False and str(self.config['DEFAULT'].get('background_hashing', True)).lower() == "true":
+            hash_meta = dict(meta)
+            hash_meta['trackers'] = meta['saved_trackers'] if "saved_trackers" in meta else tracker_setup.trackers_enabled(meta)
+            start_base_torrent(hash_meta, client)
+
         # Debugging information after population
         # console.print(f"Debug: meta['filelist'] after population: {meta.get('filelist', 'Not Set')}")
 
@@ -199,10 +223,8 @@ class Prep():
         with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/DESCRIPTION.txt", 'w', newline="", encoding='utf8') as description:
             description.write(description_text)
 
-        client = Clients(config=config)
         if meta.get('infohash') is not None:
             meta = await client.get_ptp_from_hash(meta)
-        tracker_setup = TRACKER_SETUP(config=config)
         if not meta.get('image_list'):
             # Reuse information from trackers with fallback
             found_match = False
@@ -221,7 +243,7 @@ class Prep():
 
                 specific_tracker = next((tracker_keys[key] for key in tracker_keys if meta.get(key) is not None), None)
 
-                async def process_tracker(tracker_name, meta):
+                async def process_tracker(tracker_name, meta, lookup=NOT_LOOKED_UP):
                     nonlocal found_match
                     if tracker_class_map is None:
                         print(f"Tracker class for {tracker_name} not found.")
@@ -230,7 +252,7 @@ class Prep():
                     tracker_instance = tracker_class_map[tracker_name](config=config)
                     try:
                         updated_meta, match = await update_metadata_from_tracker(
-                            tracker_name, tracker_instance, meta, search_term, search_file_folder
+                            tracker_name, tracker_instance, meta, search_term, search_file_folder, lookup=lookup
                         )
                         if match:
                             found_match = True
@@ -248,12 +270,32 @@ class Prep():
                 else:
                     # Process all trackers with API = true if no specific tracker is set in meta
                     tracker_order = ["PTP", "BLU", "AITHER", "LST", "OE", "TIK", "HDB"]
-
-                    for tracker_name in tracker_order:
-                        if not found_match:  # Stop checking once a match is found
-                            tracker_config = self.config['TRACKERS'].get(tracker_name, {})
-                            if str(tracker_config.get('useAPI', 'false')).lower() == "true":
-                                meta = await process_tracker(tracker_name, meta)
+                    enabled = [
+                        tracker_name for tracker_name in tracker_order
+                        if str(self.config['TRACKERS'].get(tracker_name, {}).get('useAPI', 'false')).lower() == "true"
+                    ]
+
+                    # Search them all at once, then confirm in priority order. The first match wins
+                    # and the searches still running on lower priority trackers are cancelled.
+                    lookups = {
+                        tracker_name: asyncio.ensure_future(lookup_tracker_metadata(
+                            tracker_name, tracker_class_map[tracker_name](config=config), meta, search_term, search_file_folder
+                        ))
+                        for tracker_name in enabled
+                    }
+                    try:
+                        for tracker_name in enabled:
+                            try:
+                                lookup = await lookups[tracker_name]
+                            except Exception as e:
+                                console.print(f"[yellow]{tracker_name} search failed: {e}")
+                                continue
+                            meta = await process_tracker(tracker_name, meta, lookup)
+                            if found_match:  # Stop checking once a match is found
+                                break
+                    finally:
+                        for task in lookups.values():
+                            task.cancel()
 
                 if not found_match:
                     console.print("[yellow]No matches found on any trackers.[/yellow]")
@@ -267,90 +309,163 @@ class Prep():
             meta_start_time = time.time()
         if meta.get('manual_language'):
             meta['original_langauge'] = meta.get('manual_language').lower()
-        meta['tmdb'] = meta.get('tmdb_manual', None)
-        meta['type'] = await self.get_type(video, meta['scene'], meta['is_disc'], meta)
-        if meta.get('category', None) is None:
-            meta['category'] = await self.get_cat(video)
-        else:
-            meta['category'] = meta['category'].upper()
-        if meta.get('tmdb', None) is None and meta.get('imdb', None) is None:
-            meta['category'], meta['tmdb'], meta['imdb'] = await get_tmdb_imdb_from_mediainfo(mi, meta['category'], meta['is_disc'], meta['tmdb'], meta['imdb'])
-        if meta.get('tmdb', None) is None and meta.get('imdb', None) is None:
-            meta = await get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename)
-        elif meta.get('imdb', None) is not None and meta.get('tmdb_manual', None) is None:
-            meta['imdb_id'] = str(meta['imdb']).replace('tt', '')
-            meta = await get_tmdb_from_imdb(meta, filename)
-        else:
-            meta['tmdb_manual'] = meta.get('tmdb', None)
-
-        # If no tmdb, use imdb for meta
-        if int(meta['tmdb']) == 0:
-            meta = await imdb_other_meta(meta)
-        else:
-            meta = await tmdb_other_meta(meta)
-        # Search tvmaze
-        if meta['category'] == "TV":
-            meta['tvmaze_id'], meta['imdb_id'], meta['tvdb_id'] = await search_tvmaze(filename, meta['search_year'], meta.get('imdb_id', '0'), meta.get('tvdb_id', 0), meta)
-        else:
-            meta.setdefault('tvmaze_id', '0')
-        # If no imdb, search for it
-        if meta.get('imdb_id', None) is None:
-            meta['imdb_id'] = await search_imdb(filename, meta['search_year'])
-        if meta.get('imdb_info', None) is None and int(meta['imdb_id']) != 0:
-            meta['imdb_info'] = await get_imdb_info_api(meta['imdb_id'], meta)
-        if meta.get('tag', None) is None:
-            meta['tag'] = await self.get_tag(video, meta)
-        else:
-            if not meta['tag'].startswith('-') and meta['tag'] != "":
-                meta['tag'] = f"-{meta['tag']}"
-        if meta['category'] == "TV":
-            meta = await get_season_episode(video, meta)
-        meta = await self.tag_override(meta)
-        if meta.get('tag') == "-SubsPlease":  # SubsPlease-specific
-            tracks = meta.get('mediainfo', {}).get('media', {}).get('track', [])  # Get all tracks
-            bitrate = tracks[1].get('BitRate', '') if len(tracks) > 1 and not isinstance(tracks[1].get('BitRate', ''), dict) else ''  # Check that bitrate is not a dict
-            bitrate_oldMediaInfo = tracks[0].get('OverallBitRate', '') if len(tracks) > 0 and not isinstance(tracks[0].get('OverallBitRate', ''), dict) else ''  # Check for old MediaInfo
-            meta['episode_title'] = ""
-            if (bitrate.isdigit() and int(bitrate) >= 8000000) or (bitrate_oldMediaInfo.isdigit() and int(bitrate_oldMediaInfo) >= 8000000):
-                meta['service'] = "CR"
-            elif (bitrate.isdigit() or bitrate_oldMediaInfo.isdigit()):  # Only assign if at least one bitrate is present, otherwise leave it to user
-                meta['service'] = "HIDI"
         meta['video'] = video
-        meta['audio'], meta['channels'], meta['has_commentary'] = await self.get_audio_v2(mi, meta, bdinfo)
-        if meta['tag'][1:].startswith(meta['channels']):
-            meta['tag'] = meta['tag'].replace(f"-{meta['channels']}", '')
-        if meta.get('no_tag', False):
-            meta['tag'] = ""
-        meta['3D'] = await self.is_3d(mi, bdinfo)
-        if meta.get('manual_source', None):
-            meta['source'] = meta['manual_source']
-            _, meta['type'] = await self.get_source(meta['type'], video, meta['path'], meta['is_disc'], meta, folder_id, base_dir)
-        else:
-            meta['source'], meta['type'] = await self.get_source(meta['type'], video, meta['path'], meta['is_disc'], meta, folder_id, base_dir)
-        if meta.get('service', None) in (None, ''):
-            meta['service'], meta['service_longname'] = await get_service(video, meta.get('tag', ''), meta['audio'], meta['filename'])
-        elif meta.get('service'):
-            services = await get_service(get_services_only=True)
-            meta['service_longname'] = max((k for k, v in services.items() if v == meta['service']), key=len, default=meta['service'])
-        meta['uhd'] = await self.get_uhd(meta['type'], guessit(meta['path']), meta['resolution'], meta['path'])
-        meta['hdr'] = await self.get_hdr(mi, bdinfo)
-        meta['distributor'] = await get_distributor(meta['distributor'])
-        if meta.get('is_disc', None) == "BDMV":  # Blu-ray Specific
-            meta['region'] = await get_region(bdinfo, meta.get('region', None))
-            meta['video_codec'] = await self.get_video_codec(bdinfo)
-        else:
-            meta['video_encode'], meta['video_codec'], meta['has_encode_settings'], meta['bit_depth'] = await self.get_video_encode(mi, meta['type'], bdinfo)
-        if meta.get('no_edition') is False:
-            meta['edition'], meta['repack'] = await self.get_edition(meta['path'], bdinfo, meta['filelist'], meta.get('manual_edition'))
-            if "REPACK" in meta.get('edition', ""):
-                meta['repack'] = re.search(r"REPACK[\d]?", meta['edition'])[0]
-                meta['edition'] = re.sub(r"REPACK[\d]?", "", meta['edition']).strip().replace('  ', ' ')
-        else:
-            meta['edition'] = ""
+
+        # Each step names the steps whose meta keys it reads, everything else runs alongside it.
+        # tag_override can rewrite type from data/tags.json, so source waits for it.
+        # inputs are the argument keys each step reads, an edit only runs the steps they reach again.
+        dag = MetaDAG()
+
+        def merge(result):
+            if result is not meta:
+                meta.update(result)
+
+        @dag.step("type", inputs=("manual_type",))
+        async def type_step():
+            meta['type'] = await self.get_type(video, meta['scene'], meta['is_disc'], meta)
+
+        @dag.step("category", inputs=("category",))
+        async def category_step():
+            if meta.get('category', None) is None:
+                meta['category'] = await self.get_cat(video)
+            else:
+                meta['category'] = meta['category'].upper()
+
+        @dag.step("ids", requires=("category",), inputs=("tmdb_manual", "imdb"), rewrites=("category",))
+        async def ids_step():
+            meta['tmdb'] = meta.get('tmdb_manual', None)
+            if meta.get('tmdb', None) is None and meta.get('imdb', None) is None:
+                meta['category'], meta['tmdb'], meta['imdb'] = await get_tmdb_imdb_from_mediainfo(mi, meta['category'], meta['is_disc'], meta['tmdb'], meta['imdb'])
+            if meta.get('tmdb', None) is None and meta.get('imdb', None) is None:
+                merge(await get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename))
+            elif meta.get('imdb', None) is not None and meta.get('tmdb_manual', None) is None:
+                meta['imdb_id'] = str(meta['imdb']).replace('tt', '')
+                merge(await get_tmdb_from_imdb(meta, filename))
+            else:
+                meta['tmdb_manual'] = meta.get('tmdb', None)
+
+        @dag.step("tmdb_meta", requires=("ids",), inputs=("tvdb_manual", "mal", "manual_language", "keywords"))
+        async def tmdb_meta_step():
+            # If no tmdb, use imdb for meta
+            if int(meta['tmdb']) == 0:
+                merge(await imdb_other_meta(meta))
+            else:
+                merge(await tmdb_other_meta(meta))
+
+        @dag.step("tvmaze", requires=("tmdb_meta",), inputs=("tvmaze_manual", "manual_date"))
+        async def tvmaze_step():
+            if meta['category'] == "TV":
+                meta['tvmaze_id'], meta['imdb_id'], meta['tvdb_id'] = await search_tvmaze(filename, meta['search_year'], meta.get('imdb_id', '0'), meta.get('tvdb_id', 0), meta)
+            else:
+                meta.setdefault('tvmaze_id', '0')
+
+        @dag.step("imdb_search", requires=("tvmaze",))
+        async def imdb_search_step():
+            # If no imdb, search for it
+            if meta.get('imdb_id', None) is None:
+                meta['imdb_id'] = await search_imdb(filename, meta['search_year'])
+
+        @dag.step("imdb_info", requires=("imdb_search",))
+        async def imdb_info_step():
+            if meta.get('imdb_info', None) is None and int(meta['imdb_id']) != 0:
+                meta['imdb_info'] = await get_imdb_info_api(meta['imdb_id'], meta)
+
+        @dag.step("tag", inputs=("tag",))
+        async def tag_step():
+            if meta.get('tag', None) is None:
+                meta['tag'] = await self.get_tag(video, meta)
+            else:
+                if not meta['tag'].startswith('-') and meta['tag'] != "":
+                    meta['tag'] = f"-{meta['tag']}"
+
+        @dag.step("season_episode", requires=("tmdb_meta", "tvmaze", "tag"), inputs=("manual_season", "manual_episode", "manual_date", "manual_episode_title", "mal"))
+        async def season_episode_step():
+            if meta['category'] == "TV":
+                merge(await get_season_episode(video, meta))
+
+        @dag.step("tag_override", requires=("season_episode", "type"), rewrites=("type",))
+        async def tag_override_step():
+            merge(await self.tag_override(meta))
+
+        @dag.step("subsplease", requires=("tag_override",))
+        async def subsplease_step():
+            if meta.get('tag') == "-SubsPlease":  # SubsPlease-specific
+                tracks = meta.get('mediainfo', {}).get('media', {}).get('track', [])  # Get all tracks
+                bitrate = tracks[1].get('BitRate', '') if len(tracks) > 1 and not isinstance(tracks[1].get('BitRate', ''), dict) else ''  # Check that bitrate is not a dict
+                bitrate_oldMediaInfo = tracks[0].get('OverallBitRate', '') if len(tracks) > 0 and not isinstance(tracks[0].get('OverallBitRate', ''), dict) else ''  # Check for old MediaInfo
+                meta['episode_title'] = ""
+                if (bitrate.isdigit() and int(bitrate) >= 8000000) or (bitrate_oldMediaInfo.isdigit() and int(bitrate_oldMediaInfo) >= 8000000):
+                    meta['service'] = "CR"
+                elif (bitrate.isdigit() or bitrate_oldMediaInfo.isdigit()):  # Only assign if at least one bitrate is present, otherwise leave it to user
+                    meta['service'] = "HIDI"
+
+        @dag.step("audio", requires=("tmdb_meta",), inputs=("dual_audio", "no_dub", "manual_language"))
+        async def audio_step():
+            meta['audio'], meta['channels'], meta['has_commentary'] = await self.get_audio_v2(mi, meta, bdinfo)
+
+        @dag.step("tag_cleanup", requires=("audio", "subsplease"), inputs=("no_tag",), rewrites=("tag",))
+        async def tag_cleanup_step():
+            if meta['tag'][1:].startswith(meta['channels']):
+                meta['tag'] = meta['tag'].replace(f"-{meta['channels']}", '')
+            if meta.get('no_tag', False):
+                meta['tag'] = ""
+
+        @dag.step("3d")
+        async def is_3d_step():
+            meta['3D'] = await self.is_3d(mi, bdinfo)
+
+        @dag.step("source", requires=("type", "tag_override"), inputs=("manual_source",), rewrites=("type",))
+        async def source_step():
+            if meta.get('manual_source', None):
+                meta['source'] = meta['manual_source']
+                _, meta['type'] = await self.get_source(meta['type'], video, meta['path'], meta['is_disc'], meta, folder_id, base_dir)
+            else:
+                meta['source'], meta['type'] = await self.get_source(meta['type'], video, meta['path'], meta['is_disc'], meta, folder_id, base_dir)
+
+        @dag.step("service", requires=("tag_cleanup",), inputs=("service",))
+        async def service_step():
+            if meta.get('service', None) in (None, ''):
+                meta['service'], meta['service_longname'] = await get_service(video, meta.get('tag', ''), meta['audio'], meta['filename'])
+            elif meta.get('service'):
+                services = await get_service(get_services_only=True)
+                meta['service_longname'] = max((k for k, v in services.items() if v == meta['service']), key=len, default=meta['service'])
+
+        @dag.step("uhd", requires=("source",))
+        async def uhd_step():
+            meta['uhd'] = await self.get_uhd(meta['type'], guessit(meta['path']), meta['resolution'], meta['path'])
+
+        @dag.step("hdr")
+        async def hdr_step():
+            meta['hdr'] = await self.get_hdr(mi, bdinfo)
+
+        @dag.step("distributor", inputs=("distributor",))
+        async def distributor_step():
+            meta['distributor'] = await get_distributor(meta['distributor'])
+
+        @dag.step("video_codec", requires=("source",), inputs=("region",))
+        async def video_codec_step():
+            if meta.get('is_disc', None) == "BDMV":  # Blu-ray Specific
+                meta['region'] = await get_region(bdinfo, meta.get('region', None))
+                meta['video_codec'] = await self.get_video_codec(bdinfo)
+            else:
+                meta['video_encode'], meta['video_codec'], meta['has_encode_settings'], meta['bit_depth'] = await self.get_video_encode(mi, meta['type'], bdinfo)
+
+        @dag.step("edition", inputs=("manual_edition", "no_edition"))
+        async def edition_step():
+            if meta.get('no_edition') is False:
+                meta['edition'], meta['repack'] = await self.get_edition(meta['path'], bdinfo, meta['filelist'], meta.get('manual_edition'))
+                if "REPACK" in meta.get('edition', ""):
+                    meta['repack'] = re.search(r"REPACK[\d]?", meta['edition'])[0]
+                    meta['edition'] = re.sub(r"REPACK[\d]?", "", meta['edition']).strip().replace('  ', ' ')
+            else:
+                meta['edition'] = ""
+
+        await dag.run()
         meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'] = await self.get_name(meta)
         if meta['debug']:
             meta_finish_time = time.time()
             console.print(f"Metadata processed in {meta_finish_time - meta_start_time:.2f} seconds")
+            dag.print_timings()
         parser = Args(config)
         helper = UploadHelper()
         enabled_trackers = tracker_setup.trackers_enabled(meta)
@@ -360,8 +475,44 @@ class Prep():
             meta['trackers'] = meta['saved_trackers']
         if meta.get('edit', False):
             meta['edit'] = False
-        confirm = await helper.get_confirmation(meta)
+
+        def take_screenshots(target):
+            if target['is_disc'] == "BDMV":
+                use_vs = target.get('vapoursynth', False)
+                try:
+                    disc_screenshots(
+                        target, filename, bdinfo, target['uuid'], base_dir, use_vs,
+                        target.get('image_list', []), target.get('ffdebug', False), None
+                    )
+                except Exception as e:
+                    print(f"Error during BDMV screenshot capture: {e}")
+
+            elif target['is_disc'] == "DVD":
+                try:
+                    dvd_screenshots(
+                        target, 0, None, None
+                    )
+                except Exception as e:
+                    print(f"Error during DVD screenshot capture: {e}")
+
+            else:
+                try:
+                    screenshots(
+                        videopath, filename, target['uuid'], base_dir, target,
+                        manual_frames=target.get('manual_frames', {})  # Pass additional kwargs directly
+                    )
+                except Exception as e:
+                    print(f"Error during generic screenshot capture: {e}")
+
+        # Search trackers and take screenshots while the prompt waits for an answer
+        speculation = None
+        if mode == 'cli' and not meta.get('unattended', False) and self.config['DEFAULT'].get('speculative_prep', False):
+            speculation = Speculation()
+            speculation.start(meta, None if meta.get('edit', False) else take_screenshots)
+        confirm = await helper.get_confirmation(meta, background=speculation is not None)
         while confirm is False:
+            if speculation:
+                speculation.cancel_searches()
             with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
                 json.dump(meta, f, indent=4)
             meta['saved_trackers'] = meta['trackers']
@@ -369,15 +520,34 @@ class Prep():
             editargs = (meta['path'],) + tuple(editargs.split())
             if meta.get('debug', False):
                 editargs += ("--debug",)
+            before = dict(meta)
             meta, help, before_args = parser.parse(editargs, meta)
-            meta['edit'] = True
-            meta = await self.gather_prep(meta=meta, mode='cli')
+            # Parsing clears the manual ids, an edit that does not pass new ones keeps those in use
+            for key in ('tmdb_manual', 'imdb'):
+                if meta.get(key) is None:
+                    meta[key] = before.get(key)
+            changed = {key for key in set(meta) | set(before) if meta.get(key) != before.get(key)}
+            if changed - dag.known_inputs() - EDIT_WITHOUT_RECOMPUTE:
+                # Something the metadata graph does not cover (path, disc, tracker ids...), start over
+                if speculation:
+                    await speculation.wait_screenshots()
+                meta['edit'] = True
+                meta = await self.gather_prep(meta=meta, mode='cli')
+            else:
+                stale = dag.stale(changed)
+                if meta['debug']:
+                    console.print(f"[cyan]Edited {', '.join(sorted(changed)) or 'nothing'}, running again: {', '.join(sorted(stale)) or 'nothing'}")
+                await dag.run(only=stale)
+                meta['trackers'] = meta['saved_trackers']
             meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'] = await self.get_name(meta)
-            confirm = await helper.get_confirmation(meta)
+            if speculation:
+                speculation.start(meta)
+            confirm = await helper.get_confirmation(meta, background=speculation is not None)
 
         if meta['debug']:
             dupe_start_time = time.time()
-        successful_trackers = await process_all_trackers(meta)
+        searches = await speculation.take_searches(meta) if speculation else None
+        successful_trackers = await process_all_trackers(meta, searches)
         if meta['debug']:
             dupe_finish_time = time.time()
             console.print(f"Dupe checking processed in {dupe_finish_time - dupe_start_time:.2f} seconds")
@@ -386,6 +556,7 @@ class Prep():
         if not meta['debug']:
             if successful_trackers < meta['skip_uploading']:
                 console.print(f"[red]Not enough successful trackers ({successful_trackers}/{meta['skip_uploading']}). EXITING........[/red]")
+                cancel_base_torrent(meta)
                 return
 
         meta['we_are_uploading'] = True
@@ -395,37 +566,12 @@ class Prep():
 
         if 'manual_frames' not in meta:
             meta['manual_frames'] = {}
-        manual_frames = meta['manual_frames']
-        # Take Screenshots
-        if meta['is_disc'] == "BDMV":
-            if not meta.get('edit', False):
-                use_vs = meta.get('vapoursynth', False)
-                try:
-                    disc_screenshots(
-                        meta, filename, bdinfo, meta['uuid'], base_dir, use_vs,
-                        meta.get('image_list', []), meta.get('ffdebug', False), None
-                    )
-                except Exception as e:
-                    print(f"Error during BDMV screenshot capture: {e}")
-
-        elif meta['is_disc'] == "DVD":
-            if not meta.get('edit', False):
-                try:
-                    dvd_screenshots(
-                        meta, 0, None, None
-                    )
-                except Exception as e:
-                    print(f"Error during DVD screenshot capture: {e}")
-
-        else:
-            if not meta.get('edit', False):
-                try:
-                    screenshots(
-                        videopath, filename, meta['uuid'], base_dir, meta,
-                        manual_frames=manual_frames  # Pass additional kwargs directly
-                    )
-                except Exception as e:
-                    print(f"Error during generic screenshot capture: {e}")
+        # Take Screenshots, reusing the ones taken while waiting for confirmation
+        if speculation:
+            await speculation.wait_screenshots()
+        if not meta.get('edit', False):
+            # Off the loop, the capture waits for its device slot and BDInfo holds one across awaits
+            await asyncio.to_thread(take_screenshots, meta)
 
         # WORK ON THIS
         meta.get('stream', False)
@@ -598,7 +744,7 @@ class Prep():
         url = f"https://api.srrdb.com/v1/search/r:{base}"
         if 'scene' not in meta:
             try:
-                response = requests.get(url, timeout=30)
+                response = httpclient.shared_session().get(url, timeout=30)
                 response_json = response.json()
 
                 if int(response_json.get('resultsCount', 0)) > 0:
@@ -623,7 +769,7 @@ class Prep():
                                 nfo_file_path = os.path.join(save_path, f"{release_lower}.nfo")
 
                                 # Download the NFO file
-                                nfo_response = requests.get(nfo_url, timeout=30)
+                                nfo_response = httpclient.shared_session().get(nfo_url, timeout=30)
                                 if nfo_response.status_code == 200:
                                     with open(nfo_file_path, 'wb') as f:
                                         f.write(nfo_response.content)
@@ -637,7 +783,7 @@ class Prep():
 
                     # IMDb Handling
                     try:
-                        r = requests.get(f"https://api.srrdb.com/v1/imdb/{base}")
+                        r = httpclient.shared_session().get(f"https://api.srrdb.com/v1/imdb/{base}")
                         r = r.json()
 
                         if r['releases'] != [] and imdb is None:
@@ -1424,7 +1570,7 @@ class Prep():
                     split = os.path.split(parsed.path)
                     raw = parsed._replace(path=f"{split[0]}/raw/{split[1]}" if split[0] != '/' else f"/raw{parsed.path}")
                     raw_url = urllib.parse.urlunparse(raw)
-                    desclink_content = requests.get(raw_url).text
+                    desclink_content = httpclient.shared_session().get(raw_url).text
                     if clean_text(desclink_content):
                         description.write(desclink_content + "\n")
                         meta['description'] = "CUSTOM"
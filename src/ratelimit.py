@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+# Requests per second and burst size for hosts with known API limits, config['DEFAULT']['rate_limits'] overrides these
+DEFAULT_LIMITS = {
+    "passthepopcorn.me": {"rate": 1, "burst": 1},
+    # SN rejects uploads sent in quick succession
+    "swarmazon.club": {"rate": 1 / 16, "burst": 3},
+}
+
+
+class TokenBucket():
+    """
+    Holds up to burst tokens, refilled at rate tokens per second. Callers reserve a token and
+    sleep for as long as it takes to refill, so concurrent callers queue up in order.
+    """
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token and return how many seconds to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter():
+    """
+    Per-host buckets for every outgoing request in the process, so the state carries over between queue items.
+    """
+    def __init__(self):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.waited = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, limits):
+        with self._lock:
+            self.limits = {**DEFAULT_LIMITS, **{host.lower(): limit for host, limit in (limits or {}).items()}}
+            self._buckets.clear()
+
+    def _limit_for(self, host):
+        # api.example.com is covered by a limit on example.com
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            limit = self.limits.get('.'.join(parts[i:]))
+            if limit:
+                return '.'.join(parts[i:]), limit
+        return None, None
+
+    def bucket(self, url):
+        host = (urlsplit(str(url)).hostname or '').lower()
+        with self._lock:
+            if host not in self._buckets:
+                key, limit = self._limit_for(host)
+                if limit is None or not limit.get('rate'):
+                    self._buckets[host] = None
+                else:
+                    # Hosts sharing a configured domain share its bucket
+                    shared = self._buckets.get(f"={key}")
+                    if shared is None:
+                        shared = TokenBucket(limit['rate'], limit.get('burst', 1))
+                        self._buckets[f"={key}"] = shared
+                    self._buckets[host] = shared
+            return host, self._buckets[host]
+
+    def delay(self, url):
+        host, bucket = self.bucket(url)
+        if bucket is None:
+            return 0
+        delay = bucket.reserve()
+        if delay:
+            self.waited[host] = self.waited.get(host, 0) + delay
+        return delay
+
+
+_limiter = RateLimiter()
+
+
+def configure_rate_limits(config):
+    _limiter.configure(config['DEFAULT'].get('rate_limits', {}))
+
+
+async def throttle(url):
+    """
+    Wait until a request to url is within its host's rate limit.
+    """
+    delay = _limiter.delay(url)
+    if delay:
+        await asyncio.sleep(delay)
+
+
+def throttle_sync(url):
+    """
+    Blocking version for the requests session, async code calls that through asyncio.to_thread.
+    """
+    delay = _limiter.delay(url)
+    if delay:
+        time.sleep(delay)
+
+
+def waited():
+    """
+    Seconds spent waiting on each rate limited host so far.
+    """
+    return dict(_limiter.waited)
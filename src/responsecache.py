@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from src.console import console
+
+# Metadata sources by host, with how long (in seconds) their answers are reused.
+# Scene releases never change, TVmaze episode lists do.
+SOURCES = {
+    'api.themoviedb.org': 'tmdb',
+    'api.graphql.imdb.com': 'imdb',
+    'api.tvmaze.com': 'tvmaze',
+    'graphql.anilist.co': 'anilist',
+    'thexem.info': 'anilist',
+    'api.srrdb.com': 'srrdb',
+    'www.srrdb.com': 'srrdb',
+}
+DEFAULT_TTLS = {
+    'tmdb': 3 * 86400,
+    'imdb': 7 * 86400,
+    'tvmaze': 86400,
+    'anilist': 7 * 86400,
+    'srrdb': 30 * 86400,
+}
+DEFAULT_MAX_SIZE_MB = 64
+# Credentials are left out of cache keys (and so out of the database)
+SECRET_PARAMS = frozenset({'api_key', 'apikey', 'passkey', 'token'})
+
+
+class ResponseCache():
+    """
+    On-disk (SQLite) cache of metadata API responses, keyed on the normalized request,
+    with a TTL per source and least recently used entries evicted past max_size bytes.
+    In offline mode nothing is sent, entries are served however old they are and misses
+    are answered with a 504 like an only-if-cached HTTP request.
+    """
+    def __init__(self, db_path, ttls=None, max_size=DEFAULT_MAX_SIZE_MB * 1024 * 1024, offline=False):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                content_type TEXT,
+                body BLOB NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self.db.commit()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_size = max_size
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    @staticmethod
+    def source_for(url):
+        return SOURCES.get((urlsplit(url).hostname or '').lower())
+
+    @staticmethod
+    def public_url(url):
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    @staticmethod
+    def key(method, url, body=None):
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        if body:
+            try:
+                body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+            except ValueError:
+                body = sorted(parse_qsl(body, keep_blank_values=True)) if '=' in body else body
+        request = [method.upper(), f"{parts.scheme}://{(parts.netloc or '').lower()}{parts.path}", query, body]
+        return hashlib.sha256(json.dumps(request).encode()).hexdigest()
+
+    def get(self, key, source):
+        """
+        Return (status, url, content_type, body) if there is a usable entry.
+        """
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT created, status, url, content_type, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (not self.offline and row[0] + self.ttls.get(source, 0) < now):
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+        return row[1:]
+
+    def put(self, key, source, status, url, content_type, body):
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (key, source, now, now, len(body), status, url, content_type, body))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+        evicted = []
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_size:
+                break
+            evicted.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def lookup(self, request):
+        """
+        Cached requests.Response for a prepared request to a metadata source, or None to send it.
+        """
+        source = self.source_for(request.url)
+        if source is None or request.method not in ('GET', 'POST'):
+            return None
+        key = self.key(request.method, request.url, request.body)
+        cached = self.get(key, source)
+        if cached is None:
+            if self.offline:
+                return self._response(request, 504, request.url, 'application/json', b'{}', reason="Not cached (offline)")
+            return None
+        return self._response(request, *cached)
+
+    def store(self, request, response):
+        source = self.source_for(request.url)
+        if source is None or request.method not in ('GET', 'POST') or response.status_code != 200:
+            return
+        key = self.key(request.method, request.url, request.body)
+        self.put(key, source, response.status_code, self.public_url(response.url), response.headers.get('Content-Type'), response.content)
+
+    @staticmethod
+    def _response(request, status, url, content_type, body, reason="OK"):
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.url = url
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type} if content_type else {})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        response.request = request
+        return response
+
+    def remember(self, source, params, func):
+        """
+        Cached JSON-serializable result of func() for a non-HTTP lookup (Cinemagoer) identified by params.
+        Offline misses return None.
+        """
+        key = self.key('CALL', f"{source}:", json.dumps(params, sort_keys=True))
+        cached = self.get(key, source)
+        if cached is not None:
+            return json.loads(cached[3])
+        if self.offline:
+            return None
+        value = func()
+        self.put(key, source, 200, f"{source}:", 'application/json', json.dumps(value).encode())
+        return value
+
+
+_cache = None
+
+
+def configure_response_cache(config, base_dir):
+    """
+    Open the cache described by the metadata_cache section of DEFAULT in config.
+    """
+    global _cache
+    settings = config.get('DEFAULT', {}).get('metadata_cache', {})
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+    if not settings.get('enabled', True):
+        return
+    ttls = {source: float(ttl) for source, ttl in settings.get('ttl', {}).items()}
+    max_size = float(settings.get('max_size_mb', DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+    _cache = ResponseCache(os.path.join(base_dir, "data", "metadata_cache.db"), ttls, max_size, bool(settings.get('offline', False)))
+
+
+def set_offline(offline):
+    if _cache is None:
+        console.print("[yellow]Offline mode needs the metadata cache, it is disabled in config")
+        return
+    _cache.offline = offline
+
+
+def response_cache():
+    return _cache
+
+
+def remember(source, params, func):
+    if _cache is None:
+        return func()
+    return _cache.remember(source, params, func)
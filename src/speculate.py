@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import json
+import asyncio
+import hashlib
+from src.console import console
+from src.trackerstatus import search_trackers, selected_trackers
+
+# Keys that change on the way from the prompt to the dupe checks without changing what is searched for
+UNSEARCHED_KEYS = frozenset({'edit', 'saved_trackers', 'we_asked', 'keep_folder', 'tracker_status'})
+
+
+def search_signature(meta):
+    state = {key: value for key, value in meta.items() if key not in UNSEARCHED_KEYS}
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Speculation():
+    """
+    Work started while the confirmation prompt waits for the user (DEFAULT speculative_prep):
+    the tracker dupe searches, and the screenshots. Searches are only used when meta is
+    unchanged by the time the dupe checks start. Screenshots are files in tmp, which the
+    capture after confirmation reuses, or tops up when an edit asked for more.
+    """
+    def __init__(self):
+        self.signature = None
+        self.searches = None
+        self.screens = None
+
+    def start(self, meta, take_screenshots=None):
+        """
+        Start (or keep, if meta did not change since) the searches, and the screenshots once,
+        take_screenshots is called with a copy of meta in a worker thread.
+        """
+        signature = search_signature(meta)
+        if self.searches is not None and signature == self.signature:
+            return
+        self.cancel_searches()
+        # Trackers that ask for a missing IMDb id before searching are left for the dupe checks
+        trackers = [
+            tracker_name for tracker_name in selected_trackers(meta)
+            if not (tracker_name in {"THR", "PTP"} and meta.get('imdb_id', '0') == '0')
+        ]
+        self.signature = signature
+        self.searches = asyncio.ensure_future(search_trackers(trackers, meta))
+        if take_screenshots is not None and self.screens is None:
+            self.screens = asyncio.ensure_future(asyncio.to_thread(take_screenshots, dict(meta)))
+        if meta['debug']:
+            console.print("[cyan]Searching trackers and taking screenshots while waiting for confirmation")
+
+    def cancel_searches(self):
+        if self.searches is not None and not self.searches.done():
+            self.searches.cancel()
+        self.searches = None
+        self.signature = None
+
+    async def take_searches(self, meta):
+        """
+        The finished searches for meta, or nothing if meta changed since they started.
+        """
+        task = self.searches
+        if task is None or search_signature(meta) != self.signature:
+            self.cancel_searches()
+            return {}
+        self.searches = None
+        try:
+            return await task
+        except Exception as e:
+            console.print(f"[yellow]Early tracker searches failed, searching again: {e}")
+            return {}
+
+    async def wait_screenshots(self):
+        """
+        Let a screenshot capture running in the background finish, before anything else writes the same files.
+        """
+        task, self.screens = self.screens, None
+        if task is None:
+            return
+        try:
+            await task
+        except Exception as e:
+            console.print(f"[yellow]Early screenshots failed: {e}")
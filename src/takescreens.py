@@ -11,6 +11,7 @@ import sys
 import platform
 from pymediainfo import MediaInfo
 from src.console import console
+from src.ioscheduler import io_slot, SCREENSHOTS
 
 from data.config import config  # Import here to avoid dependency issues
 
@@ -77,8 +78,7 @@ def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs, image_
 
     keyframe = 'nokey' if "VC-1" in bdinfo['video'][0]['codec'] or bdinfo['video'][0]['hdr_dv'] != "" else 'none'
     print(f"File: {file}, Length: {length}, Frame Rate: {frame_rate}")
-    os.chdir(f"{base_dir}/tmp/{folder_id}")
-    existing_screens = glob.glob(f"{sanitized_filename}-*.png")
+    existing_screens = glob.glob(f"{glob.escape(sanitized_filename)}-*.png", root_dir=f"{base_dir}/tmp/{folder_id}")
     total_existing = len(existing_screens) + len(existing_images)
     if not force_screenshots:
         num_screens = max(0, screens - total_existing)
@@ -125,7 +125,7 @@ def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs, image_
 
         max_workers = min(len(capture_tasks), int(meta.get('task_limit', os.cpu_count())))
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with io_slot(file, SCREENSHOTS) as slot, ThreadPoolExecutor(max_workers=slot.workers(max_workers)) as executor:
             future_to_task = {executor.submit(capture_disc_task, task): task for task in capture_tasks}
 
             if sys.stdout.isatty():  # Check if running in terminal
@@ -300,7 +300,7 @@ def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
     if num_screens == 0 or (len(meta.get('image_list', [])) >= screens and disc_num == 0):
         return
 
-    if len(glob.glob(f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['discs'][disc_num]['name']}-*.png")) >= num_screens:
+    if len(glob.glob(f"{glob.escape(meta['discs'][disc_num]['name'])}-*.png", root_dir=f"{meta['base_dir']}/tmp/{meta['uuid']}")) >= num_screens:
         i = num_screens
         console.print('[bold green]Reusing screenshots')
         return
@@ -368,7 +368,6 @@ def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
         return fallback_duration, 0
 
     main_set = meta['discs'][disc_num]['main_set'][1:] if len(meta['discs'][disc_num]['main_set']) > 1 else meta['discs'][disc_num]['main_set']
-    os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
     voblength, n = _is_vob_good(0, 0, num_screens)
     ss_times = valid_ss_time([], num_screens + 1, voblength, frame_rate)
     capture_tasks = []
@@ -396,10 +395,12 @@ def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
             if not os.path.exists(image) and not meta.get('retake', False):
                 capture_tasks.append((input_file, image, ss_times[i], meta, width, height, w_sar, h_sar))
 
+    # Seek forward through each file in order
+    capture_tasks.sort(key=lambda task: (task[0], task[2]))
     capture_results = []
     max_workers = min(len(capture_tasks), int(meta.get('task_limit', os.cpu_count())))
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with io_slot(meta['discs'][disc_num]['path'], SCREENSHOTS) as slot, ThreadPoolExecutor(max_workers=slot.workers(max_workers)) as executor:
         future_to_task = {executor.submit(capture_dvd_screenshot, task): task for task in capture_tasks}
 
         if sys.stdout.isatty():  # Check if running in terminal
@@ -600,7 +601,6 @@ def screenshots(path, filename, folder_id, base_dir, meta, num_screens=None, for
         return
 
     loglevel = 'verbose' if meta.get('ffdebug', False) else 'quiet'
-    os.chdir(f"{base_dir}/tmp/{folder_id}")
 
     if manual_frames:
         if meta['debug']:
@@ -641,10 +641,12 @@ def screenshots(path, filename, folder_id, base_dir, meta, num_screens=None, for
             if not os.path.exists(image_path) or meta.get('retake', False):
                 capture_tasks.append((path, ss_times[i], image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap))
 
+        # Seek forward through the file in order
+        capture_tasks.sort(key=lambda task: task[1])
         capture_results = []
         max_workers = min(len(capture_tasks), int(meta.get('task_limit', os.cpu_count())))
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with io_slot(path, SCREENSHOTS) as slot, ThreadPoolExecutor(max_workers=slot.workers(max_workers)) as executor:
             future_to_task = {executor.submit(capture_screenshot, task): task for task in capture_tasks}
 
             if sys.stdout.isatty():  # Check if running in terminal
@@ -1,4 +1,5 @@
 from src.console import console
+from src import httpclient
 from src.imdb import get_imdb_aka_api, get_imdb_info_api
 from src.args import Args
 from data.config import config
@@ -10,7 +11,11 @@ import cli_ui
 import anitopy
 from datetime import datetime
 from difflib import SequenceMatcher
-import requests
+
+# TV show and season details by TMDb id for the whole run, so the episodes of a pack or
+# queue are answered from one request per season (the response cache keeps them across runs)
+_tv_shows = {}
+_tv_seasons = {}
 
 
 async def get_tmdb_from_imdb(meta, filename):
@@ -21,7 +26,7 @@ async def get_tmdb_from_imdb(meta, filename):
     if str(imdb_id)[:2].lower() != "tt":
         imdb_id = f"tt{imdb_id}"
     find = tmdb.Find(id=imdb_id)
-    info = find.info(external_source="imdb_id")
+    info = await asyncio.to_thread(find.info, external_source="imdb_id")
     if len(info['movie_results']) >= 1:
         meta['category'] = "MOVIE"
         meta['tmdb'] = info['movie_results'][0]['id']
@@ -54,9 +59,9 @@ async def get_tmdb_id(filename, search_year, meta, category, untouched_filename=
     search = tmdb.Search()
     try:
         if category == "MOVIE":
-            search.movie(query=filename, year=search_year)
+            await asyncio.to_thread(search.movie, query=filename, year=search_year)
         elif category == "TV":
-            search.tv(query=filename, first_air_date_year=search_year)
+            await asyncio.to_thread(search.tv, query=filename, first_air_date_year=search_year)
         if meta.get('tmdb_manual') is not None:
             meta['tmdb'] = meta['tmdb_manual']
         else:
@@ -65,9 +70,9 @@ async def get_tmdb_id(filename, search_year, meta, category, untouched_filename=
     except IndexError:
         try:
             if category == "MOVIE":
-                search.movie(query=filename)
+                await asyncio.to_thread(search.movie, query=filename)
             elif category == "TV":
-                search.tv(query=filename)
+                await asyncio.to_thread(search.tv, query=filename)
             meta['tmdb'] = search.results[0]['id']
             meta['category'] = category
         except IndexError:
@@ -110,14 +115,14 @@ async def tmdb_other_meta(meta):
                 return meta
     if meta['category'] == "MOVIE":
         movie = tmdb.Movies(meta['tmdb'])
-        response = movie.info()
+        response = await asyncio.to_thread(movie.info)
         meta['title'] = response['title']
         if response['release_date']:
             meta['year'] = datetime.strptime(response['release_date'], '%Y-%m-%d').year
         else:
             console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
             meta['year'] = meta['search_year']
-        external = movie.external_ids()
+        external = await asyncio.to_thread(movie.external_ids)
         if meta.get('imdb', None) is None:
             imdb_id = external.get('imdb_id', "0")
             if imdb_id == "" or imdb_id is None:
@@ -134,7 +139,7 @@ async def tmdb_other_meta(meta):
                 if meta['tvdb_id'] in ["", None, " ", "None"]:
                     meta['tvdb_id'] = '0'
         try:
-            videos = movie.videos()
+            videos = await asyncio.to_thread(movie.videos)
             for each in videos.get('results', []):
                 if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
                     meta['youtube'] = f"https://www.youtube.com/watch?v={each.get('key')}"
@@ -163,14 +168,14 @@ async def tmdb_other_meta(meta):
         meta['runtime'] = response.get('episode_run_time', 60)
     elif meta['category'] == "TV":
         tv = tmdb.TV(meta['tmdb'])
-        response = tv.info()
+        response = await get_tv_show(meta['tmdb'])
         meta['title'] = response['name']
         if response['first_air_date']:
             meta['year'] = datetime.strptime(response['first_air_date'], '%Y-%m-%d').year
         else:
             console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
             meta['year'] = meta['search_year']
-        external = tv.external_ids()
+        external = await asyncio.to_thread(tv.external_ids)
         if meta.get('imdb', None) is None:
             imdb_id = external.get('imdb_id', "0")
             if imdb_id == "" or imdb_id is None:
@@ -187,7 +192,7 @@ async def tmdb_other_meta(meta):
                 if meta['tvdb_id'] in ["", None, " ", "None"]:
                     meta['tvdb_id'] = '0'
         try:
-            videos = tv.videos()
+            videos = await asyncio.to_thread(tv.videos)
             for each in videos.get('results', []):
                 if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
                     meta['youtube'] = f"https://www.youtube.com/watch?v={each.get('key')}"
@@ -230,7 +235,7 @@ async def tmdb_other_meta(meta):
 
 async def get_keywords(tmdb_info):
     if tmdb_info is not None:
-        tmdb_keywords = tmdb_info.keywords()
+        tmdb_keywords = await asyncio.to_thread(tmdb_info.keywords)
         if tmdb_keywords.get('keywords') is not None:
             keywords = [f"{keyword['name'].replace(',', ' ')}" for keyword in tmdb_keywords.get('keywords')]
         elif tmdb_keywords.get('results') is not None:
@@ -252,7 +257,7 @@ async def get_genres(tmdb_info):
 
 async def get_directors(tmdb_info):
     if tmdb_info is not None:
-        tmdb_credits = tmdb_info.credits()
+        tmdb_credits = await asyncio.to_thread(tmdb_info.credits)
         directors = []
         if tmdb_credits.get('cast', []) != []:
             for each in tmdb_credits['cast']:
@@ -348,7 +353,7 @@ async def get_romaji(tmdb_name, mal):
     # Make the HTTP Api request
     url = 'https://graphql.anilist.co'
     try:
-        response = requests.post(url, json={'query': query, 'variables': variables})
+        response = await asyncio.to_thread(httpclient.shared_session().post, url, json={'query': query, 'variables': variables})
         json = response.json()
         media = json['data']['Page']['media']
     except Exception:
@@ -398,9 +403,52 @@ async def get_tmdb_imdb_from_mediainfo(mediainfo, category, is_disc, tmdbid, imd
     return category, tmdbid, imdbid
 
 
+async def get_tv_show(tmdb_id, seasons=()):
+    """
+    TMDb details of a show, with any of the given seasons not seen yet fetched in the same request.
+    """
+    tmdb_id = int(tmdb_id)
+    missing = [int(each) for each in dict.fromkeys(seasons) if (tmdb_id, int(each)) not in _tv_seasons]
+    if tmdb_id in _tv_shows and not missing:
+        return _tv_shows[tmdb_id]
+    # TMDb appends at most 20 sub-requests
+    append = ','.join(f"season/{each}" for each in missing[:20])
+    tv = tmdb.TV(tmdb_id)
+    response = await asyncio.to_thread(tv.info, append_to_response=append) if append else await asyncio.to_thread(tv.info)
+    for each in missing[:20]:
+        season = response.pop(f"season/{each}", None)
+        if season is not None:
+            _tv_seasons[(tmdb_id, each)] = season
+    _tv_shows[tmdb_id] = response
+    return response
+
+
+async def get_tv_season(tmdb_id, season):
+    """
+    TMDb details of a season, episodes included.
+    """
+    key = (int(tmdb_id), int(season))
+    if key not in _tv_seasons:
+        await get_tv_show(tmdb_id, [season])
+    if key not in _tv_seasons:
+        # Not appended (TMDb leaves out seasons it does not have), ask for it on its own to get the error
+        _tv_seasons[key] = await asyncio.to_thread(tmdb.TV_Seasons(key[0], key[1]).info)
+    return _tv_seasons[key]
+
+
+async def get_tv_episode(tmdb_id, season, episode):
+    """
+    TMDb details of an episode from its season, None if the season does not list it.
+    """
+    season_info = await get_tv_season(tmdb_id, season)
+    for each in season_info.get('episodes', []):
+        if int(each.get('episode_number', -1)) == int(episode):
+            return each
+    return None
+
+
 async def daily_to_tmdb_season_episode(tmdbid, date):
-    show = tmdb.TV(tmdbid)
-    seasons = show.info().get('seasons')
+    seasons = (await get_tv_show(tmdbid)).get('seasons')
     season = 1
     episode = 1
     date = datetime.fromisoformat(str(date))
@@ -408,7 +456,7 @@ async def daily_to_tmdb_season_episode(tmdbid, date):
         air_date = datetime.fromisoformat(each['air_date'])
         if air_date <= date:
             season = int(each['season_number'])
-    season_info = tmdb.TV_Seasons(tmdbid, season).info().get('episodes')
+    season_info = (await get_tv_season(tmdbid, season)).get('episodes')
     for each in season_info:
         if str(each['air_date']) == str(date.date()):
             episode = int(each['episode_number'])
@@ -1,13 +1,28 @@
 from datetime import datetime
 import torf
-from torf import Torrent
 import random
 import math
 import os
 import re
+import time
 import cli_ui
 import glob
+import hashlib
+import asyncio
+import threading
+from pathlib import Path
 from src.console import console
+from src.metainfo import Metainfo
+from src.ioscheduler import io_slot, HASHING
+from src.torrenthash import HASH_BACKENDS, backend_supports, drop_page_cache, hash_torrent, mount_point, save_bench_result, select_backend
+
+# Largest piece size each tracker will accept, used to emit extra BASE torrents from the same hashing pass
+TRACKER_PIECE_LIMITS = {
+    'MTV': 8388608,  # 8 MiB
+}
+
+# Background BASE.torrent jobs, keyed by meta['uuid']
+_base_torrent_jobs = {}
 
 
 def calculate_piece_size(total_size, min_size, max_size, files, meta):
@@ -118,14 +133,13 @@ class CustomTorrent(torf.Torrent):
         self.metainfo['info']['piece length'] = self.piece_size  # Ensure 'piece length' is set
 
 
-def create_torrent(meta, path, output_filename):
+def create_torrent(meta, path, output_filename, cancel=None):
     # Handle directories and file inclusion logic
     if meta['isdir']:
         if meta['keep_folder']:
             cli_ui.info('--keep-folder was specified. Using complete folder for torrent creation.')
             path = path
         else:
-            os.chdir(path)
             globs = glob.glob1(path, "*.mkv") + glob.glob1(path, "*.mp4") + glob.glob1(path, "*.ts")
             no_sample_globs = []
             for file in globs:
@@ -156,15 +170,301 @@ def create_torrent(meta, path, output_filename):
     # Ensure piece size is validated before writing
     torrent.validate_piece_size(meta)
 
-    # Generate and write the new torrent
-    torrent.generate(callback=torf_cb, interval=5)
+    # Extra piece sizes required by the selected trackers are hashed in the same read pass
+    extra_sizes = get_required_piece_sizes(meta, torrent.piece_size) if output_filename == "BASE" else []
+    extra_torrents = {}
+    for piece_size in extra_sizes:
+        extra_torrent = CustomTorrent(
+            meta=meta,
+            path=path,
+            trackers=["https://fake.tracker"],
+            source="L4G",
+            private=True,
+            exclude_globs=exclude or [],
+            include_globs=include or [],
+            creation_date=datetime.now(),
+            comment="Created by L4G's Upload Assistant",
+            created_by="L4G's Upload Assistant"
+        )
+        extra_torrent.piece_size = piece_size
+        extra_torrent.validate_piece_size(meta)
+        extra_torrents[base_torrent_name(piece_size)] = extra_torrent
+
+    # Background jobs hash quietly and stop as soon as they are cancelled
+    if cancel is not None:
+        callback, interval = (lambda *args: True if cancel.is_set() else None), 1
+    else:
+        callback, interval = torf_cb, 5
+
+    # Generate and write the new torrent, letting stages that waited too long on the same disk in between
+    with io_slot(path, HASHING) as slot:
+        def io_callback(*args):
+            slot.checkpoint()
+            return callback(*args)
+
+        if extra_torrents:
+            if meta['debug'] and cancel is None:
+                console.print(f"Hashing piece sizes {[torrent.piece_size] + extra_sizes} in a single pass")
+            completed = hash_pieces_multi([torrent] + list(extra_torrents.values()), callback=io_callback, interval=interval)
+        else:
+            from data.config import config  # Imported late, upload.py imports this module before checking the config exists
+            backend = select_backend(meta, torrent, config['DEFAULT'].get('hash_backend'))
+            completed = hash_torrent(meta, torrent, backend, callback=io_callback, interval=interval)
+    if not completed:
+        return None
     torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
     torrent.verify_filesize(path)
+    for name, extra_torrent in extra_torrents.items():
+        extra_torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{name}.torrent", overwrite=True)
 
-    console.print("[bold green].torrent created", end="\r")
+    if cancel is None:
+        console.print("[bold green].torrent created", end="\r")
     return torrent
 
 
+def _base_torrent_signature(meta):
+    limited_trackers = tuple(sorted(
+        t for t in (str(x).replace(" ", "").upper().strip() for x in meta.get('trackers') or []) if t in TRACKER_PIECE_LIMITS
+    ))
+    return (
+        meta['path'], bool(meta.get('keep_folder')), meta.get('max_piece_size'),
+        bool(meta.get('rehash')), bool(meta.get('nohash')), limited_trackers
+    )
+
+
+def _run_in_daemon_thread(func, *args):
+    """
+    Like asyncio.to_thread, but in a daemon thread so an abandoned hash never holds the process open on exit.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def runner():
+        try:
+            result = func(*args)
+        except BaseException as e:
+            loop.call_soon_threadsafe(lambda exc=e: future.done() or future.set_exception(exc))
+        else:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+
+    threading.Thread(target=runner, name="base-torrent-hash", daemon=True).start()
+    return future
+
+
+async def build_base_torrent(meta, client, cancel=None):
+    """
+    Reuse a matching torrent from the client, or hash a new BASE.torrent.
+    """
+    torrent_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
+    if not os.path.exists(torrent_path):
+        reuse_torrent = None
+        if meta.get('rehash', False) is False:
+            reuse_torrent = await client.find_existing_torrent(meta)
+            if reuse_torrent is not None:
+                await create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
+
+        if meta['nohash'] is False and reuse_torrent is None:
+            if cancel is None:
+                create_torrent(meta, Path(meta['path']), "BASE")
+            else:
+                await _run_in_daemon_thread(create_torrent, meta, Path(meta['path']), "BASE", cancel)
+
+    elif meta.get('rehash', False) is True and meta['nohash'] is False:
+        if cancel is None:
+            create_torrent(meta, Path(meta['path']), "BASE")
+        else:
+            await _run_in_daemon_thread(create_torrent, meta, Path(meta['path']), "BASE", cancel)
+
+
+def start_base_torrent(meta, client):
+    """
+    Start building BASE.torrent in the background as soon as the file list is known.
+    A running job is kept if nothing that shapes the torrent changed, otherwise it is restarted.
+    """
+    signature = _base_torrent_signature(meta)
+    job = _base_torrent_jobs.get(meta['uuid'])
+    if job is not None:
+        if job['signature'] == signature:
+            return job['task']
+        cancel_base_torrent(meta)
+
+    cancel = threading.Event()
+    task = asyncio.create_task(build_base_torrent(dict(meta), client, cancel))
+    _base_torrent_jobs[meta['uuid']] = {'signature': signature, 'task': task, 'cancel': cancel}
+    if meta['debug']:
+        console.print("[cyan]Started BASE.torrent creation in the background")
+    return task
+
+
+def cancel_base_torrent(meta):
+    job = _base_torrent_jobs.pop(meta.get('uuid'), None)
+    if job is not None and not job['task'].done():
+        job['cancel'].set()
+        job['task'].cancel()
+        if meta.get('debug'):
+            console.print("[yellow]Cancelled background BASE.torrent creation")
+
+
+async def wait_for_base_torrent(meta):
+    """
+    Wait for a background BASE.torrent job for this item, if one is running.
+    """
+    job = _base_torrent_jobs.get(meta.get('uuid'))
+    if job is None:
+        return
+    task = job['task']
+    if not task.done():
+        console.print("[yellow]Waiting for BASE.torrent to finish hashing...")
+    try:
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+    except Exception as e:
+        console.print(f"[bold red]Background torrent creation failed: {e}")
+
+
+async def ensure_base_torrent(meta, client):
+    """
+    Make sure BASE.torrent is ready, using the background job when it was started with the same inputs.
+    """
+    job = _base_torrent_jobs.get(meta['uuid'])
+    if job is not None and job['signature'] != _base_torrent_signature(meta):
+        cancel_base_torrent(meta)
+        job = None
+    if job is not None:
+        await wait_for_base_torrent(meta)
+        _base_torrent_jobs.pop(meta['uuid'], None)
+        if job['task'].cancelled() or job['task'].exception() is not None:
+            await build_base_torrent(meta, client)
+    else:
+        await build_base_torrent(meta, client)
+
+
+def base_torrent_name(piece_size=None):
+    if piece_size is None:
+        return "BASE"
+    return f"BASE-{piece_size // 1048576}MiB" if piece_size >= 1048576 else f"BASE-{piece_size // 1024}KiB"
+
+
+def get_required_piece_sizes(meta, piece_size):
+    """
+    Return the piece sizes, smaller than piece_size, that the selected trackers need their own BASE torrent for.
+    """
+    required = set()
+    for tracker in meta.get('trackers') or []:
+        limit = TRACKER_PIECE_LIMITS.get(str(tracker).replace(" ", "").upper().strip())
+        if limit is not None and piece_size > limit:
+            required.add(limit)
+    return sorted(required, reverse=True)
+
+
+def find_base_torrent(meta, max_piece_size):
+    """
+    Return the name of the BASE torrent with the largest piece size not above max_piece_size, or None.
+    """
+    tmp_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
+    base_path = f"{tmp_dir}/BASE.torrent"
+    if os.path.exists(base_path) and Metainfo.read(base_path).piece_size <= max_piece_size:
+        return "BASE"
+    piece_size = max_piece_size
+    while piece_size >= torf.Torrent.piece_size_min:
+        name = base_torrent_name(piece_size)
+        if os.path.exists(f"{tmp_dir}/{name}.torrent"):
+            return name
+        piece_size //= 2
+    return None
+
+
+def hash_pieces_multi(torrents, callback=None, interval=5, chunk_size=4194304):
+    """
+    Hash the content of several torrents sharing the same file list, but with different piece sizes,
+    while reading the payload only once. Callback follows torf's generate() semantics and is reported
+    against the torrent with the most pieces; returning anything other than None cancels hashing.
+    """
+    filepaths = list(torrents[0].filepaths)
+    hashers = [hashlib.sha1() for _ in torrents]
+    filled = [0] * len(torrents)
+    pieces = [[] for _ in torrents]
+    piece_sizes = [t.piece_size for t in torrents]
+    progress = piece_sizes.index(min(piece_sizes))
+    pieces_total = torrents[progress].pieces
+    last_report = 0
+
+    for filepath in filepaths:
+        with open(filepath, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                view = memoryview(chunk)
+                for i, piece_size in enumerate(piece_sizes):
+                    pos = 0
+                    while pos < len(view):
+                        take = min(piece_size - filled[i], len(view) - pos)
+                        hashers[i].update(view[pos:pos + take])
+                        filled[i] += take
+                        pos += take
+                        if filled[i] == piece_size:
+                            pieces[i].append(hashers[i].digest())
+                            hashers[i] = hashlib.sha1()
+                            filled[i] = 0
+                if callback is not None:
+                    now = time.monotonic()
+                    if now - last_report >= interval:
+                        last_report = now
+                        if callback(torrents[progress], str(filepath), len(pieces[progress]), pieces_total) is not None:
+                            return False
+
+    for i, torrent in enumerate(torrents):
+        if filled[i]:
+            pieces[i].append(hashers[i].digest())
+        torrent.metainfo['info']['pieces'] = b''.join(pieces[i])
+    if callback is not None:
+        callback(torrents[progress], str(filepaths[-1]), pieces_total, pieces_total)
+    return True
+
+
+def bench_hash(meta, path):
+    """
+    Time every usable hash backend on path, and remember the fastest one for its mount point.
+    """
+    results = {}
+    speeds = {}
+    for backend in HASH_BACKENDS:
+        torrent = CustomTorrent(meta=meta, path=path, trackers=["https://fake.tracker"], private=True)
+        if not backend_supports(backend, torrent):
+            console.print(f"[yellow]Skipping {backend}: not usable here")
+            continue
+        drop_page_cache(torrent)
+        console.print(f"Hashing {torrent.size / 1048576:.0f} MiB with {backend}")
+        start = time.perf_counter()
+        try:
+            # Without the torf fallback, or a failing backend would be timed (and pass) as torf
+            if not hash_torrent(meta, torrent, backend, callback=torf_cb, interval=5, fallback=False):
+                continue
+        except Exception as e:
+            console.print(f"[bold red]{backend} failed and was ignored: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        results[backend] = torrent.metainfo['info']['pieces']
+        speeds[backend] = round(torrent.size / 1048576 / elapsed, 1)
+        console.print(f"[green]{backend}: {elapsed:.2f}s ({speeds[backend]} MiB/s)")
+
+    # A backend only counts if its pieces agree with torf
+    reference = results.get('torf')
+    valid = {backend: speed for backend, speed in speeds.items() if results[backend] == reference}
+    for backend in set(speeds) - set(valid):
+        console.print(f"[bold red]{backend} produced different piece hashes and was ignored")
+    if not valid:
+        console.print("[bold red]No hash backend completed the benchmark")
+        return None
+    fastest = max(valid, key=valid.get)
+    save_bench_result(meta['base_dir'], str(path), fastest, valid)
+    console.print(f"[bold green]Using {fastest} for torrents on {mount_point(str(path))}")
+    return fastest
+
+
 def torf_cb(torrent, filepath, pieces_done, pieces_total):
     # print(f'{pieces_done/pieces_total*100:3.0f} % done')
     cli_ui.info_progress("Hashing...", pieces_done, pieces_total)
@@ -172,26 +472,22 @@ def torf_cb(torrent, filepath, pieces_done, pieces_total):
 
 def create_random_torrents(base_dir, uuid, num, path):
     manual_name = re.sub(r"[^0-9a-zA-Z\[\]\'\-]+", ".", os.path.basename(path))
-    base_torrent = Torrent.read(f"{base_dir}/tmp/{uuid}/BASE.torrent")
+    base_torrent = Metainfo.read(f"{base_dir}/tmp/{uuid}/BASE.torrent")
     for i in range(1, int(num) + 1):
-        new_torrent = base_torrent
-        new_torrent.metainfo['info']['entropy'] = random.randint(1, 999999)
-        Torrent.copy(new_torrent).write(f"{base_dir}/tmp/{uuid}/[RAND-{i}]{manual_name}.torrent", overwrite=True)
+        new_torrent = base_torrent.copy()
+        new_torrent.set_info('entropy', random.randint(1, 999999))
+        new_torrent.write(f"{base_dir}/tmp/{uuid}/[RAND-{i}]{manual_name}.torrent")
 
 
 async def create_base_from_existing_torrent(torrentpath, base_dir, uuid):
     if os.path.exists(torrentpath):
-        base_torrent = Torrent.read(torrentpath)
-        base_torrent.trackers = ['https://fake.tracker']
-        base_torrent.comment = "Created by L4G's Upload Assistant"
-        base_torrent.created_by = "Created by L4G's Upload Assistant"
+        base_torrent = Metainfo.read(torrentpath)
+        base_torrent.set('announce', 'https://fake.tracker')
+        base_torrent.set('comment', "Created by L4G's Upload Assistant")
+        base_torrent.set('created by', "Created by L4G's Upload Assistant")
         # Remove Un-whitelisted info from torrent
-        for each in list(base_torrent.metainfo['info']):
-            if each not in ('files', 'length', 'name', 'piece length', 'pieces', 'private', 'source'):
-                base_torrent.metainfo['info'].pop(each, None)
-        for each in list(base_torrent.metainfo):
-            if each not in ('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'):
-                base_torrent.metainfo.pop(each, None)
-        base_torrent.source = 'L4G'
-        base_torrent.private = True
-        Torrent.copy(base_torrent).write(f"{base_dir}/tmp/{uuid}/BASE.torrent", overwrite=True)
+        base_torrent.keep_info(('files', 'length', 'name', 'piece length', 'pieces', 'private', 'source'))
+        base_torrent.keep(('announce', 'comment', 'creation date', 'created by', 'encoding'))
+        base_torrent.set_info('source', 'L4G')
+        base_torrent.set_info('private', 1)
+        base_torrent.write(f"{base_dir}/tmp/{uuid}/BASE.torrent")
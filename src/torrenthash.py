@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import subprocess
+import bencode
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.console import console
+
+HASH_BACKENDS = ('torf', 'parallel', 'mktorrent')
+
+
+def hash_torf(torrent, callback=None, interval=5):
+    return torrent.generate(callback=callback, interval=interval)
+
+
+def hash_parallel(torrent, callback=None, interval=5, workers=None):
+    """
+    Read the payload sequentially and hash whole pieces on a thread pool (hashlib releases the GIL).
+    """
+    piece_size = torrent.piece_size
+    pieces_total = torrent.pieces
+    workers = workers or min(8, os.cpu_count() or 1)
+    pending = deque()
+    pieces = []
+    last_report = 0
+    filepath = None
+
+    def sha1(buf):
+        return hashlib.sha1(buf).digest()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        buf = bytearray(piece_size)
+        filled = 0
+        for filepath in torrent.filepaths:
+            with open(filepath, 'rb') as f:
+                while True:
+                    read = f.readinto(memoryview(buf)[filled:])
+                    if not read:
+                        break
+                    filled += read
+                    if filled < piece_size:
+                        continue
+                    pending.append(pool.submit(sha1, buf))
+                    buf = bytearray(piece_size)
+                    filled = 0
+                    while len(pending) > workers * 2:
+                        pieces.append(pending.popleft().result())
+                    if callback is not None:
+                        now = time.monotonic()
+                        if now - last_report >= interval:
+                            last_report = now
+                            if callback(torrent, str(filepath), len(pieces), pieces_total) is not None:
+                                for future in pending:
+                                    future.cancel()
+                                return False
+        if filled:
+            pending.append(pool.submit(sha1, memoryview(buf)[:filled]))
+        pieces.extend(future.result() for future in pending)
+
+    torrent.metainfo['info']['pieces'] = b''.join(pieces)
+    if callback is not None:
+        callback(torrent, str(filepath), pieces_total, pieces_total)
+    return True
+
+
+def hash_mktorrent(torrent, callback=None, interval=5):
+    """
+    Hash with an external mktorrent and keep only its pieces, after checking that it saw
+    the same files and piece size, so the written metainfo is still built by torf.
+    """
+    piece_exp = torrent.piece_size.bit_length() - 1
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "mktorrent.torrent")
+        cmd = [
+            shutil.which('mktorrent'), '-p', '-l', str(piece_exp), '-t', str(os.cpu_count() or 1),
+            '-a', 'https://fake.tracker', '-o', output, str(torrent.path)
+        ]
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        while True:
+            try:
+                _, stderr = proc.communicate(timeout=interval)
+                break
+            except subprocess.TimeoutExpired:
+                if callback is not None and callback(torrent, str(torrent.path), 0, torrent.pieces) is not None:
+                    proc.kill()
+                    proc.communicate()
+                    return False
+        if proc.returncode != 0:
+            raise RuntimeError(f"mktorrent exited with {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+        info = bencode.bread(output)['info']
+
+    if 'files' in info:
+        files = [(os.path.join(info['name'], *each['path']), each['length']) for each in info['files']]
+    else:
+        files = [(info['name'], info['length'])]
+    expected = [(str(each), each.size) for each in torrent.files]
+    if info['piece length'] != torrent.piece_size or files != expected:
+        raise RuntimeError("mktorrent produced a different file list or piece size")
+
+    torrent.metainfo['info']['pieces'] = info['pieces']
+    if callback is not None:
+        callback(torrent, str(torrent.path), torrent.pieces, torrent.pieces)
+    return True
+
+
+def backend_supports(backend, torrent):
+    if backend == 'mktorrent':
+        # mktorrent has no include/exclude globs and needs at least 32 KiB pieces
+        plain = os.path.isfile(torrent.path) or not (torrent.include_globs or torrent.exclude_globs)
+        return shutil.which('mktorrent') is not None and plain and torrent.piece_size >= 32768
+    return backend in HASH_BACKENDS
+
+
+def mount_point(path):
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _bench_file(base_dir):
+    return os.path.join(base_dir, "data", "hash_backends.json")
+
+
+def load_bench_results(base_dir):
+    try:
+        with open(_bench_file(base_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_bench_result(base_dir, path, backend, speeds):
+    results = load_bench_results(base_dir)
+    results[mount_point(path)] = {
+        'backend': backend,
+        'speeds': speeds,
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(_bench_file(base_dir), 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+
+
+def select_backend(meta, torrent, configured=None):
+    """
+    Use the configured hash_backend if set, otherwise the benchmarked winner for this mount point, otherwise torf.
+    """
+    backend = str(configured or 'auto').lower()
+    if backend == 'auto':
+        backend = load_bench_results(meta['base_dir']).get(mount_point(str(torrent.path)), {}).get('backend', 'torf')
+    if not backend_supports(backend, torrent):
+        if meta['debug']:
+            console.print(f"[yellow]Hash backend {backend} can't hash this torrent, using torf")
+        backend = 'torf'
+    return backend
+
+
+def hash_torrent(meta, torrent, backend, callback=None, interval=5, fallback=True):
+    """
+    Generate the pieces of torrent with backend, falling back to torf if it fails (or raising, without fallback).
+    """
+    if meta['debug']:
+        console.print(f"Hashing with the {backend} backend")
+    if backend == 'torf':
+        return hash_torf(torrent, callback, interval)
+    try:
+        if backend == 'parallel':
+            return hash_parallel(torrent, callback, interval)
+        return hash_mktorrent(torrent, callback, interval)
+    except Exception as e:
+        if not fallback:
+            raise
+        console.print(f"[yellow]{backend} hashing failed ({e}), falling back to torf")
+        return hash_torf(torrent, callback, interval)
+
+
+def drop_page_cache(torrent):
+    """
+    Ask the kernel to forget cached pages of the payload, so every benchmark run reads from disk.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for filepath in torrent.filepaths:
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
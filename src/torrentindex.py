@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import sqlite3
+import bencode
+from src.console import console
+
+
+class TorrentIndex():
+    """
+    Local SQLite index of a torrent client's session directory (qBittorrent BT_backup,
+    rtorrent session, deluge state), refreshed incrementally by mtime.
+    """
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS torrents (
+                torrent_path TEXT PRIMARY KEY,
+                storage_dir TEXT NOT NULL,
+                infohash TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                name TEXT NOT NULL,
+                name_lower TEXT NOT NULL,
+                content_path TEXT,
+                total_size INTEGER NOT NULL,
+                file_count INTEGER NOT NULL,
+                piece_size INTEGER NOT NULL,
+                piece_count INTEGER NOT NULL,
+                files TEXT NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS torrents_lookup ON torrents (storage_dir, name_lower, total_size)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS torrents_hash ON torrents (storage_dir, infohash)")
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def refresh(self, storage_dir, debug=False):
+        """
+        Add new or changed .torrent files in storage_dir to the index and drop removed ones.
+        """
+        storage_dir = os.path.abspath(storage_dir)
+        known = dict(self.db.execute("SELECT torrent_path, mtime FROM torrents WHERE storage_dir = ?", (storage_dir,)))
+        seen = set()
+        updated = 0
+        with os.scandir(storage_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.torrent') or not entry.is_file():
+                    continue
+                seen.add(entry.path)
+                mtime = max(entry.stat().st_mtime, self._resume_mtime(entry.path))
+                if known.get(entry.path) == mtime:
+                    continue
+                row = self._read_torrent(entry.path, storage_dir, mtime)
+                if row is None:
+                    continue
+                self.db.execute("INSERT OR REPLACE INTO torrents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                updated += 1
+
+        removed = [(path,) for path in known if path not in seen]
+        if removed:
+            self.db.executemany("DELETE FROM torrents WHERE torrent_path = ?", removed)
+        self.db.commit()
+        if debug:
+            console.print(f"Torrent index for {storage_dir}: {len(seen)} torrents, {updated} updated, {len(removed)} removed")
+
+    def find(self, storage_dir, name, total_size):
+        """
+        Return indexed torrents with this name (and total size, if given), smallest piece size first.
+        """
+        query = ("SELECT torrent_path, infohash, name, content_path, total_size, piece_size, piece_count, files FROM torrents "
+                 "WHERE storage_dir = ? AND name_lower = ?")
+        params = [os.path.abspath(storage_dir), name.lower()]
+        if total_size is not None:
+            query += " AND total_size = ?"
+            params.append(total_size)
+        cursor = self.db.execute(query + " ORDER BY piece_size", params)
+        keys = ('torrent_path', 'infohash', 'name', 'content_path', 'total_size', 'piece_size', 'piece_count', 'files')
+        results = []
+        for values in cursor:
+            result = dict(zip(keys, values))
+            result['files'] = json.loads(result['files'])
+            results.append(result)
+        return results
+
+    def _resume_mtime(self, torrent_path):
+        for resume_path in self._resume_paths(torrent_path):
+            try:
+                return os.path.getmtime(resume_path)
+            except OSError:
+                continue
+        return 0
+
+    def _resume_paths(self, torrent_path):
+        # qBittorrent keeps <hash>.fastresume and rtorrent <HASH>.torrent.rtorrent next to the .torrent
+        return (f"{torrent_path[:-len('.torrent')]}.fastresume", f"{torrent_path}.rtorrent")
+
+    def _read_torrent(self, torrent_path, storage_dir, mtime):
+        try:
+            metainfo = bencode.bread(torrent_path)
+            info = metainfo['info']
+            name = info['name']
+            piece_size = info['piece length']
+            piece_count = len(info['pieces']) // 20
+            if 'files' in info:
+                files = [[os.path.join(name, *each['path']), each['length']] for each in info['files']]
+            else:
+                files = [[name, info['length']]]
+        except Exception as e:
+            console.print(f"[yellow]Skipping unreadable torrent {torrent_path}: {e}")
+            return None
+
+        infohash = os.path.basename(torrent_path)[:-len('.torrent')].lower()
+        content_path = self._content_path(torrent_path, name, 'files' in info)
+        total_size = sum(size for _, size in files)
+        return (
+            torrent_path, storage_dir, infohash, mtime, name, name.lower(), content_path,
+            total_size, len(files), piece_size, piece_count, json.dumps(files)
+        )
+
+    def _content_path(self, torrent_path, name, multi_file):
+        fastresume, rtorrent_resume = self._resume_paths(torrent_path)
+        try:
+            if os.path.exists(fastresume):
+                resume = bencode.bread(fastresume)
+                save_path = resume.get('qBt-savePath') or resume.get('save_path')
+                if save_path:
+                    return os.path.join(save_path, name)
+            elif os.path.exists(rtorrent_resume):
+                resume = bencode.bread(rtorrent_resume)
+                directory = resume.get('directory')
+                if directory:
+                    return directory if multi_file else os.path.join(directory, name)
+        except Exception:
+            pass
+        return None
@@ -1,12 +1,12 @@
 import asyncio
 import traceback
-import requests
 import cli_ui
 from src.trackers.THR import THR
 from src.trackers.PTP import PTP
 from src.trackersetup import TRACKER_SETUP
 from src.trackers.COMMON import COMMON
 from src.manualpackage import package
+from src import httpclient
 
 
 async def check_mod_q_and_draft(tracker_class, meta, debug, disctype):
@@ -38,6 +38,8 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
     common = COMMON(config=config)
     tracker_setup = TRACKER_SETUP(config=config)
     enabled_trackers = tracker_setup.trackers_enabled(meta)
+    # Trackers uploaded to, whose torrents are injected together once every upload is done
+    uploaded = []
 
     async def process_single_tracker(tracker):
         if meta['name'].endswith('DUPE?'):
@@ -63,7 +65,7 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                     console.print(f"(draft: {draft})")
                 console.print(f"Uploading to {tracker_class.tracker}")
                 await tracker_class.upload(meta, disctype)
-                await client.add_to_client(meta, tracker_class.tracker)
+                uploaded.append(tracker_class.tracker)
 
         elif tracker in other_api_trackers:
             tracker_class = tracker_class_map[tracker](config=config)
@@ -77,9 +79,7 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                         await tracker_class.api_test(meta)
                     if tracker == "TL" or upload_status:
                         await tracker_class.upload(meta, disctype)
-                        if tracker == 'SN':
-                            await asyncio.sleep(16)
-                        await client.add_to_client(meta, tracker_class.tracker)
+                        uploaded.append(tracker_class.tracker)
 
         elif tracker in http_trackers:
             tracker_class = tracker_class_map[tracker](config=config)
@@ -89,7 +89,7 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                 console.print(f"Uploading to {tracker}")
                 if await tracker_class.validate_credentials(meta) is True:
                     await tracker_class.upload(meta, disctype)
-                    await client.add_to_client(meta, tracker_class.tracker)
+                    uploaded.append(tracker_class.tracker)
 
         elif tracker == "MANUAL":
             if meta['unattended']:
@@ -119,11 +119,11 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
             if upload_status:
                 thr = THR(config=config)
                 try:
-                    with requests.Session() as session:
+                    with httpclient.new_session() as session:
                         console.print("[yellow]Logging in to THR")
                         session = thr.login(session)
                         await thr.upload(session, meta, disctype)
-                        await client.add_to_client(meta, "THR")
+                        uploaded.append("THR")
                 except Exception:
                     console.print(traceback.format_exc())
 
@@ -136,9 +136,13 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                 groupID = meta.get('ptp_groupID', None)
                 ptpUrl, ptpData = await ptp.fill_upload_form(groupID, meta)
                 await ptp.upload(meta, ptpUrl, ptpData, disctype)
-                await asyncio.sleep(5)
-                await client.add_to_client(meta, "PTP")
+                uploaded.append("PTP")
 
     # Process all trackers concurrently
     tasks = [process_single_tracker(tracker) for tracker in enabled_trackers]
-    await asyncio.gather(*tasks)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if uploaded:
+        await client.add_to_client_batch(meta, uploaded)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
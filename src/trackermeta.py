@@ -1,7 +1,7 @@
 from src.console import console
-from src.trackers.COMMON import COMMON
+from src.trackers.COMMON import COMMON, NOT_LOOKED_UP
 from data.config import config
-import aiohttp
+from src import httpclient
 import asyncio
 import sys
 from PIL import Image
@@ -69,7 +69,7 @@ async def check_images_concurrently(imagelist, meta):
                 nonlocal invalid_host_found
                 invalid_host_found = True  # Mark that we found an invalid host
 
-            async with aiohttp.ClientSession() as session:
+            async with httpclient.aiohttp_session() as session:
                 async with session.get(img_url) as response:
                     if response.status == 200:
                         image_content = await response.read()
@@ -134,7 +134,7 @@ async def check_images_concurrently(imagelist, meta):
 
 
 async def check_image_link(url):
-    async with aiohttp.ClientSession() as session:
+    async with httpclient.aiohttp_session() as session:
         try:
             async with session.get(url) as response:
                 if response.status == 200:
@@ -195,7 +195,30 @@ async def update_meta_with_unit3d_data(meta, tracker_data, tracker_name):
     console.print(f"[green]{tracker_name} data successfully updated in meta[/green]")
 
 
-async def update_metadata_from_tracker(tracker_name, tracker_instance, meta, search_term, search_file_folder):
+async def lookup_tracker_metadata(tracker_name, tracker_instance, meta, search_term, search_file_folder):
+    """
+    The network half of a search by file name on tracker_name, without prompts or changes to meta,
+    so every tracker can be asked at once. Pass the result to update_metadata_from_tracker as lookup.
+    """
+    if tracker_name in ["BLU", "AITHER", "LST", "OE", "TIK"]:
+        return await COMMON(config).unit3d_torrent_lookup(
+            tracker_name,
+            tracker_instance.torrent_url,
+            tracker_instance.search_url,
+            file_name=search_term
+        )
+    elif tracker_name == "PTP":
+        return await tracker_instance.get_ptp_id_imdb(search_term, search_file_folder, meta)
+    elif tracker_name == "HDB":
+        return await tracker_instance.search_filename(search_term, search_file_folder, meta)
+    return None
+
+
+async def update_metadata_from_tracker(tracker_name, tracker_instance, meta, search_term, search_file_folder, lookup=NOT_LOOKED_UP):
+    """
+    lookup, if given, is the lookup_tracker_metadata result for this tracker (None if it found nothing),
+    used instead of searching by file name again.
+    """
     tracker_key = tracker_name.lower()
     manual_key = f"{tracker_key}_manual"
     found_match = False
@@ -217,7 +240,8 @@ async def update_metadata_from_tracker(tracker_name, tracker_instance, meta, sea
                 tracker_instance.torrent_url,
                 tracker_instance.search_url,
                 meta,
-                file_name=search_term
+                file_name=search_term,
+                json_response=lookup
             )
 
         if any(item not in [None, '0'] for item in tracker_data[:3]):  # Check for valid tmdb, imdb, or tvdb
@@ -231,7 +255,9 @@ async def update_metadata_from_tracker(tracker_name, tracker_instance, meta, sea
     elif tracker_name == "PTP":
         imdb_id = None
         if meta.get('ptp') is None:
-            imdb_id, ptp_torrent_id, ptp_torrent_hash = await tracker_instance.get_ptp_id_imdb(search_term, search_file_folder, meta)
+            if lookup is NOT_LOOKED_UP:
+                lookup = await tracker_instance.get_ptp_id_imdb(search_term, search_file_folder, meta)
+            imdb_id, ptp_torrent_id, ptp_torrent_hash = lookup
             if ptp_torrent_id:
                 meta['imdb'] = str(imdb_id).zfill(7) if imdb_id else None
                 console.print(f"[green]{tracker_name} IMDb ID found: tt{meta['imdb']}[/green]")
@@ -312,7 +338,9 @@ async def update_metadata_from_tracker(tracker_name, tracker_instance, meta, sea
             console.print("[yellow]No ID found in meta for HDB, searching by file name[/yellow]")
 
             # Use search_filename function if ID is not found in meta
-            imdb, tvdb_id, hdb_name, meta['ext_torrenthash'], tracker_id = await tracker_instance.search_filename(search_term, search_file_folder, meta)
+            if lookup is NOT_LOOKED_UP:
+                lookup = await tracker_instance.search_filename(search_term, search_file_folder, meta)
+            imdb, tvdb_id, hdb_name, meta['ext_torrenthash'], tracker_id = lookup
 
             meta['tvdb_id'] = str(tvdb_id) if tvdb_id else meta.get('tvdb_id')
             meta['hdb_name'] = hdb_name
@@ -9,6 +9,7 @@ from src.trackers.COMMON import COMMON
 from src.console import console
 import bencodepy
 import httpx
+from src import httpclient
 
 
 class ACM():
@@ -257,7 +258,7 @@ class ACM():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
             try:
                 console.print(response.json())
             except Exception:
@@ -282,7 +283,7 @@ class ACM():
         }
         # Adding Name to search seems to override tmdb
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -394,7 +395,7 @@ class ACM():
         }
 
         try:
-            response = requests.get(url=self.search_url, params=params)
+            response = httpclient.shared_session().get(url=self.search_url, params=params)
             response.raise_for_status()
             response_data = response.json()
 
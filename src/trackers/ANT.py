@@ -2,7 +2,6 @@
 # import discord
 import os
 import asyncio
-import requests
 import platform
 import httpx
 from str2bool import str2bool
@@ -11,6 +10,7 @@ from pathlib import Path
 from src.trackers.COMMON import COMMON
 from src.console import console
 from src.torrentcreate import create_torrent
+from src import httpclient
 
 
 class ANT():
@@ -122,7 +122,7 @@ class ANT():
 
         try:
             if not meta['debug']:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers)
                 if response.status_code in [200, 201]:
                     response_data = response.json()
                 else:
@@ -158,7 +158,7 @@ class ANT():
             params['imdb'] = meta['imdb_id']
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url='https://anthelion.me/api', params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 from difflib import SequenceMatcher
 from str2bool import str2bool
 import os
@@ -15,6 +14,7 @@ from src.trackers.COMMON import COMMON
 from src.console import console
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
 from src.uploadscreens import upload_screens
+from src import httpclient
 
 
 class BHD():
@@ -30,6 +30,7 @@ class BHD():
         self.tracker = 'BHD'
         self.source_flag = 'BHD'
         self.upload_url = 'https://beyond-hd.me/api/upload/'
+        self.search_url = 'https://beyond-hd.me/api/torrents/'
         self.signature = "\n[center][url=https://github.com/Audionut/Upload-Assistant]Created by Audionut's Upload Assistant[/url][/center]"
         self.banned_groups = ['Sicario', 'TOMMY', 'x0r', 'nikt0', 'FGT', 'd3g', 'MeGusta', 'YIFY', 'tigole', 'TEKNO3D', 'C4K', 'RARBG', '4K4U', 'EASports', 'ReaLHD', 'Telly', 'AOC', 'WKS', 'SasukeducK']
         pass
@@ -165,7 +166,7 @@ class BHD():
         url = self.upload_url + self.config['TRACKERS'][self.tracker]['api_key'].strip()
         details_link = {}
         if meta['debug'] is False:
-            response = requests.post(url=url, files=files, data=data, headers=headers)
+            response = await httpclient.post(url=url, files=files, data=data, headers=headers)
             try:
                 response = response.json()
                 if int(response['status_code']) == 0:
@@ -173,7 +174,7 @@ class BHD():
                     if response['status_message'].startswith('Invalid imdb_id'):
                         console.print('[yellow]RETRYING UPLOAD')
                         data['imdb_id'] = 1
-                        response = requests.post(url=url, files=files, data=data, headers=headers)
+                        response = await httpclient.post(url=url, files=files, data=data, headers=headers)
                         response = response.json()
                     elif response['status_message'].startswith('Invalid name value'):
                         console.print(f"[bold yellow]Submitted Name: {bhd_name}")
@@ -253,20 +254,20 @@ class BHD():
                     console.print(f"[yellow]Insufficient screenshots found: generating {multi_screens} screenshots.")
                 if meta['is_disc'] == "BDMV":
                     try:
-                        disc_screenshots(meta, filename, meta['bdinfo'], folder_id, base_dir, meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
+                        await asyncio.to_thread(disc_screenshots, meta, filename, meta['bdinfo'], folder_id, base_dir, meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
                     except Exception as e:
                         print(f"Error during BDMV screenshot capture: {e}")
                 elif meta['is_disc'] == "DVD":
                     try:
-                        dvd_screenshots(
-                            meta, 0, None, True
+                        await asyncio.to_thread(
+                            dvd_screenshots, meta, 0, None, True
                         )
                     except Exception as e:
                         print(f"Error during DVD screenshot capture: {e}")
                 else:
                     try:
-                        screenshots(
-                            path, filename, meta['uuid'], base_dir, meta, multi_screens, True, None)
+                        await asyncio.to_thread(
+                            screenshots, path, filename, meta['uuid'], base_dir, meta, multi_screens, True, None)
                     except Exception as e:
                         print(f"Error during generic screenshot capture: {e}")
 
@@ -482,9 +483,9 @@ class BHD():
                 data['pack'] = 1
             data['search'] = f"{meta.get('season', '')}{meta.get('episode', '')}"
 
-        url = f"https://beyond-hd.me/api/torrents/{self.config['TRACKERS']['BHD']['api_key'].strip()}"
+        url = f"{self.search_url}{self.config['TRACKERS']['BHD']['api_key'].strip()}"
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.post(url, params=data)
                 if response.status_code == 200:
                     data = response.json()
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import requests
 from src.console import console
 from str2bool import str2bool
 from pprint import pprint
@@ -8,6 +7,7 @@ import os
 import traceback
 from src.trackers.COMMON import COMMON
 from pymediainfo import MediaInfo
+from src import httpclient
 
 
 class BHDTV():
@@ -88,7 +88,7 @@ class BHDTV():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, data=data, files=files)
+            response = await httpclient.post(url=self.upload_url, data=data, files=files)
             try:
                 # pprint(data)
                 console.print(response.json())
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 from str2bool import str2bool
 import platform
 import os
@@ -10,6 +9,7 @@ import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class CBR():
@@ -108,7 +108,7 @@ class CBR():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
             try:
                 console.print(response.json())
                 # adding torrent link to comment of torrent file
@@ -174,7 +174,7 @@ class CBR():
         if meta.get('edition', "") != "":
             params['name'] = params['name'] + f" {meta['edition']}"
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -1,5 +1,5 @@
-from torf import Torrent
 import os
+import asyncio
 import requests
 import re
 import json
@@ -10,8 +10,14 @@ from pymediainfo import MediaInfo
 
 from src.bbcode import BBCODE
 from src.console import console
+from src import httpclient
 from src.uploadscreens import upload_screens
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
+from src.torrentcreate import wait_for_base_torrent
+from src.metainfo import Metainfo
+
+# Marks a lookup that was not made, as opposed to one that found nothing (None)
+NOT_LOOKED_UP = object()
 
 
 class COMMON():
@@ -21,23 +27,23 @@ class COMMON():
         pass
 
     async def edit_torrent(self, meta, tracker, source_flag, torrent_filename="BASE"):
+        await wait_for_base_torrent(meta)
         if os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent"):
-            new_torrent = Torrent.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent")
-            for each in list(new_torrent.metainfo):
-                if each not in ('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'):
-                    new_torrent.metainfo.pop(each, None)
-            new_torrent.metainfo['announce'] = self.config['TRACKERS'][tracker].get('announce_url', "https://fake.tracker").strip()
-            new_torrent.metainfo['info']['source'] = source_flag
-            Torrent.copy(new_torrent).write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent", overwrite=True)
+            new_torrent = Metainfo.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent")
+            new_torrent.keep(('announce', 'comment', 'creation date', 'created by', 'encoding'))
+            new_torrent.set('announce', self.config['TRACKERS'][tracker].get('announce_url', "https://fake.tracker").strip())
+            new_torrent.set_info('source', source_flag)
+            new_torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent")
 
     # used to add tracker url, comment and source flag to torrent file
     async def add_tracker_torrent(self, meta, tracker, source_flag, new_tracker, comment):
+        await wait_for_base_torrent(meta)
         if os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent"):
-            new_torrent = Torrent.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
-            new_torrent.metainfo['announce'] = new_tracker
-            new_torrent.metainfo['comment'] = comment
-            new_torrent.metainfo['info']['source'] = source_flag
-            Torrent.copy(new_torrent).write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent", overwrite=True)
+            new_torrent = Metainfo.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
+            new_torrent.set('announce', new_tracker)
+            new_torrent.set('comment', comment)
+            new_torrent.set_info('source', source_flag)
+            new_torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent")
 
     async def unit3d_edit_desc(self, meta, tracker, signature, comparison=False, desc_header=""):
         base = open(f"{meta['base_dir']}/tmp/{meta['uuid']}/DESCRIPTION.txt", 'r', encoding='utf8').read()
@@ -156,13 +162,13 @@ class COMMON():
                                     if each['type'] == "BDMV":
                                         use_vs = meta.get('vapoursynth', False)
                                         try:
-                                            disc_screenshots(meta, f"FILE_{i}", each['bdinfo'], meta['uuid'], meta['base_dir'], use_vs, [], meta.get('ffdebug', False), multi_screens, True)
+                                            await asyncio.to_thread(disc_screenshots, meta, f"FILE_{i}", each['bdinfo'], meta['uuid'], meta['base_dir'], use_vs, [], meta.get('ffdebug', False), multi_screens, True)
                                         except Exception as e:
                                             print(f"Error during BDMV screenshot capture: {e}")
                                         new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"FILE_{i}-*.png")
                                     if each['type'] == "DVD":
                                         try:
-                                            dvd_screenshots(meta, i, multi_screens, True)
+                                            await asyncio.to_thread(dvd_screenshots, meta, i, multi_screens, True)
                                         except Exception as e:
                                             print(f"Error during DVD screenshot capture: {e}")
                                         new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"{meta['discs'][i]['name']}-*.png")
@@ -237,7 +243,7 @@ class COMMON():
                                 if meta['debug']:
                                     console.print(f"[yellow]No existing screenshots for {new_images_key}; generating new ones.")
                             try:
-                                screenshots(file, f"FILE_{i}", meta['uuid'], meta['base_dir'], meta, multi_screens, True, None)
+                                await asyncio.to_thread(screenshots, file, f"FILE_{i}", meta['uuid'], meta['base_dir'], meta, multi_screens, True, None)
                             except Exception as e:
                                 print(f"Error during generic screenshot capture: {e}")
 
@@ -429,10 +435,11 @@ class COMMON():
             return True
         return False
 
-    async def unit3d_torrent_info(self, tracker, torrent_url, search_url, meta, id=None, file_name=None):
-        tmdb = imdb = tvdb = description = category = infohash = mal = files = None  # noqa F841
-        imagelist = []
-
+    async def unit3d_torrent_lookup(self, tracker, torrent_url, search_url, id=None, file_name=None):
+        """
+        The API request of unit3d_torrent_info on its own, no prompts and no changes to meta.
+        Returns the decoded response, or None.
+        """
         # Build the params for the API request
         params = {'api_token': self.config['TRACKERS'][tracker].get('api_key', '')}
 
@@ -445,17 +452,26 @@ class COMMON():
             console.print(f"[green]Searching {tracker} by ID: [bold yellow]{id}[/bold yellow] via {url}")
         else:
             console.print("[red]No ID or file name provided for search.[/red]")
-            return None, None, None, None, None, None, None, None, None
+            return None
 
-        response = requests.get(url=url, params=params)
+        response = await httpclient.get(url=url, params=params)
         # console.print(f"[blue]Raw API Response: {response}[/blue]")
 
         try:
-            json_response = response.json()
+            return response.json()
+        except ValueError:
+            return None
 
-            # console.print(f"Raw API Response: {json_response}", markup=False)
+    async def unit3d_torrent_info(self, tracker, torrent_url, search_url, meta, id=None, file_name=None, json_response=NOT_LOOKED_UP):
+        """
+        json_response, if given, is the result of an earlier unit3d_torrent_lookup with the same arguments (None if it found nothing).
+        """
+        tmdb = imdb = tvdb = description = category = infohash = mal = files = None  # noqa F841
+        imagelist = []
 
-        except ValueError:
+        if json_response is NOT_LOOKED_UP:
+            json_response = await self.unit3d_torrent_lookup(tracker, torrent_url, search_url, id=id, file_name=file_name)
+        if json_response is None:
             return None, None, None, None, None, None, None, None, None
 
         try:
@@ -577,11 +593,11 @@ class COMMON():
         # get douban url
         if int(meta.get('imdb_id', '0')) != 0:
             data['search'] = f"tt{meta['imdb_id']}"
-            ptgen = requests.get(url, params=data)
+            ptgen = httpclient.shared_session().get(url, params=data)
             if ptgen.json()["error"] is not None:
                 for retry in range(ptgen_retry):
                     try:
-                        ptgen = requests.get(url, params=params)
+                        ptgen = httpclient.shared_session().get(url, params=params)
                         if ptgen.json()["error"] is None:
                             break
                     except requests.exceptions.JSONDecodeError:
@@ -595,10 +611,10 @@ class COMMON():
             console.print("[red]No IMDb id was found.")
             params['url'] = console.input("[red]Please enter [yellow]Douban[/yellow] link: ")
         try:
-            ptgen = requests.get(url, params=params)
+            ptgen = httpclient.shared_session().get(url, params=params)
             if ptgen.json()["error"] is not None:
                 for retry in range(ptgen_retry):
-                    ptgen = requests.get(url, params=params)
+                    ptgen = httpclient.shared_session().get(url, params=params)
                     if ptgen.json()["error"] is None:
                         break
             ptgen = ptgen.json()
@@ -626,166 +642,123 @@ class COMMON():
             console.log(f"[cyan]Pre-filtered dupes from {tracker_name}")
             console.log(dupes)
 
+        check = self.compile_dupe_rules(meta, tracker_name)
+        normalized_dupes = [self._normalize_filename(each) for each in dupes]
         new_dupes = []
+        for each, normalized in zip(dupes, normalized_dupes):
+            excluded, reason = check(each, normalized)
+            if meta['debug']:
+                if reason:
+                    console.log(f"[yellow]Excluding result due to {reason}: {each}")
+                elif not excluded:
+                    console.log(f"[debug] Passed all checks: {each}")
+            if not excluded:
+                new_dupes.append(each)
 
+        console.log(f"[cyan]Final dupes on {tracker_name}: {new_dupes}")
+
+        return new_dupes
+
+    def compile_dupe_rules(self, meta, tracker_name):
+        """
+        Work out everything the dupe rules compare against from meta once per search.
+        Returns check(each, normalized) -> (excluded, reason), where normalized is each after normalize_filename.
+        """
         has_repack_in_uuid = "repack" in meta.get('uuid', '').lower()
         video_encode = meta.get("video_encode")
         if video_encode is not None:
             has_encoder_in_name = video_encode.lower()
-            normalized_encoder = await self.normalize_filename(has_encoder_in_name)
+            normalized_encoder = self._normalize_filename(has_encoder_in_name)
         else:
             normalized_encoder = False
         has_is_disc = bool(meta.get('is_disc', False))
-        target_hdr = await self.refine_hdr_terms(meta.get("hdr"))
-        target_season = meta.get("season")
-        target_episode = meta.get("episode")
+        target_hdr = self._refine_hdr_terms(meta.get("hdr"))
         target_resolution = meta.get("resolution")
         tag = meta.get("tag").lower().replace("-", " ")
         is_dvd = meta['is_disc'] == "DVD"
-        web_dl = meta.get('type') == "WEBDL"
         target_source = meta.get("source")
         is_sd = meta.get('sd')
+        is_tv = meta.get('category') == "TV"
+        name = meta.get('name', '').lower()
+
+        # Resolution, HDR and encoder are only compared for DVD sourced discs
+        check_resolution = is_dvd and "DVD" in (target_source or "")
+        # The HDR terms of a name can only be one of four sets, so every comparison is known up front
+        hdr_match = {}
+        for file_hdr in (frozenset(), frozenset({"HDR"}), frozenset({"DV"}), frozenset({"DV", "HDR"})):
+            hdr_match[file_hdr] = self._has_matching_hdr(file_hdr, target_hdr, meta)
+        hd_resolutions = ("1080", "720", "2160")
+        # name flag, term looked for in the lowercased result
+        flags = [(key, key in name) for key in ("remux", "uhd", "hdtv")]
+        season_episode = []
 
-        attribute_checks = [
-            {
-                "key": "repack",
-                "uuid_flag": has_repack_in_uuid,
-                "condition": lambda each: meta['tag'].lower() in each and has_repack_in_uuid and "repack" not in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result because it lacks 'repack' and matches tag '{meta['tag']}': {each}"
-            },
-            {
-                "key": "remux",
-                "uuid_flag": "remux" in meta.get('name', '').lower(),
-                "condition": lambda each: "remux" in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result due to 'remux' mismatch: {each}"
-            },
-            {
-                "key": "uhd",
-                "uuid_flag": "uhd" in meta.get('name', '').lower(),
-                "condition": lambda each: "uhd" in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result due to 'UHD' mismatch: {each}"
-            },
-            {
-                "key": "hdtv",
-                "uuid_flag": "hdtv" in meta.get('name', '').lower(),
-                "condition": lambda each: "hdtv" in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result due to 'HDTV' mismatch: {each}"
-            },
-        ]
-
-        async def log_exclusion(reason, item):
-            if meta['debug']:
-                console.log(f"[yellow]Excluding result due to {reason}: {item}")
-
-        async def process_exclusion(each):
-            """
-            Determine if an entry should be excluded.
-            Returns True if the entry should be excluded, otherwise allowed as dupe.
-            """
-            normalized = await self.normalize_filename(each)
-            file_hdr = await self.refine_hdr_terms(normalized)
-
-            if meta['debug']:
-                console.log(f"[debug] Evaluating dupe: {each}")
-                console.log(f"[debug] Normalized dupe: {normalized}")
-                console.log(f"[debug] Target resolution: {target_resolution}")
-                console.log(f"[debug] Target source: {target_source}")
-                console.log(f"[debug] File HDR terms: {file_hdr}")
-                console.log(f"[debug] Target HDR terms: {target_hdr}")
-                console.log(f"[debug] TAG: {tag}")
-                console.log("[debug] Evaluating repack condition:")
-                console.log(f"  has_repack_in_uuid: {has_repack_in_uuid}")
-                console.log(f"  'repack' in each.lower(): {'repack' in each.lower()}")
-                console.log(f"[debug] meta['uuid']: {meta.get('uuid', '')}")
-                console.log(f"[debug] meta['tag']: {meta.get('tag', '').lower()}")
-                console.log(f"[debug] normalized encoder: {normalized_encoder}")
-
-            if has_is_disc and each.lower().endswith(".m2ts"):
-                return False
+        if meta['debug']:
+            console.log(f"[debug] Target resolution: {target_resolution}")
+            console.log(f"[debug] Target source: {target_source}")
+            console.log(f"[debug] Target HDR terms: {target_hdr}")
+            console.log(f"[debug] TAG: {tag}")
+            console.log(f"[debug] has_repack_in_uuid: {has_repack_in_uuid}")
+            console.log(f"[debug] normalized encoder: {normalized_encoder}")
+
+        def check(each, normalized):
+            lower = each.lower()
+            if has_is_disc and lower.endswith(".m2ts"):
+                return False, None
 
             if has_is_disc and re.search(r'\.\w{2,4}$', each):
-                await log_exclusion("file extension mismatch (is_disc=True)", each)
-                return True
+                return True, "file extension mismatch (is_disc=True)"
 
-            if not is_dvd or not target_source.includes("DVD"):
-                skip_resolution_check = True
-            else:
-                skip_resolution_check = False
-
-            # Only check the resolution if skipping is not required
-            if not skip_resolution_check:
+            if check_resolution:
                 if target_resolution and target_resolution not in each:
-                    await log_exclusion(f"resolution '{target_resolution}' mismatch", each)
-                    return True
-                if not await self.has_matching_hdr(file_hdr, target_hdr, meta):
-                    await log_exclusion(f"HDR mismatch: Expected {target_hdr}, got {file_hdr}", each)
-                    return True
+                    return True, f"resolution '{target_resolution}' mismatch"
+                file_hdr = frozenset(self._refine_hdr_terms(normalized))
+                if not hdr_match[file_hdr]:
+                    return True, f"HDR mismatch: Expected {target_hdr}, got {set(file_hdr)}"
                 if normalized_encoder and normalized_encoder in each:
-                    await log_exclusion(f"Encoder '{has_encoder_in_name}' mismatch", each)
-                    return False
+                    return False, f"Encoder '{has_encoder_in_name}' mismatch"
 
             if is_dvd and not tracker_name == "BHD":
-                if any(str(res) in each for res in [1080, 720, 2160]):
-                    await log_exclusion(f"resolution '{target_resolution}' mismatch", each)
-                    return True
+                if any(res in each for res in hd_resolutions):
+                    return True, f"resolution '{target_resolution}' mismatch"
 
             if is_sd == 1 and tracker_name == "BHD":
-                if any(str(res) in each for res in [1080, 720, 2160]):
-                    return False
+                if any(res in each for res in hd_resolutions):
+                    return False, None
 
-            for check in attribute_checks:
-                if check["key"] == "repack":
-                    if has_repack_in_uuid and "repack" not in normalized:
-                        if tag and tag in normalized:
-                            await log_exclusion("missing 'repack'", each)
-                            return True
-                elif check["uuid_flag"] != check["condition"](each):
-                    await log_exclusion(f"{check['key']} mismatch", each)
-                    return True
+            if has_repack_in_uuid and "repack" not in normalized:
+                if tag and tag in normalized:
+                    return True, "missing 'repack'"
+            for key, flag in flags:
+                if flag != (key in lower):
+                    return True, f"{key} mismatch"
 
-            if meta.get('category') == "TV":
-                season_episode_match = await self.is_season_episode_match(normalized, target_season, target_episode)
-                if meta['debug']:
-                    console.log(f"[debug] Season/Episode match result: {season_episode_match}")
-                if not season_episode_match:
-                    await log_exclusion("season/episode mismatch", each)
-                    return True
+            if is_tv:
+                if not season_episode:
+                    # Parsed on first use, a malformed season/episode only matters once a result gets this far
+                    season_episode.append(self._season_episode_patterns(meta.get("season"), meta.get("episode")))
+                season_pattern, episode_pattern = season_episode[0]
+                if season_pattern and season_pattern not in normalized or episode_pattern and episode_pattern not in normalized:
+                    return True, "season/episode mismatch"
 
-            if web_dl and ("web-dl" in normalized or "webdl" in normalized or "web dl" in normalized):
-                return False
+            return False, None
 
-            if meta['debug']:
-                console.log(f"[debug] Passed all checks: {each}")
-            return False
-
-        for each in dupes:
-            if not await process_exclusion(each):
-                new_dupes.append(each)
-
-        console.log(f"[cyan]Final dupes on {tracker_name}: {new_dupes}")
-
-        return new_dupes
+        return check
 
     async def normalize_filename(self, filename):
         """
         Normalize a filename for easier matching.
         Retain season/episode information in the format SxxExx.
         """
-        normalized = filename.lower().replace("-", " ").replace(" ", " ").replace(".", " ")
+        return self._normalize_filename(filename)
 
-        return normalized
+    def _normalize_filename(self, filename):
+        return filename.lower().replace("-", " ").replace(".", " ")
 
     async def is_season_episode_match(self, filename, target_season, target_episode):
         """
         Check if the filename matches the given season and episode.
         """
-        if target_season:
-            target_season = int(str(target_season).lstrip('sS'))
-        if target_episode:
-            target_episode = int(str(target_episode).lstrip('eE'))
-
-        season_pattern = f"s{target_season:02}" if target_season else None
-        episode_pattern = f"e{target_episode:02}" if target_episode else None
+        season_pattern, episode_pattern = self._season_episode_patterns(target_season, target_episode)
 
         if season_pattern and episode_pattern:
             return season_pattern in filename and episode_pattern in filename
@@ -795,11 +768,24 @@ class COMMON():
             return episode_pattern in filename
         return True
 
+    def _season_episode_patterns(self, target_season, target_episode):
+        if target_season:
+            target_season = int(str(target_season).lstrip('sS'))
+        if target_episode:
+            target_episode = int(str(target_episode).lstrip('eE'))
+
+        season_pattern = f"s{target_season:02}" if target_season else None
+        episode_pattern = f"e{target_episode:02}" if target_episode else None
+        return season_pattern, episode_pattern
+
     async def refine_hdr_terms(self, hdr):
         """
         Normalize HDR terms for consistent comparison.
         Simplifies all HDR entries to 'HDR' and DV entries to 'DV'.
         """
+        return self._refine_hdr_terms(hdr)
+
+    def _refine_hdr_terms(self, hdr):
         if hdr is None:
             return set()
         hdr = hdr.upper()
@@ -814,6 +800,9 @@ class COMMON():
         """
         Check if the HDR terms match or are compatible.
         """
+        return self._has_matching_hdr(file_hdr, target_hdr, meta)
+
+    def _has_matching_hdr(self, file_hdr, target_hdr, meta):
         def simplify_hdr(hdr_set):
             """Simplify HDR terms to just HDR and DV."""
             simplified = set()
@@ -1,4 +1,3 @@
-import requests
 import asyncio
 import re
 import os
@@ -14,6 +13,7 @@ import httpx
 from src.trackers.COMMON import COMMON
 from src.exceptions import *  # noqa F403
 from src.console import console
+from src import httpclient
 
 
 class FL():
@@ -172,11 +172,11 @@ class FL():
                 console.print(url)
                 console.print(data)
             else:
-                with requests.Session() as session:
+                with httpclient.new_session() as session:
                     cookiefile = os.path.abspath(f"{meta['base_dir']}/data/cookies/FL.pkl")
                     with open(cookiefile, 'rb') as cf:
                         session.cookies.update(pickle.load(cf))
-                    up = session.post(url=url, data=data, files=files)
+                    up = await asyncio.to_thread(session.post, url=url, data=data, files=files)
                     torrentFile.close()
 
                     # Match url to verify successful upload
@@ -214,7 +214,7 @@ class FL():
             }
 
         try:
-            async with httpx.AsyncClient(cookies=cookies, timeout=10.0) as client:
+            async with httpclient.pooled_client(cookies=cookies, timeout=10.0) as client:
                 response = await client.get(search_url, params=params)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -257,7 +257,7 @@ class FL():
     async def validate_cookies(self, meta, cookiefile):
         url = "https://filelist.io/index.php"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
                 resp = session.get(url=url)
@@ -273,7 +273,7 @@ class FL():
             return False
 
     async def login(self, cookiefile):
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             r = session.get("https://filelist.io/login.php")
             await asyncio.sleep(0.5)
             soup = BeautifulSoup(r.text, 'html.parser')
@@ -332,7 +332,7 @@ class FL():
                 files = []
                 for screen in screen_glob:
                     files.append(('images', (os.path.basename(screen), open(f"{meta['base_dir']}/tmp/{meta['uuid']}/{screen}", 'rb'), 'image/png')))
-                response = requests.post(url, data=data, files=files, auth=(self.fltools['user'], self.fltools['pass']))
+                response = httpclient.shared_session().post(url, data=data, files=files, auth=(self.fltools['user'], self.fltools['pass']))
                 final_desc = response.text.replace('\r\n', '\n')
             else:
                 # BD Description Generator
@@ -347,7 +347,7 @@ class FL():
                     files = []
                     for screen in screen_glob:
                         files.append(('images', (os.path.basename(screen), open(f"{meta['base_dir']}/tmp/{meta['uuid']}/{screen}", 'rb'), 'image/png')))
-                    response = requests.post(url, files=files, auth=(self.fltools['user'], self.fltools['pass']))
+                    response = httpclient.shared_session().post(url, files=files, auth=(self.fltools['user'], self.fltools['pass']))
                     final_desc += response.text.replace('\r\n', '\n')
             descfile.write(final_desc)
 
@@ -1,4 +1,3 @@
-import requests
 import asyncio
 import re
 import os
@@ -11,6 +10,7 @@ from urllib.parse import urlparse, quote
 from src.trackers.COMMON import COMMON
 from src.exceptions import *  # noqa F403
 from src.console import console
+from src import httpclient
 from datetime import datetime
 from torf import Torrent
 from src.torrentcreate import CustomTorrent, torf_cb
@@ -24,6 +24,7 @@ class HDB():
         self.source_flag = 'HDBits'
         self.username = config['TRACKERS']['HDB'].get('username', '').strip()
         self.passkey = config['TRACKERS']['HDB'].get('passkey', '').strip()
+        self.search_url = "https://hdbits.org/api/torrents"
         self.rehost_images = config['TRACKERS']['HDB'].get('img_rehost', True)
         self.signature = None
         self.banned_groups = [""]
@@ -299,10 +300,10 @@ class HDB():
                 console.print(url)
                 console.print(data)
             else:
-                with requests.Session() as session:
+                with httpclient.new_session() as session:
                     cookiefile = f"{meta['base_dir']}/data/cookies/HDB.txt"
                     session.cookies.update(await common.parseCookieFile(cookiefile))
-                    up = session.post(url=url, data=data, files=files)
+                    up = await asyncio.to_thread(session.post, url=url, data=data, files=files)
                     torrentFile.close()
 
                     # Match url to verify successful upload
@@ -321,7 +322,7 @@ class HDB():
         dupes = []
         console.print("[yellow]Searching for existing torrents on HDB...")
 
-        url = "https://hdbits.org/api/torrents"
+        url = self.search_url
         data = {
             'username': self.username,
             'passkey': self.passkey,
@@ -339,7 +340,7 @@ class HDB():
 
         try:
             # Send POST request with JSON body
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.post(url, json=data)
 
                 if response.status_code == 200:
@@ -357,7 +358,6 @@ class HDB():
         except Exception as e:
             console.print("[bold red]Unexpected error occurred while searching torrents.")
             console.print(str(e))
-            await asyncio.sleep(5)
 
         return dupes
 
@@ -379,7 +379,7 @@ class HDB():
             'passkey': self.passkey
         }
         try:
-            r = requests.post(url, data=json.dumps(data)).json()
+            r = httpclient.shared_session().post(url, data=json.dumps(data)).json()
             if r.get('status', 5) == 0:
                 return True
             return False
@@ -391,7 +391,7 @@ class HDB():
         url = "https://hdbits.org"
         cookiefile = f"{meta['base_dir']}/data/cookies/HDB.txt"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 session.cookies.update(await common.parseCookieFile(cookiefile))
                 resp = session.get(url=url)
                 if meta['debug']:
@@ -415,7 +415,7 @@ class HDB():
             'passkey': self.passkey,
             'id': id
         }
-        r = requests.get(url=api_url, data=json.dumps(data))
+        r = httpclient.shared_session().get(url=api_url, data=json.dumps(data))
         filename = r.json()['data'][0]['filename']
 
         # Download new .torrent
@@ -425,7 +425,7 @@ class HDB():
             'id': id
         }
 
-        r = requests.get(url=download_url, params=params)
+        r = httpclient.shared_session().get(url=download_url, params=params)
         with open(torrent_path, "wb") as tor:
             tor.write(r.content)
         return
@@ -497,7 +497,7 @@ class HDB():
             hdbimg_screen_count = len(images)
         for i in range(hdbimg_screen_count):
             files[f'images_files[{i}]'] = open(images[i], 'rb')
-        r = requests.post(url=url, data=data, files=files)
+        r = httpclient.shared_session().post(url=url, data=data, files=files)
         image_bbcode = r.text
         return image_bbcode
 
@@ -509,7 +509,7 @@ class HDB():
             "passkey": self.passkey,
             "id": hdb_id
         }
-        response = requests.get(url, json=data)
+        response = httpclient.shared_session().get(url, json=data)
         if response.ok:
             try:
                 response = response.json()
@@ -569,7 +569,7 @@ class HDB():
             console.print(f"[green]Searching HDB for file: [bold yellow]{os.path.basename(search_term)}[/bold yellow]")
             # console.print(f"[yellow]Using this data: {data}")
 
-        response = requests.get(url, json=data)
+        response = await httpclient.get(url, json=data)
 
         if response.ok:
             try:
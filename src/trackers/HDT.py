@@ -1,4 +1,3 @@
-import requests
 import asyncio
 import re
 import os
@@ -11,6 +10,7 @@ from pymediainfo import MediaInfo
 from src.trackers.COMMON import COMMON
 from src.exceptions import *  # noqa F403
 from src.console import console
+from src import httpclient
 
 
 class HDT():
@@ -176,7 +176,7 @@ class HDT():
                 console.print(data)
                 console.print("Files being sent:", style="bold blue")
                 console.print(files)
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 cookiefile = os.path.abspath(f"{meta['base_dir']}/data/cookies/HDT.txt")
 
                 if meta['debug']:
@@ -187,7 +187,7 @@ class HDT():
                 if meta['debug']:
                     console.print(f"Session cookies: {session.cookies}")
 
-                up = session.post(url=url, data=data, files=files)
+                up = await asyncio.to_thread(session.post, url=url, data=data, files=files)
                 torrentFile.close()
 
                 # Debug response
@@ -226,7 +226,7 @@ class HDT():
 
         search_url = "https://hd-torrents.net/torrents.php"
 
-        async with httpx.AsyncClient(cookies=cookies, timeout=10.0) as client:
+        async with httpclient.pooled_client(cookies=cookies, timeout=10.0) as client:
             csrfToken = await self.get_csrfToken(client, search_url)
             if int(meta['imdb_id'].replace('tt', '')) != 0:
                 params = {
@@ -280,7 +280,7 @@ class HDT():
         url = "https://hd-torrents.net/index.php"
         cookiefile = f"{meta['base_dir']}/data/cookies/HDT.txt"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 session.cookies.update(await common.parseCookieFile(cookiefile))
                 res = session.get(url=url)
                 if meta['debug']:
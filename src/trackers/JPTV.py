@@ -1,13 +1,13 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 import platform
 from str2bool import str2bool
 import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class JPTV():
@@ -137,7 +137,7 @@ class JPTV():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
             try:
                 console.print(response.json())
                 # adding torrent link to comment of torrent file
@@ -168,7 +168,7 @@ class JPTV():
             console.log("[cyan]Dupe Search Parameters")
             console.log(params)
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -1,6 +1,6 @@
-import requests
 import asyncio
 from src.console import console
+from src import httpclient
 import traceback
 from torf import Torrent
 import httpx
@@ -15,7 +15,7 @@ from src.trackers.COMMON import COMMON
 from datetime import datetime
 import glob
 from urllib.parse import urlparse
-from src.torrentcreate import CustomTorrent, torf_cb
+from src.torrentcreate import CustomTorrent, torf_cb, find_base_torrent
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
 from src.uploadscreens import upload_screens
 
@@ -63,7 +63,11 @@ class MTV():
 
             if torrent.piece_size > 8388608:
                 tracker_config = self.config['TRACKERS'].get(self.tracker, {})
-                if str(tracker_config.get('skip_if_rehash', 'false')).lower() == "false":
+                small_base = find_base_torrent(meta, 8388608)
+                if small_base is not None:
+                    console.print(f"[green]Using {small_base}.torrent hashed alongside BASE.torrent for MTV")
+                    torrent_filename = small_base
+                elif str(tracker_config.get('skip_if_rehash', 'false')).lower() == "false":
                     console.print("[red]Piece size is OVER 8M and does not work on MTV. Generating a new .torrent")
 
                     meta['max_piece_size'] = '8'
@@ -189,10 +193,10 @@ class MTV():
         }
 
         if not meta['debug']:
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
-                response = session.post(url=self.upload_url, data=data, files=files)
+                response = await asyncio.to_thread(session.post, url=self.upload_url, data=data, files=files)
                 try:
                     if "torrents.php" in response.url:
                         console.print(response.url)
@@ -254,20 +258,20 @@ class MTV():
                     console.print(f"[yellow]Insufficient screenshots found: generating {multi_screens} screenshots.")
                 if meta['is_disc'] == "BDMV":
                     try:
-                        disc_screenshots(meta, filename, meta['bdinfo'], folder_id, base_dir, meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
+                        await asyncio.to_thread(disc_screenshots, meta, filename, meta['bdinfo'], folder_id, base_dir, meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
                     except Exception as e:
                         print(f"Error during BDMV screenshot capture: {e}")
                 elif meta['is_disc'] == "DVD":
                     try:
-                        dvd_screenshots(
-                            meta, 0, None, True
+                        await asyncio.to_thread(
+                            dvd_screenshots, meta, 0, None, True
                         )
                     except Exception as e:
                         print(f"Error during DVD screenshot capture: {e}")
                 else:
                     try:
-                        screenshots(
-                            path, filename, meta['uuid'], base_dir, meta, multi_screens, True, None)
+                        await asyncio.to_thread(
+                            screenshots, path, filename, meta['uuid'], base_dir, meta, multi_screens, True, None)
                     except Exception as e:
                         print(f"Error during generic screenshot capture: {e}")
 
@@ -588,7 +592,7 @@ class MTV():
             'apikey': self.config['TRACKERS'][self.tracker]['api_key'].strip(),
         }
         try:
-            r = requests.get(url, params=params)
+            r = httpclient.shared_session().get(url, params=params)
             if not r.ok:
                 if "unauthorized api key" in r.text.lower():
                     console.print("[red]Invalid API Key")
@@ -600,7 +604,7 @@ class MTV():
     async def validate_cookies(self, meta, cookiefile):
         url = "https://www.morethantv.me/index.php"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
                 resp = session.get(url=url)
@@ -618,7 +622,7 @@ class MTV():
     async def get_auth(self, cookiefile):
         url = "https://www.morethantv.me/index.php"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
                 resp = session.get(url=url)
@@ -626,7 +630,7 @@ class MTV():
                 return auth
 
     async def login(self, cookiefile):
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             url = 'https://www.morethantv.me/login'
             payload = {
                 'username': self.config['TRACKERS'][self.tracker].get('username'),
@@ -690,7 +694,7 @@ class MTV():
             params['q'] = meta['title'].replace(': ', ' ').replace('’', '').replace("'", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
 
                 if response.status_code == 200 and response.text:
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import requests
 from guessit import guessit
 import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class NBL():
@@ -62,7 +62,7 @@ class NBL():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data)
             try:
                 if response.ok:
                     response = response.json()
@@ -110,7 +110,7 @@ class NBL():
         }
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.post(self.search_url, json=payload)
                 if response.status_code == 200:
                     data = response.json()
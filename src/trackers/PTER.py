@@ -1,5 +1,5 @@
 from bs4 import BeautifulSoup
-import requests
+import asyncio
 import re
 import os
 from pathlib import Path
@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 from src.trackers.COMMON import COMMON
 from src.exceptions import *  # noqa E403
 from src.console import console
+from src import httpclient
 
 
 class PTER():
@@ -43,7 +44,7 @@ class PTER():
         url = "https://pterclub.com"
         cookiefile = f"{meta['base_dir']}/data/cookies/PTER.txt"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 session.cookies.update(await common.parseCookieFile(cookiefile))
                 resp = session.get(url=url)
 
@@ -73,7 +74,7 @@ class PTER():
         search_url = f"https://pterclub.com/torrents.php?search={imdb}&incldead=0&search_mode=0&source{source}=1"
 
         try:
-            async with httpx.AsyncClient(cookies=cookies, timeout=10.0) as client:
+            async with httpclient.pooled_client(cookies=cookies, timeout=10.0) as client:
                 response = await client.get(search_url)
 
                 if response.status_code == 200:
@@ -225,7 +226,7 @@ class PTER():
         if not os.path.exists(f"{meta['base_dir']}/data/cookies"):
             Path(f"{meta['base_dir']}/data/cookies").mkdir(parents=True, exist_ok=True)
         cookiefile = f"{meta['base_dir']}/data/cookies/Pterimg.pickle"
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             loggedIn = False
             if os.path.exists(cookiefile):
                 with open(cookiefile, 'rb') as cf:
@@ -271,7 +272,7 @@ class PTER():
             'auth_token': await self.get_auth_token(meta)
         }
         cookiefile = f"{meta['base_dir']}/data/cookies/Pterimg.pickle"
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             if os.path.exists(cookiefile):
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
@@ -389,9 +390,9 @@ class PTER():
             else:
                 cookiefile = f"{meta['base_dir']}/data/cookies/PTER.txt"
                 if os.path.exists(cookiefile):
-                    with requests.Session() as session:
+                    with httpclient.new_session() as session:
                         session.cookies.update(await common.parseCookieFile(cookiefile))
-                        up = session.post(url=url, data=data, files=files)
+                        up = await asyncio.to_thread(session.post, url=url, data=data, files=files)
                         torrentFile.close()
                         mi_dump.close()
 
@@ -407,7 +408,7 @@ class PTER():
 
     async def download_new_torrent(self, id, torrent_path):
         download_url = f"https://pterclub.com/download.php?id={id}&passkey={self.passkey}"
-        r = requests.get(url=download_url)
+        r = httpclient.shared_session().get(url=download_url)
         if r.status_code == 200:
             with open(torrent_path, "wb") as tor:
                 tor.write(r.content)
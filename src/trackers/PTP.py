@@ -1,5 +1,4 @@
 import cli_ui
-import requests
 import asyncio
 import re
 import os
@@ -16,6 +15,7 @@ from src.trackers.COMMON import COMMON
 from src.bbcode import BBCODE
 from src.exceptions import *  # noqa F403
 from src.console import console
+from src import httpclient
 from torf import Torrent
 from datetime import datetime
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
@@ -96,8 +96,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await httpclient.get(url, params=params, headers=headers)
         console.print(f"[green]Searching PTP for: [bold yellow]{filename}[/bold yellow]")
 
         try:
@@ -166,8 +165,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await httpclient.get(url, params=params, headers=headers)
         try:
             if response.status_code == 200:
                 response = response.json()
@@ -200,8 +198,7 @@ class PTP():
         }
         url = 'https://passthepopcorn.me/torrents.php'
         console.print(f"[yellow]Requesting description from {url} with ID {ptp_torrent_id}")
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await httpclient.get(url, params=params, headers=headers)
 
         ptp_desc = response.text
         # console.print(f"[yellow]Raw description received:\n{ptp_desc[:6800]}...")  # Show first 500 characters for brevity
@@ -247,8 +244,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url=url, headers=headers, params=params)
-        await asyncio.sleep(1)
+        response = await httpclient.get(url=url, headers=headers, params=params)
         try:
             response = response.json()
             if response.get("Page") == "Browse":  # No Releases on Site with ID
@@ -275,8 +271,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = "https://passthepopcorn.me/ajax.php"
-        response = requests.get(url=url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await httpclient.get(url=url, params=params, headers=headers)
         tinfo = {}
         try:
             response = response.json()
@@ -345,9 +340,8 @@ class PTP():
         url = 'https://passthepopcorn.me/torrents.php'
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpclient.pooled_client(timeout=10.0) as client:
                 response = await client.get(url, headers=headers, params=params)
-                await asyncio.sleep(1)  # Mimic server-friendly delay
                 if response.status_code == 200:
                     existing = []
                     try:
@@ -380,7 +374,7 @@ class PTP():
         headers = {'referer': 'https://ptpimg.me/index.php'}
         url = "https://ptpimg.me/upload.php"
 
-        response = requests.post(url, headers=headers, data=payload)
+        response = await asyncio.to_thread(httpclient.shared_session().post, url, headers=headers, data=payload)
         try:
             response = response.json()
             ptpimg_code = response[0]['code']
@@ -711,7 +705,7 @@ class PTP():
                                 new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"FILE_{i}-*.png")
                                 if not new_screens:
                                     try:
-                                        disc_screenshots(meta, f"FILE_{i}", each['bdinfo'], meta['uuid'], meta['base_dir'], meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
+                                        await asyncio.to_thread(disc_screenshots, meta, f"FILE_{i}", each['bdinfo'], meta['uuid'], meta['base_dir'], meta.get('vapoursynth', False), [], meta.get('ffdebug', False), multi_screens, True)
                                     except Exception as e:
                                         print(f"Error during BDMV screenshot capture: {e}")
                                 new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"FILE_{i}-*.png")
@@ -763,8 +757,8 @@ class PTP():
                                 new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"{meta['discs'][i]['name']}-*.png")
                                 if not new_screens:
                                     try:
-                                        dvd_screenshots(
-                                            meta, i, multi_screens, True
+                                        await asyncio.to_thread(
+                                            dvd_screenshots, meta, i, multi_screens, True
                                         )
                                     except Exception as e:
                                         print(f"Error during DVD screenshot capture: {e}")
@@ -831,8 +825,8 @@ class PTP():
                             new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"FILE_{i}-*.png")
                             if not new_screens:
                                 try:
-                                    screenshots(
-                                        file, f"FILE_{i}", meta['uuid'], meta['base_dir'], meta, multi_screens, True, None)
+                                    await asyncio.to_thread(
+                                        screenshots, file, f"FILE_{i}", meta['uuid'], meta['base_dir'], meta, multi_screens, True, None)
                                 except Exception as e:
                                     print(f"Error during generic screenshot capture: {e}")
                             new_screens = glob.glob1(f"{meta['base_dir']}/tmp/{meta['uuid']}", f"FILE_{i}-*.png")
@@ -856,12 +850,13 @@ class PTP():
         if not os.path.exists(f"{meta['base_dir']}/data/cookies"):
             Path(f"{meta['base_dir']}/data/cookies").mkdir(parents=True, exist_ok=True)
         cookiefile = f"{meta['base_dir']}/data/cookies/PTP.pickle"
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             loggedIn = False
             if os.path.exists(cookiefile):
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
-                uploadresponse = session.get("https://passthepopcorn.me/upload.php")
+                # PTP requests are rate limited, wait for them (and the site) off the event loop
+                uploadresponse = await asyncio.to_thread(session.get, "https://passthepopcorn.me/upload.php")
                 loggedIn = await self.validate_login(uploadresponse)
             else:
                 console.print("[yellow]PTP Cookies not found. Creating new session.")
@@ -876,15 +871,13 @@ class PTP():
                     "keeplogged": "1",
                 }
                 headers = {"User-Agent": self.user_agent}
-                loginresponse = session.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
-                await asyncio.sleep(2)
+                loginresponse = await asyncio.to_thread(session.post, "https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
                 try:
                     resp = loginresponse.json()
                     if resp['Result'] == "TfaRequired":
                         data['TfaType'] = "normal"
                         data['TfaCode'] = cli_ui.ask_string("2FA Required: Please enter 2FA code")
-                        loginresponse = session.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
-                        await asyncio.sleep(2)
+                        loginresponse = await asyncio.to_thread(session.post, "https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
                         resp = loginresponse.json()
                     try:
                         if resp["Result"] != "Ok":
@@ -1041,11 +1034,11 @@ class PTP():
                 console.log(url)
                 console.log(data)
             else:
-                with requests.Session() as session:
+                with httpclient.new_session() as session:
                     cookiefile = f"{meta['base_dir']}/data/cookies/PTP.pickle"
                     with open(cookiefile, 'rb') as cf:
                         session.cookies.update(pickle.load(cf))
-                    response = session.post(url=url, data=data, headers=headers, files=files)
+                    response = await asyncio.to_thread(session.post, url=url, data=data, headers=headers, files=files)
                 console.print(f"[cyan]{response.url}")
                 responsetext = response.text
                 # If the response contains our announce URL, then we are on the upload page and the upload wasn't successful.
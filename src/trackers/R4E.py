@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 from str2bool import str2bool
 import tmdbsimple as tmdb
 import platform
@@ -11,6 +10,7 @@ import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class R4E():
@@ -25,6 +25,7 @@ class R4E():
         self.config = config
         self.tracker = 'R4E'
         self.source_flag = 'R4E'
+        self.search_url = 'https://racing4everyone.eu/api/torrents/filter'
         # self.signature = f"\n[center][url=https://github.com/L4GSP1KE/Upload-Assistant]Created by L4G's Upload Assistant[/url][/center]"
         self.signature = None
         self.banned_groups = [""]
@@ -90,7 +91,7 @@ class R4E():
             data['season_number'] = meta.get('season_int', '0')
             data['episode_number'] = meta.get('episode_int', '0')
         if meta['debug'] is False:
-            response = requests.post(url=url, files=files, data=data, headers=headers)
+            response = await httpclient.post(url=url, files=files, data=data, headers=headers)
             try:
 
                 console.print(response.json())
@@ -151,7 +152,7 @@ class R4E():
     async def search_existing(self, meta, disctype):
         dupes = []
         console.print("[yellow]Searching for existing torrents on R4E...")
-        url = "https://racing4everyone.eu/api/torrents/filter"
+        url = self.search_url
         params = {
             'api_token': self.config['TRACKERS']['R4E']['api_key'].strip(),
             'tmdb': meta['tmdb'],
@@ -164,7 +165,7 @@ class R4E():
         if meta.get('edition', "") != "":
             params['name'] = params['name'] + meta['edition']
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=url, params=params)
                 if response.status_code == 200:
                     data = response.json()
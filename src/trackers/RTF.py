@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 import base64
 import re
 import datetime
@@ -9,6 +8,7 @@ import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class RTF():
@@ -75,7 +75,7 @@ class RTF():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, json=json_data, headers=headers)
+            response = await httpclient.post(url=self.upload_url, json=json_data, headers=headers)
             try:
                 console.print(response.json())
 
@@ -115,7 +115,7 @@ class RTF():
             params['search'] = meta['title'].replace(':', '').replace("'", '').replace(",", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(self.search_url, params=params, headers=headers)
                 if response.status_code == 200:
                     data = response.json()
@@ -143,7 +143,7 @@ class RTF():
             'Authorization': self.config['TRACKERS'][self.tracker]['api_key'].strip(),
         }
 
-        response = requests.get('https://retroflix.club/api/test', headers=headers)
+        response = httpclient.shared_session().get('https://retroflix.club/api/test', headers=headers)
 
         if response.status_code != 200:
             console.print('[bold red]Your API key is incorrect SO generating a new one')
@@ -165,7 +165,7 @@ class RTF():
         config_path = f"{base_dir}/data/config.py"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpclient.pooled_client() as client:
                 response = await client.post('https://retroflix.club/api/login', headers=headers, json=json_data)
 
             if response.status_code == 201:
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
-import requests
 import asyncio
 import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class SN():
@@ -89,7 +89,7 @@ class SN():
         }
 
         if meta['debug'] is False:
-            response = requests.request("POST", url=self.upload_url, data=data, files=files)
+            response = await httpclient.post(url=self.upload_url, data=data, files=files)
 
             try:
                 if response.json().get('success'):
@@ -143,7 +143,7 @@ class SN():
                 params['filter'] = meta['resolution']
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpclient.pooled_client(timeout=10.0) as client:
                 response = await client.get(self.search_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -2,7 +2,6 @@
 # import discord
 import asyncio
 from torf import Torrent
-import requests
 from src.console import console
 from pprint import pprint
 import base64
@@ -11,6 +10,7 @@ import os
 import traceback
 import httpx
 from src.trackers.COMMON import COMMON
+from src import httpclient
 
 
 class SPD():
@@ -85,14 +85,14 @@ class SPD():
         headers = {'Authorization': 'Bearer ' + self.config['TRACKERS'][self.tracker]['api_key'].strip()}
 
         if meta['debug'] is False:
-            response = requests.request("POST", url=self.upload_url, json=data, headers=headers)
+            response = await httpclient.post(url=self.upload_url, json=data, headers=headers)
             try:
                 print(response.json())
                 # response = {'status': True, 'error': False, 'downloadUrl': '/api/torrent/383435/download', 'torrent': {'id': 383435, 'name': 'name-with-full-stops', 'slug': 'name-with-dashs', 'category_id': 3}}
                 # downloading the torrent from site as it adds a tonne of different trackers and the source is different all the time.
                 try:
                     # torrent may not dl and may not provide error if machine is under load or network connection usage high.
-                    with requests.get(url=self.url + response.json()['downloadUrl'], stream=True, headers=headers) as r:
+                    with httpclient.shared_session().get(url=self.url + response.json()['downloadUrl'], stream=True, headers=headers) as r:
                         # replacing L4g/torf created torrent so it will be added to the client.
                         with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{self.tracker}]{meta['clean_name']}.torrent",
                                   'wb') as f:
@@ -139,7 +139,7 @@ class SPD():
             params['search'] = meta['title'].replace(':', '').replace("'", '').replace(",", '')
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpclient.pooled_client(timeout=10.0) as client:
                 response = client.get(url=self.search_url, params=params, headers=headers)
                 if response.status_code == 200:
                     data = response.json()
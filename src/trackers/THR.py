@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import asyncio
 from torf import Torrent
-import requests
 import json
 import glob
 import cli_ui
@@ -12,6 +11,7 @@ import httpx
 from bs4 import BeautifulSoup
 from unidecode import unidecode
 from src.console import console
+from src import httpclient
 
 
 class THR():
@@ -96,7 +96,7 @@ class THR():
             thr_upload_prompt = cli_ui.ask_yes_no("send to takeupload.php?", default=False)
         if thr_upload_prompt is True:
             await asyncio.sleep(0.5)
-            response = session.post(url=url, files=files, data=payload, headers=headers)
+            response = await asyncio.to_thread(session.post, url=url, files=files, data=payload, headers=headers)
             try:
                 if meta['debug']:
                     console.print(response.text)
@@ -196,10 +196,8 @@ class THR():
             desc.write("[/quote]")
             desc.write(base)
             # REHOST IMAGES
-            os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
-            image_glob = glob.glob("*.png")
-            if 'POSTER.png' in image_glob:
-                image_glob.remove('POSTER.png')
+            screens_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
+            image_glob = [os.path.join(screens_dir, image) for image in glob.glob("*.png", root_dir=screens_dir) if image != 'POSTER.png']
             image_list = []
             for image in image_glob:
                 url = "https://img2.torrenthr.org/api/1/upload"
@@ -208,7 +206,7 @@ class THR():
                     # 'source' : base64.b64encode(open(image, "rb").read()).decode('utf8')
                 }
                 files = {'source': open(image, 'rb')}
-                response = requests.post(url, data=data, files=files)
+                response = httpclient.shared_session().post(url, data=data, files=files)
                 try:
                     response = response.json()
                     # med_url = response['image']['medium']['url']
@@ -234,7 +232,7 @@ class THR():
                     'theme': self.config['TRACKERS']['THR'].get('pronfo_theme', 'gray'),
                     'rapi': self.config['TRACKERS']['THR'].get('pronfo_rapi_id')
                 }
-                response = requests.post(pronfo_url, data=data)
+                response = httpclient.shared_session().post(pronfo_url, data=data)
                 try:
                     response = response.json()
                     if response.get('error', True) is False:
@@ -265,7 +263,7 @@ class THR():
         console.print("[yellow]Searching for existing torrents on THR...")
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpclient.pooled_client(timeout=10.0) as client:
                 response = await client.get(search_url)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 # import discord
-import requests
 import platform
 
 from src.trackers.COMMON import COMMON
 from src.console import console
 from pathlib import Path
+from src import httpclient
 
 
 class TL():
@@ -104,7 +104,7 @@ class TL():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers)
             if not response.text.isnumeric():
                 console.print(f'[red]{response.text}')
         else:
@@ -1,6 +1,5 @@
 import pickle
 from bs4 import BeautifulSoup
-import requests
 import asyncio
 import re
 import os
@@ -12,6 +11,7 @@ from urllib.parse import urlparse
 from src.trackers.COMMON import COMMON
 from src.exceptions import *  # noqa #F405
 from src.console import console
+from src import httpclient
 
 
 class TTG():
@@ -159,11 +159,11 @@ class TTG():
                 console.print(url)
                 console.print(data)
             else:
-                with requests.Session() as session:
+                with httpclient.new_session() as session:
                     cookiefile = os.path.abspath(f"{meta['base_dir']}/data/cookies/TTG.pkl")
                     with open(cookiefile, 'rb') as cf:
                         session.cookies.update(pickle.load(cf))
-                    up = session.post(url=url, data=data, files=files)
+                    up = await asyncio.to_thread(session.post, url=url, data=data, files=files)
                     torrentFile.close()
                     mi_dump.close()
 
@@ -202,7 +202,7 @@ class TTG():
         search_url = f"https://totheglory.im/browse.php?search_field= {imdb} {res_type}"
 
         try:
-            async with httpx.AsyncClient(cookies=cookies, timeout=10.0) as client:
+            async with httpclient.pooled_client(cookies=cookies, timeout=10.0) as client:
                 response = await client.get(search_url)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -248,7 +248,7 @@ class TTG():
     async def validate_cookies(self, meta, cookiefile):
         url = "https://totheglory.im"
         if os.path.exists(cookiefile):
-            with requests.Session() as session:
+            with httpclient.new_session() as session:
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
                 resp = session.get(url=url)
@@ -271,7 +271,7 @@ class TTG():
             'passid': self.passid,
             'passan': self.passan
         }
-        with requests.Session() as session:
+        with httpclient.new_session() as session:
             response = session.post(url, data=data)
             await asyncio.sleep(0.5)
             if response.url.endswith('2fa.php'):
@@ -348,7 +348,7 @@ class TTG():
 
     async def download_new_torrent(self, id, torrent_path):
         download_url = f"https://totheglory.im/dl/{id}/{self.passkey}"
-        r = requests.get(url=download_url)
+        r = httpclient.shared_session().get(url=download_url)
         if r.status_code == 200:
             with open(torrent_path, "wb") as tor:
                 tor.write(r.content)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
 from str2bool import str2bool
 import traceback
 import cli_ui
@@ -12,6 +11,7 @@ import httpx
 
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src import httpclient
 
 
 class TVC():
@@ -209,7 +209,7 @@ class TVC():
             return
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
             try:
                 # some reason this does not return json instead it returns something like below.
                 # b'application/x-bittorrent\n{"success":true,"data":"https:\\/\\/tvchaosuk.com\\/torrent\\/download\\/164633.REDACTED","message":"Torrent uploaded successfully."}'
@@ -235,34 +235,34 @@ class TVC():
 
     async def get_tmdb_data(self, meta):
         import tmdbsimple as tmdb
+        from src.tmdb import get_tv_show, get_tv_season, get_tv_episode
         if meta['category'] == "MOVIE":
             movie = tmdb.Movies(meta['tmdb'])
             response = movie.info()
         else:
-            tv = tmdb.TV(meta['tmdb'])
-            response = tv.info()
+            response = await get_tv_show(meta['tmdb'], [meta['season_int']] if meta.get('season_int') is not None else [])
 
         # TVC stuff
         if meta['category'] == "TV":
-            if hasattr(tv, 'release_dates'):
-                meta['release_dates'] = tv.release_dates()
+            if 'release_dates' in response:
+                meta['release_dates'] = response['release_dates']
 
-            if hasattr(tv, 'networks') and len(tv.networks) != 0 and 'name' in tv.networks[0]:
-                meta['networks'] = tv.networks[0]['name']
+            if response.get('networks') and 'name' in response['networks'][0]:
+                meta['networks'] = response['networks'][0]['name']
 
         try:
             if 'tv_pack' in meta and not meta['tv_pack']:
-                episode_info = tmdb.TV_Episodes(meta['tmdb'], meta['season_int'], meta['episode_int']).info()
+                episode_info = await get_tv_episode(meta['tmdb'], meta['season_int'], meta['episode_int'])
 
                 meta['episode_airdate'] = episode_info['air_date']
                 meta['episode_name'] = episode_info['name']
                 meta['episode_overview'] = episode_info['overview']
             if 'tv_pack' in meta and meta['tv_pack']:
-                season_info = tmdb.TV_Seasons(meta['tmdb'], meta['season_int']).info()
+                season_info = await get_tv_season(meta['tmdb'], meta['season_int'])
                 meta['season_air_first_date'] = season_info['air_date']
 
-                if hasattr(tv, 'first_air_date'):
-                    meta['first_air_date'] = tv.first_air_date
+                if 'first_air_date' in response:
+                    meta['first_air_date'] = response['first_air_date']
         except Exception:
             console.print(traceback.print_exc())
             console.print(f"Unable to get episode information, Make sure episode {meta['season']}{meta['episode']} exists in TMDB. \nhttps://www.themoviedb.org/{meta['category'].lower()}/{meta['tmdb']}/season/{meta['season_int']}")
@@ -301,7 +301,7 @@ class TVC():
         }
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpclient.pooled_client(timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
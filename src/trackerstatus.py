@@ -9,44 +9,85 @@ from src.trackers.COMMON import COMMON
 from src.clients import Clients
 from src.uphelper import UploadHelper
 from src.imdb import get_imdb_info_api
-from src.torrentcreate import create_base_from_existing_torrent
+from src.torrentcreate import create_base_from_existing_torrent, find_base_torrent, wait_for_base_torrent
+from src.metaview import MetaView
+from src import httpclient
 import cli_ui
-import copy
 
 
-async def process_all_trackers(meta):
+async def search_tracker(tracker_name, shared_meta):
+    """
+    Network phase, safe to run for every tracker at once: group lookup, dupe search and dupe filtering.
+    """
+    common = COMMON(config=config)
+    dupe_cache_ttl = config['DEFAULT'].get('dupe_cache_ttl', 900)
+    local_meta = MetaView(shared_meta)  # Each task writes to its own layer, the big parts of meta are shared
+    disctype = local_meta.get('disctype', None)
+    found = {'meta': local_meta, 'dupes': [], 'groupID': None, 'tracker_class': None}
+
+    if local_meta['name'].endswith('DUPE?'):
+        local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
+
+    if tracker_name not in tracker_class_map:
+        return found
+    found['tracker_class'] = tracker_class_map[tracker_name](config=config)
+
+    if tracker_name == "PTP":
+        console.print("[yellow]Searching for Group ID on PTP")
+        ptp = PTP(config=config)
+        found['groupID'] = await ptp.get_group_by_imdb(local_meta['imdb_id'])
+
+    # Raw results are cached for later queue items, filter_dupes below still runs for this one
+    dupes = []
+    search_url = getattr(found['tracker_class'], 'search_url', None)
+    with httpclient.dupe_search_cache(dupe_cache_ttl, refresh=local_meta.get('recheck_dupes', False), search_url=search_url):
+        if tracker_name not in {"THR", "PTP", "TL"}:
+            dupes = await found['tracker_class'].search_existing(local_meta, disctype)
+        elif tracker_name == "PTP":
+            dupes = await ptp.search_existing(found['groupID'], local_meta, disctype)
+
+    if 'skipping' not in local_meta or local_meta['skipping'] is None:
+        dupes = await common.filter_dupes(dupes, local_meta, tracker_name)
+    found['dupes'] = dupes
+    return found
+
+
+async def search_trackers(trackers, meta):
+    """
+    Search every tracker at once, results by tracker name.
+    """
+    searches = await asyncio.gather(*[search_tracker(tracker_name, meta) for tracker_name in trackers])
+    return dict(zip(trackers, searches))
+
+
+def selected_trackers(meta):
+    return [tracker_name.replace(" ", "").upper().strip() for tracker_name in meta['trackers']]
+
+
+async def process_all_trackers(meta, searches=None):
+    """
+    Dupe and banned group checks for every selected tracker. searches are results of
+    search_trackers made earlier for this same meta, trackers missing from it are searched now.
+    """
     tracker_status = {}
     successful_trackers = 0
-    common = COMMON(config=config)
     client = Clients(config=config)
     tracker_setup = TRACKER_SETUP(config=config)
     helper = UploadHelper()
     meta_lock = asyncio.Lock()  # noqa F841
 
-    async def process_single_tracker(tracker_name, shared_meta):
+    async def process_single_tracker(tracker_name, found):
+        """
+        Decision phase, may prompt: banned groups, dupes, PTP extras and the upload confirmation.
+        """
         nonlocal successful_trackers
-        local_meta = copy.deepcopy(shared_meta)  # Ensure each task gets its own copy of meta
+        local_meta = found['meta']
         local_tracker_status = {'banned': False, 'skipped': False, 'dupe': False, 'upload': False}
-        disctype = local_meta.get('disctype', None)
-        tracker_name = tracker_name.replace(" ", "").upper().strip()
-
-        if local_meta['name'].endswith('DUPE?'):
-            local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
-
-        if tracker_name in tracker_class_map:
-            tracker_class = tracker_class_map[tracker_name](config=config)
-            if tracker_name in {"THR", "PTP"}:
-                if local_meta.get('imdb_id', '0') == '0':
-                    imdb_id = "0" if local_meta['unattended'] else cli_ui.ask_string("Unable to find IMDB id, please enter e.g.(tt1234567)")
-                    if imdb_id == "":
-                        meta['imdb_id'] = "0"
-                    else:
-                        meta['imdb_id'] = imdb_id.replace('tt', '').zfill(7)
+        tracker_class = found['tracker_class']
 
+        if tracker_class is not None:
             if tracker_name == "PTP":
-                console.print("[yellow]Searching for Group ID on PTP")
-                ptp = PTP(config=config)
-                groupID = await ptp.get_group_by_imdb(local_meta['imdb_id'])
+                groupID = found['groupID']
                 if groupID is None:
                     console.print("[yellow]No Existing Group found")
                     if local_meta.get('youtube', None) is None or "youtube" not in str(local_meta.get('youtube', '')):
@@ -58,14 +99,8 @@ async def process_all_trackers(meta):
                 console.print(f"[red]Tracker '{tracker_name}' is banned. Skipping.[/red]")
                 local_tracker_status['banned'] = True
 
-            if tracker_name not in {"THR", "PTP", "TL"}:
-                dupes = await tracker_class.search_existing(local_meta, disctype)
-            elif tracker_name == "PTP":
-                dupes = await ptp.search_existing(groupID, local_meta, disctype)
-
             if 'skipping' not in local_meta or local_meta['skipping'] is None:
-                dupes = await common.filter_dupes(dupes, local_meta, tracker_name)
-                local_meta, is_dupe = await helper.dupe_check(dupes, local_meta, tracker_name)
+                local_meta, is_dupe = await helper.dupe_check(found['dupes'], local_meta, tracker_name)
                 if is_dupe:
                     console.print(f"[red]Skipping upload on {tracker_name}[/red]")
                     local_tracker_status['dupe'] = True
@@ -81,6 +116,7 @@ async def process_all_trackers(meta):
                         local_meta['prefer_small_pieces'] = False
                     if str(tracker_config.get('skip_if_rehash', 'false')).lower() == "true":
                         torrent_path = os.path.abspath(f"{local_meta['base_dir']}/tmp/{local_meta['uuid']}/BASE.torrent")
+                        await wait_for_base_torrent(local_meta)
                         if not os.path.exists(torrent_path):
                             check_torrent = await client.find_existing_torrent(local_meta)
                             if check_torrent:
@@ -91,8 +127,7 @@ async def process_all_trackers(meta):
                                     console.print("[yellow]No existing torrent found with piece size lesser than 8MB[yellow]")
                                     local_tracker_status['skipped'] = True
                         elif os.path.exists(torrent_path):
-                            torrent = Torrent.read(torrent_path)
-                            if torrent.piece_size > 8388608:
+                            if find_base_torrent(local_meta, 8388608) is None:
                                 console.print("[yellow]Existing torrent found with piece size greater than 8MB[yellow]")
                                 local_tracker_status['skipped'] = True
 
@@ -125,14 +160,28 @@ async def process_all_trackers(meta):
 
         return tracker_name, local_tracker_status
 
+    # IDs asked for here are needed by the searches below, so ask before they start
+    trackers = selected_trackers(meta)
+    for tracker_name in trackers:
+        if tracker_name in {"THR", "PTP"} and tracker_name in tracker_class_map:
+            if meta.get('imdb_id', '0') == '0':
+                imdb_id = "0" if meta['unattended'] else cli_ui.ask_string("Unable to find IMDB id, please enter e.g.(tt1234567)")
+                if imdb_id == "":
+                    meta['imdb_id'] = "0"
+                else:
+                    meta['imdb_id'] = imdb_id.replace('tt', '').zfill(7)
+
+    # Search every tracker at once, then go through the results in tracker order
+    searches = dict(searches or {})
+    searches.update(await search_trackers([tracker_name for tracker_name in trackers if tracker_name not in searches], meta))
     if meta.get('unattended', False):
-        tasks = [process_single_tracker(tracker_name, meta) for tracker_name in meta['trackers']]
+        tasks = [process_single_tracker(tracker_name, searches[tracker_name]) for tracker_name in trackers]
         results = await asyncio.gather(*tasks)
         for tracker_name, status in results:
             tracker_status[tracker_name] = status
     else:
-        for tracker_name in meta['trackers']:
-            tracker_name, status = await process_single_tracker(tracker_name, meta)
+        for tracker_name in trackers:
+            tracker_name, status = await process_single_tracker(tracker_name, searches[tracker_name])
             tracker_status[tracker_name] = status
 
     if meta['debug']:
@@ -1,6 +1,7 @@
 from src.console import console
-import requests
+from src import httpclient
 import json
+import asyncio
 
 
 async def search_tvmaze(filename, year, imdbID, tvdbID, meta):
@@ -103,7 +104,7 @@ async def _make_tvmaze_request(url, params, meta):
     if meta['debug']:
         print(f"Requesting TVmaze API: {url} with params: {params}")
     try:
-        resp = requests.get(url, params=params)
+        resp = await asyncio.to_thread(httpclient.shared_session().get, url, params=params)
         if resp.ok:
             return resp.json()
         else:
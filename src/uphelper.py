@@ -1,3 +1,6 @@
+import sys
+import asyncio
+import threading
 import cli_ui
 from rich.console import Console
 from data.config import config
@@ -5,6 +8,45 @@ from data.config import config
 console = Console()
 
 
+async def input_in_background(prompt):
+    """
+    input(prompt) that lets the event loop run while it waits, and is cancelled cleanly on an interrupt.
+    Reads stdin from the loop when it can watch it, otherwise from a daemon thread.
+    """
+    loop = asyncio.get_running_loop()
+    answer = loop.create_future()
+
+    def settle(line):
+        if answer.done():
+            return
+        if line:
+            answer.set_result(line.rstrip('\n'))
+        else:
+            answer.set_exception(EOFError())
+
+    print(prompt, end='', flush=True)
+    try:
+        fd = sys.stdin.fileno()
+        loop.add_reader(fd, lambda: settle(sys.stdin.readline()))
+    except (AttributeError, ValueError, OSError, NotImplementedError):
+        # Windows event loops cannot watch stdin
+        fd = None
+
+        def read():
+            try:
+                line = sys.stdin.readline()
+                loop.call_soon_threadsafe(settle, line)
+            except RuntimeError:
+                pass
+
+        threading.Thread(target=read, name="confirmation-input", daemon=True).start()
+    try:
+        return await answer
+    finally:
+        if fd is not None:
+            loop.remove_reader(fd)
+
+
 class UploadHelper:
     async def dupe_check(self, dupes, meta, tracker_name):
         if not dupes:
@@ -45,7 +87,10 @@ class UploadHelper:
 
                 return meta, False
 
-    async def get_confirmation(self, meta):
+    async def get_confirmation(self, meta, background=False):
+        """
+        background reads the answer without blocking the event loop, for when work runs while the prompt waits.
+        """
         if meta['debug'] is True:
             console.print("[bold red]DEBUG: True")
         console.print(f"Prep material saved to {meta['base_dir']}/tmp/{meta['uuid']}")
@@ -93,7 +138,10 @@ class UploadHelper:
 
             console.print("[bold yellow]Is this correct?[/bold yellow]")
             console.print(f"[bold]Name:[/bold] {meta['name']}")
-            confirm = input("Correct? [y/N]: ").strip().lower() == 'y'
+            if background:
+                confirm = (await input_in_background("Correct? [y/N]: ")).strip().lower() == 'y'
+            else:
+                confirm = input("Correct? [y/N]: ").strip().lower() == 'y'
         else:
             console.print(f"[bold]Name:[/bold] {meta['name']}")
             confirm = True
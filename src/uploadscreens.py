@@ -1,4 +1,5 @@
 from src.console import console
+from src import httpclient
 from data.config import config
 import os
 import pyimgbox
@@ -23,7 +24,7 @@ def upload_image_task(args):
                 # Call the asynchronous imgbox_upload function
                 loop = asyncio.get_event_loop()
                 image_list = loop.run_until_complete(
-                    imgbox_upload(os.getcwd(), [image], meta, return_dict={})
+                    imgbox_upload([image], meta, return_dict={})
                 )
                 if image_list and all(
                     'img_url' in img and 'raw_url' in img and 'web_url' in img for img in image_list
@@ -49,7 +50,7 @@ def upload_image_task(args):
             }
             files = [('file-upload[0]', open(image, 'rb'))]
             headers = {'referer': 'https://ptpimg.me/index.php'}
-            response = requests.post(
+            response = httpclient.shared_session().post(
                 "https://ptpimg.me/upload.php", headers=headers, data=payload, files=files, timeout=timeout
             )
             response_data = response.json()
@@ -71,7 +72,7 @@ def upload_image_task(args):
                     'image': encoded_image,
                 }
 
-                response = requests.post(url, data=data, timeout=timeout)
+                response = httpclient.shared_session().post(url, data=data, timeout=timeout)
 
                 if meta['debug']:
                     console.print(f"[yellow]Response status code: {response.status_code}")
@@ -112,7 +113,7 @@ def upload_image_task(args):
                 headers = {
                     'X-API-Key': config['DEFAULT']['ptscreens_api']
                 }
-                response = requests.post(url, headers=headers, files=files, timeout=timeout)
+                response = httpclient.shared_session().post(url, headers=headers, files=files, timeout=timeout)
                 if meta['debug']:
                     console.print(f"[yellow]Response status code: {response.status_code}")
                     console.print(f"[yellow]Response content: {response.content.decode('utf-8')}")
@@ -144,7 +145,7 @@ def upload_image_task(args):
                 headers = {
                     'X-API-Key': config['DEFAULT']['oeimg_api'],
                 }
-                response = requests.post(url, data=data, headers=headers, timeout=timeout)
+                response = httpclient.shared_session().post(url, data=data, headers=headers, timeout=timeout)
                 if meta['debug']:
                     console.print(f"[yellow]Response status code: {response.status_code}")
                     console.print(f"[yellow]Response content: {response.content.decode('utf-8')}")
@@ -176,7 +177,7 @@ def upload_image_task(args):
             files = {
                 'img': ('file-upload[0]', open(image, 'rb'))
             }
-            response = requests.post(url, data=data, files=files, timeout=timeout)
+            response = httpclient.shared_session().post(url, data=data, files=files, timeout=timeout)
             response_data = response.json()
             if response.status_code == 200:
                 raw_url = response_data['th_url'].replace('https://t', 'https://img').replace('/thumbs/', '/images/')
@@ -191,7 +192,7 @@ def upload_image_task(args):
             headers = {
                 'X-API-Key': config['DEFAULT']['lensdump_api']
             }
-            response = requests.post(url, data=data, headers=headers, timeout=timeout)
+            response = httpclient.shared_session().post(url, data=data, headers=headers, timeout=timeout)
             response_data = response.json()
             if response_data.get('status_code') == 200:
                 img_url = response_data['data']['image']['url']
@@ -229,7 +230,7 @@ def upload_screens(meta, screens, img_host_num, i, total_screens, custom_img_lis
 
     import nest_asyncio
     nest_asyncio.apply()
-    os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
+    screens_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
     initial_img_host = config['DEFAULT'][f'img_host_{img_host_num}']
     img_host = meta['imghost']
     using_custom_img_list = isinstance(custom_img_list, list) and bool(custom_img_list)
@@ -238,13 +239,14 @@ def upload_screens(meta, screens, img_host_num, i, total_screens, custom_img_lis
         meta['image_sizes'] = {}
 
     if using_custom_img_list:
-        image_glob = custom_img_list
+        # Bare file names (from glob1) are screenshots in the tmp folder
+        image_glob = [os.path.join(screens_dir, image) for image in custom_img_list]
         existing_images = []
         existing_count = 0
     else:
-        image_glob = glob.glob("*.png")
-        if 'POSTER.png' in image_glob:
-            image_glob.remove('POSTER.png')
+        # root_dir, as release names in the folder can hold glob characters ([SubsPlease], [NTSC]...)
+        image_glob = [image for image in glob.glob("*.png", root_dir=screens_dir) if image != 'POSTER.png']
+        image_glob = [os.path.join(screens_dir, image) for image in image_glob]
         image_glob = list(set(image_glob))
         if meta['debug']:
             console.print("image globs:", image_glob)
@@ -344,9 +346,8 @@ def upload_screens(meta, screens, img_host_num, i, total_screens, custom_img_lis
     return meta['image_list'], len(successfully_uploaded)
 
 
-async def imgbox_upload(chdir, image_glob, meta, return_dict):
+async def imgbox_upload(image_glob, meta, return_dict):
     try:
-        os.chdir(chdir)
         image_list = []
 
         async with pyimgbox.Gallery(thumb_width=350, square_thumbs=False) as gallery:
@@ -0,0 +1,13 @@
+import os
+import sys
+import importlib.util
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, base_dir)
+
+# Modules read data/config.py when imported, a checkout without one is tested against the example
+if not os.path.exists(os.path.join(base_dir, "data", "config.py")):
+    spec = importlib.util.spec_from_file_location("data.config", os.path.join(base_dir, "data", "example-config.py"))
+    example = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(example)
+    sys.modules["data.config"] = example
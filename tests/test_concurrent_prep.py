@@ -0,0 +1,120 @@
+import os
+import json
+import asyncio
+import threading
+import pytest
+from src.discparse import DiscParse
+from src.torrentcreate import create_torrent
+from src.takescreens import disc_screenshots, screens
+
+
+class FakeMediaInfo():
+    """
+    MediaInfo for VOB sets without video: the report names the file as it was given, sets get longer with their number.
+    """
+    @staticmethod
+    def parse(filename, output=None, **kwargs):
+        if output == 'JSON':
+            duration = 100.0 * int(os.path.basename(filename)[4:6])
+            return json.dumps({'media': {'track': [{}, {'Duration': str(duration)}]}})
+        return f"General\r\nComplete name : {filename}\r\n"
+
+
+@pytest.fixture
+def no_chdir(monkeypatch):
+    def chdir(path):
+        raise AssertionError(f"os.chdir({path!r}) changes the working directory of every upload in the process")
+    monkeypatch.setattr(os, "chdir", chdir)
+
+
+def make_dvd(folder, sets):
+    video_ts = folder / "VIDEO_TS"
+    video_ts.mkdir(parents=True)
+    for vob_set in sets:
+        (video_ts / f"VTS_{vob_set}_0.IFO").write_bytes(b"\0" * 64)
+        (video_ts / f"VTS_{vob_set}_1.VOB").write_bytes(b"\0" * 1024)
+    return str(video_ts)
+
+
+def make_release(base_dir, name, size):
+    release = base_dir / name
+    release.mkdir()
+    (release / f"{name}.mkv").write_bytes(os.urandom(size))
+    (release / f"{name}.nfo").write_text("not part of the torrent")
+    uuid = name
+    (base_dir / "tmp" / uuid).mkdir(parents=True)
+    return {
+        'base_dir': str(base_dir), 'uuid': uuid, 'path': str(release), 'isdir': True, 'keep_folder': False, 'is_disc': "",
+        'filelist': [str(release / f"{name}.mkv")], 'trackers': [], 'debug': False, 'max_piece_size': None,
+    }
+
+
+# Release names (and so tmp folders) with brackets, which glob patterns would read as character classes
+def test_two_dvds_parse_in_one_event_loop(tmp_path, monkeypatch, no_chdir):
+    monkeypatch.setattr("src.discparse.MediaInfo", FakeMediaInfo)
+    cwd = os.getcwd()
+    first = make_dvd(tmp_path / "Movie (2001) [NTSC]", ["01", "02"])
+    second = make_dvd(tmp_path / "Second", ["01", "03", "04"])
+
+    async def prep_both():
+        parser = DiscParse()
+        return await asyncio.gather(parser.get_dvdinfo([{'path': first}]), parser.get_dvdinfo([{'path': second}]))
+
+    (first_disc,), (second_disc,) = asyncio.run(prep_both())
+    assert first_disc['main_set'] == ["02_1.VOB"]
+    assert second_disc['main_set'] == ["04_1.VOB"]
+    assert first_disc['vob'] == f"{first}/VTS_02_1.VOB"
+    assert second_disc['ifo'] == f"{second}/VTS_04_0.IFO"
+    # Short reports name just the file, full ones the path in their own release
+    assert "Complete name : VTS_02_1.VOB" in first_disc['vob_mi']
+    assert f"Complete name : {second}/VTS_04_1.VOB" in second_disc['vob_mi_full']
+    assert first_disc['size'] == second_disc['size'] == "DVD5"
+    assert os.getcwd() == cwd
+
+
+def test_two_base_torrents_hash_in_one_event_loop(tmp_path, no_chdir):
+    cwd = os.getcwd()
+    first = make_release(tmp_path, "[SubsPlease] Show - 01 (1080p) [ABCD]", 3 * 1024 * 1024)
+    second = make_release(tmp_path, "Second.Release", 5 * 1024 * 1024)
+
+    async def prep_both():
+        return await asyncio.gather(
+            asyncio.to_thread(create_torrent, first, first['path'], "BASE", threading.Event()),
+            asyncio.to_thread(create_torrent, second, second['path'], "BASE", threading.Event()),
+        )
+
+    first_torrent, second_torrent = asyncio.run(prep_both())
+    for meta, torrent in ((first, first_torrent), (second, second_torrent)):
+        assert os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
+        assert [str(file) for file in torrent.files] == [f"{meta['uuid']}.mkv"]
+        assert torrent.size == os.path.getsize(meta['filelist'][0])
+    assert os.getcwd() == cwd
+
+
+def test_two_blurays_reuse_their_own_screenshots(tmp_path, no_chdir):
+    cwd = os.getcwd()
+    metas = []
+    for name in ("[BD] First [Disc 1]", "Second"):
+        stream = tmp_path / name / "BDMV" / "STREAM"
+        stream.mkdir(parents=True)
+        (stream / "00000.m2ts").write_bytes(b"\0" * 64)
+        (tmp_path / "tmp" / name).mkdir(parents=True)
+        for i in range(screens):
+            (tmp_path / "tmp" / name / f"{name}-{i}.png").write_bytes(b"png")
+        bdinfo = {
+            'path': str(tmp_path / name), 'files': [{'file': "00000.m2ts", 'length': "1:30:00"}],
+            'video': [{'fps': "23.976 fps", 'codec': "MPEG-4 AVC Video", 'hdr_dv': ""}],
+        }
+        metas.append(({'debug': False, 'image_list': [], 'cutoff': 3}, name, bdinfo))
+
+    async def prep_both():
+        await asyncio.gather(*(
+            asyncio.to_thread(disc_screenshots, meta, name, bdinfo, name, str(tmp_path), False, [], False)
+            for meta, name, bdinfo in metas
+        ))
+
+    # Enough screenshots of each release are in its own tmp folder, so nothing is captured
+    asyncio.run(prep_both())
+    for meta, name, bdinfo in metas:
+        assert sorted(os.listdir(tmp_path / "tmp" / name)) == sorted(f"{name}-{i}.png" for i in range(screens))
+    assert os.getcwd() == cwd
@@ -0,0 +1,28 @@
+import os
+import json
+import asyncio
+import pytest
+from src.trackers.COMMON import COMMON
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Release names and meta variations (plain, BDMV and DVD; TV and movies; REPACK, REMUX, UHD, HDTV and HDR
+# flags; BHD and other trackers), with the results of filter_dupes from before the rules were compiled.
+# The DVD cases ran with target_source.includes("DVD") read as "DVD" in target_source, it raised before.
+with open(os.path.join(FIXTURES, "dupe_corpus.json"), encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize("case", CORPUS["cases"], ids=lambda case: f"{case['tracker']}-{case['meta']['is_disc'] or 'file'}-{case['meta']['category']}")
+def test_filter_dupes_matches_golden_corpus(case):
+    common = COMMON(config={})
+    kept = asyncio.run(common.filter_dupes(list(CORPUS["candidates"]), dict(case["meta"]), case["tracker"]))
+    assert kept == [CORPUS["candidates"][i] for i in case["expected"]]
+
+
+def test_compiled_rules_agree_with_filter_dupes():
+    common = COMMON(config={})
+    case = next(case for case in CORPUS["cases"] if case["meta"]["is_disc"] == "DVD")
+    check = common.compile_dupe_rules(dict(case["meta"]), case["tracker"])
+    kept = [each for each in CORPUS["candidates"] if not check(each, common._normalize_filename(each))[0]]
+    assert kept == [CORPUS["candidates"][i] for i in case["expected"]]
@@ -0,0 +1,77 @@
+import asyncio
+import httpx
+import pytest
+from src import httpclient
+
+SEARCH_URL = "https://unit3d.example/api/torrents/filter"
+SHOW = ["Show S01E01 1080p WEB-DL", "Show S01E02 1080p WEB-DL", "Show S01E02 Extended 1080p WEB-DL", "Show S01 1080p WEB-DL", "Show S02E01 1080p WEB-DL"]
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    """
+    A UNIT3D tracker answering its torrent filter the way the site does, recording every request it gets in sent.
+    """
+    sent = []
+    page = {'size': 100}
+
+    def handler(request):
+        sent.append(request)
+        if request.url.path != "/api/torrents/filter":
+            return httpx.Response(200, json={'ok': True})
+        words = request.url.params.get('name', '').split()
+        names = [name for name in SHOW if all(word.lower() in name.lower() for word in words)]
+        data = [{'attributes': {'name': name}} for name in names[:page['size']]]
+        return httpx.Response(200, json={'data': data, 'links': {'next': "page=2" if len(names) > page['size'] else None}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(httpclient, "async_client", lambda: client)
+    monkeypatch.setattr(httpclient, "_search_cache", {})
+    return sent, page
+
+
+async def search(name, refresh=False, search_url=SEARCH_URL):
+    with httpclient.dupe_search_cache(900, refresh=refresh, search_url=search_url):
+        async with httpclient.pooled_client(timeout=5.0) as client:
+            await client.get("https://unit3d.example/login")
+            params = {'api_token': "key", 'tmdbId': 1399, 'categories[]': 2, 'types[]': 5, 'resolutions[]': 3, 'name': name}
+            response = await client.get(url=SEARCH_URL, params=params)
+            return [each['attributes']['name'] for each in response.json()['data']]
+
+
+def searches(sent):
+    return [request for request in sent if request.url.path == "/api/torrents/filter"]
+
+
+def test_episodes_share_one_show_search(tracker):
+    sent, page = tracker
+    assert asyncio.run(search(" S01E01")) == ["Show S01E01 1080p WEB-DL"]
+    assert asyncio.run(search(" S01E02")) == ["Show S01E02 1080p WEB-DL", "Show S01E02 Extended 1080p WEB-DL"]
+    assert asyncio.run(search(" S01E02 Extended")) == ["Show S01E02 Extended 1080p WEB-DL"]
+    assert asyncio.run(search(" S01")) == SHOW[:4]
+    assert [request.url.params['name'] for request in searches(sent)] == [""]
+    # Only the search is cached, not the other requests made around it
+    assert len(sent) - len(searches(sent)) == 4
+
+
+def test_recheck_asks_again(tracker):
+    sent, page = tracker
+    asyncio.run(search(" S01E01"))
+    assert asyncio.run(search(" S01E01", refresh=True)) == ["Show S01E01 1080p WEB-DL"]
+    assert len(searches(sent)) == 2
+
+
+def test_shows_over_a_page_are_searched_by_name(tracker):
+    sent, page = tracker
+    page['size'] = 2
+    assert asyncio.run(search(" S01E02")) == ["Show S01E02 1080p WEB-DL", "Show S01E02 Extended 1080p WEB-DL"]
+    assert asyncio.run(search(" S02E01")) == ["Show S02E01 1080p WEB-DL"]
+    # The incomplete show search is remembered, the second episode goes straight to its own search
+    assert [request.url.params['name'] for request in searches(sent)] == ["", " S01E02", " S02E01"]
+
+
+def test_nothing_cached_without_a_search_url(tracker):
+    sent, page = tracker
+    asyncio.run(search(" S01E01", search_url=None))
+    asyncio.run(search(" S01E01", search_url=None))
+    assert [request.url.params['name'] for request in searches(sent)] == [" S01E01", " S01E01"]
@@ -0,0 +1,37 @@
+import asyncio
+from src import imdb
+
+
+class FakeResponse():
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession():
+    """
+    IMDb's GraphQL endpoint, answering with the next of the given bodies.
+    """
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        return FakeResponse(self.answers.pop(0))
+
+
+def test_null_titles_are_not_cached(monkeypatch):
+    session = FakeSession({'data': None}, {'data': {'title': None}}, {'data': {'title': {'titleText': {'text': "Alien"}}}})
+    monkeypatch.setattr(imdb.httpclient, "shared_session", lambda: session)
+    monkeypatch.setattr(imdb, "_titles", {})
+
+    assert asyncio.run(imdb.get_imdb_title("0078748")) is None
+    assert asyncio.run(imdb.get_imdb_title("0078748")) is None
+    assert asyncio.run(imdb.get_imdb_title("tt0078748"))['titleText']['text'] == "Alien"
+    assert asyncio.run(imdb.get_imdb_title("0078748"))['titleText']['text'] == "Alien"
+    assert session.posts == 3
@@ -0,0 +1,105 @@
+import os
+import gzip
+import shutil
+import asyncio
+import pytest
+from src import imdb
+from src.imdbindex import IMDbIndex, normalize_title
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "imdb")
+
+
+@pytest.fixture
+def index(tmp_path):
+    db_path = str(tmp_path / "imdb_index.db")
+    assert IMDbIndex.build(db_path, FIXTURES) == 9
+    index = IMDbIndex(db_path)
+    yield index
+    index.close()
+
+
+def ids(results):
+    return [result['imdb_id'] for result in results]
+
+
+def test_normalize_title():
+    assert normalize_title("Amélie") == "amelie"
+    assert normalize_title("Spider-Man") == "spider man"
+    assert normalize_title("Fast & Furious") == "fast and furious"
+    assert normalize_title("Alien³") == "alien3"
+
+
+def test_build_leaves_out_episodes_and_games(index):
+    assert index.search("The Office: Pilot") == []
+    assert index.get("tt0664521") is None
+    assert ids(index.search("Alien Game")) == []
+
+
+def test_search_exact_name_first_then_by_votes(index):
+    assert ids(index.search("alien")) == ["tt0078748", "tt0090605", "tt0103644"]
+    assert ids(index.search("Spider-Man")) == ["tt0145487", "tt0112175"]
+
+
+def test_search_by_year(index):
+    assert ids(index.search("Spider Man", 2002)) == ["tt0145487"]
+    assert ids(index.search("spider man", "1994")) == ["tt0112175"]
+    assert index.search("Alien", 1980) == []
+
+
+def test_search_original_titles_and_akas(index):
+    assert ids(index.search("amelie", 2001)) == ["tt0211915"]
+    assert ids(index.search("Die fabelhafte Welt der Amelie")) == ["tt0211915"]
+    assert ids(index.search("le fabuleux destin")) == ["tt0211915"]
+    assert ids(index.search("Sen to Chihiro", 2001)) == ["tt0245429"]
+    assert ids(index.search("Alien 3", 1992)) == ["tt0103644"]
+
+
+def test_get(index):
+    amelie = index.get("tt0211915")
+    assert amelie['title'] == "Amélie"
+    assert amelie['original_title'] == "Le fabuleux destin d'Amélie Poulain"
+    assert amelie['year'] == 2001
+    assert amelie['runtime'] == 122
+    assert amelie['genres'] == "Comedy,Romance"
+    assert amelie['votes'] == 800000
+    assert index.get("0386676")['type'] == "tvSeries"
+    assert index.get("tt9999999")['year'] is None
+    assert index.get("0") is None
+    assert index.get("not an id") is None
+
+
+def test_build_from_gzip_without_ratings(tmp_path):
+    source = tmp_path / "dumps"
+    source.mkdir()
+    for name in ("title.basics.tsv", "title.akas.tsv"):
+        with open(os.path.join(FIXTURES, name), 'rb') as f, gzip.open(source / f"{name}.gz", 'wb') as out:
+            shutil.copyfileobj(f, out)
+    db_path = str(tmp_path / "imdb_index.db")
+    assert IMDbIndex.build(db_path, str(source)) == 9
+    index = IMDbIndex(db_path)
+    try:
+        assert index.get("tt0078748")['votes'] == 0
+        assert ids(index.search("amelie from montmartre")) == ["tt0211915"]
+    finally:
+        index.close()
+
+
+def test_build_needs_title_basics(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        IMDbIndex.build(str(tmp_path / "imdb_index.db"), str(tmp_path))
+
+
+def test_search_imdb_answers_from_the_index_and_falls_back_on_a_miss(index, monkeypatch):
+    searched = []
+
+    def remember(source, params, func):
+        searched.append(params)
+        return [{'title': "Brand New Film", 'year': 2025, 'movieID': "7654321"}]
+
+    monkeypatch.setattr(imdb, "imdb_index", lambda: index)
+    monkeypatch.setattr(imdb.responsecache, "remember", remember)
+
+    assert asyncio.run(imdb.search_imdb("Alien", 1979)) == "0078748"
+    assert searched == []
+    assert asyncio.run(imdb.search_imdb("Brand New Film", 2025)) == "7654321"
+    assert searched == [['search_movie', "Brand New Film"]]
@@ -0,0 +1,59 @@
+import json
+from src.metaview import MetaView
+
+
+def make_meta():
+    return {
+        'name': "Some Movie 2010 1080p BluRay", 'tag': "-GRP", 'trackers': ["BLU", "AITHER"],
+        'discs': [{'name': "DISC1", 'summary': "..."}], 'imdb_info': {'aka': ""},
+    }
+
+
+def test_writes_and_deletes_stay_in_the_view():
+    meta = make_meta()
+    view = MetaView(meta)
+    view['name'] = "Some Movie 2010 1080p BluRay DUPE?"
+    view['skipping'] = "BLU"
+    del view['tag']
+    assert meta['name'] == "Some Movie 2010 1080p BluRay"
+    assert 'skipping' not in meta
+    assert meta['tag'] == "-GRP"
+    assert 'tag' not in view
+    assert view.get('tag') is None
+    assert set(view) == set(meta) - {'tag'} | {'skipping'}
+    view['tag'] = "-OTHER"
+    assert view['tag'] == "-OTHER" and meta['tag'] == "-GRP"
+
+
+def test_mutable_values_are_copied_on_first_read():
+    meta = make_meta()
+    view = MetaView(meta)
+    view['trackers'].append("BHD")
+    assert view['trackers'] == ["BLU", "AITHER", "BHD"]
+    assert meta['trackers'] == ["BLU", "AITHER"]
+
+
+def test_shared_keys_are_not_copied():
+    meta = make_meta()
+    assert MetaView(meta)['discs'] is meta['discs']
+    assert MetaView(meta)['imdb_info'] is meta['imdb_info']
+
+
+def test_views_are_independent():
+    meta = make_meta()
+    first, second = MetaView(meta), MetaView(meta)
+    first['name'] = "first"
+    sibling = first.copy()
+    sibling['name'] = "sibling"
+    assert (first['name'], second['name'], sibling['name']) == ("first", meta['name'], "sibling")
+
+
+def test_pop_and_plain_copy():
+    meta = make_meta()
+    view = MetaView(meta)
+    assert view.pop('tag') == "-GRP"
+    assert view.pop('tag', None) is None
+    assert 'tag' in meta
+    plain = dict(view)
+    assert 'tag' not in plain
+    assert json.loads(json.dumps(plain))['name'] == meta['name']
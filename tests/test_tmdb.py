@@ -0,0 +1,29 @@
+import time
+import asyncio
+from src import tmdb
+
+
+class SlowTV():
+    """
+    tmdbsimple's TV, answering after a blocking wait like a request to TMDb.
+    """
+    def __init__(self, tmdb_id):
+        self.tmdb_id = tmdb_id
+
+    def info(self, **kwargs):
+        time.sleep(0.3)
+        return {'id': self.tmdb_id, 'name': f"Show {self.tmdb_id}"}
+
+
+def test_tmdb_requests_leave_the_event_loop_free(monkeypatch):
+    monkeypatch.setattr(tmdb.tmdb, "TV", SlowTV)
+    monkeypatch.setattr(tmdb, "_tv_shows", {})
+
+    async def two_shows():
+        return await asyncio.gather(tmdb.get_tv_show(1), tmdb.get_tv_show(2))
+
+    start = time.perf_counter()
+    first, second = asyncio.run(two_shows())
+    assert (first['name'], second['name']) == ("Show 1", "Show 2")
+    # Both requests wait at the same time instead of one after the other on the loop
+    assert time.perf_counter() - start < 0.55
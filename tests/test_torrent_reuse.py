@@ -0,0 +1,64 @@
+import os
+import shutil
+import asyncio
+import threading
+import pytest
+from torf import Torrent
+from src.torrentcreate import create_torrent
+
+pytest.importorskip("deluge_client")
+pytest.importorskip("pyrobase")
+from src.clients import Clients  # noqa: E402
+
+
+@pytest.fixture
+def seeded(tmp_path, monkeypatch):
+    """
+    A release and its .torrent in a qBittorrent session dir, with every Torrent.read counted.
+    """
+    name = "Some.Movie.2010"
+    release = tmp_path / name
+    release.mkdir()
+    video = release / f"{name}.mkv"
+    video.write_bytes(os.urandom(40 * 1024 * 1024))
+    (tmp_path / "tmp" / name).mkdir(parents=True)
+    meta = {
+        'base_dir': str(tmp_path), 'uuid': name, 'path': str(release), 'isdir': True, 'keep_folder': False, 'is_disc': None,
+        'filelist': [str(video)], 'trackers': [], 'debug': False, 'max_piece_size': None, 'client': None,
+    }
+    torrent = create_torrent({**meta, 'is_disc': ""}, str(release), "BASE", threading.Event())
+    storage_dir = tmp_path / "BT_backup"
+    storage_dir.mkdir()
+    shutil.copy(tmp_path / "tmp" / name / "BASE.torrent", storage_dir / f"{torrent.infohash}.torrent")
+
+    clients = Clients(config={
+        'DEFAULT': {'default_torrent_client': "qbit"},
+        'TORRENT_CLIENTS': {'qbit': {'torrent_client': "qbit", 'torrent_storage_dir': str(storage_dir), 'enable_search': True}},
+    })
+
+    async def remote_path_map(meta):
+        return "/", "/"
+    monkeypatch.setattr(clients, "remote_path_map", remote_path_map)
+
+    reads = []
+    read = Torrent.read
+    monkeypatch.setattr(Torrent, "read", classmethod(lambda cls, path, *args, **kwargs: reads.append(path) or read(path, *args, **kwargs)))
+    return clients, meta, str(storage_dir / f"{torrent.infohash}.torrent"), reads
+
+
+def test_index_hits_are_checked_without_reading_the_torrent(seeded):
+    clients, meta, torrent_path, reads = seeded
+    assert asyncio.run(clients.find_existing_torrent(meta)) == torrent_path
+    assert asyncio.run(clients.find_existing_torrent({**meta, 'prefer_small_pieces': True})) == torrent_path
+    assert reads == []
+
+
+def test_spot_check_reads_the_chosen_torrent_once(seeded):
+    clients, meta, torrent_path, reads = seeded
+    assert asyncio.run(clients.find_existing_torrent({**meta, 'spot_check': 4})) == torrent_path
+    assert reads == [torrent_path]
+    reads.clear()
+    infohash = os.path.basename(torrent_path)[:-len('.torrent')]
+    clients.config['TORRENT_CLIENTS']['qbit']['enable_search'] = False
+    assert asyncio.run(clients.find_existing_torrent({**meta, 'spot_check': 4, 'torrenthash': infohash})) == torrent_path
+    assert reads == [torrent_path]
@@ -0,0 +1,21 @@
+import asyncio
+from src.trackers.COMMON import COMMON
+
+
+def test_unit3d_torrent_info_uses_an_empty_lookup_without_searching_again(monkeypatch):
+    common = COMMON(config={'TRACKERS': {'BLU': {'api_key': ""}}})
+    searches = []
+
+    async def lookup(*args, **kwargs):
+        searches.append(kwargs)
+        return None
+
+    monkeypatch.setattr(common, "unit3d_torrent_lookup", lookup)
+    args = ("BLU", "https://blutopia.cc/api/torrents/", "https://blutopia.cc/api/torrents/filter", {})
+
+    result = asyncio.run(common.unit3d_torrent_info(*args, file_name="Movie.2010.mkv", json_response=None))
+    assert result == (None,) * 9
+    assert searches == []
+
+    asyncio.run(common.unit3d_torrent_info(*args, file_name="Movie.2010.mkv"))
+    assert searches == [{'id': None, 'file_name': "Movie.2010.mkv"}]
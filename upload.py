@@ -3,7 +3,6 @@ from src.args import Args
 from src.clients import Clients
 from src.uploadscreens import upload_screens
 import json
-from pathlib import Path
 import asyncio
 import os
 import sys
@@ -17,7 +16,12 @@ from src.trackersetup import tracker_class_map, api_trackers, other_api_trackers
 from src.trackerhandle import process_trackers
 from src.queuemanage import handle_queue
 from src.console import console
-from src.torrentcreate import create_torrent, create_random_torrents, create_base_from_existing_torrent
+from src.torrentcreate import bench_hash, create_random_torrents, ensure_base_torrent
+from src.ioscheduler import configure_io
+from src.ratelimit import configure_rate_limits
+from src.imdbindex import build_imdb_index
+from src.responsecache import configure_response_cache, set_offline
+from src import httpclient
 
 cli_ui.setup(color='always', title="Audionut's Upload Assistant")
 
@@ -37,6 +41,9 @@ except Exception:
 from src.prep import Prep  # noqa E402
 client = Clients(config=config)
 parser = Args(config)
+configure_io(config)
+configure_rate_limits(config)
+configure_response_cache(config, base_dir)
 
 
 async def merge_meta(meta, saved_meta, path):
@@ -47,7 +54,8 @@ async def merge_meta(meta, saved_meta, path):
             'trackers', 'dupe', 'debug', 'anon', 'category', 'type', 'screens', 'nohash', 'manual_edition', 'imdb', 'tmdb_manual', 'mal', 'manual',
             'hdb', 'ptp', 'blu', 'no_season', 'no_aka', 'no_year', 'no_dub', 'no_tag', 'no_seed', 'client', 'desclink', 'descfile', 'desc', 'draft',
             'modq', 'region', 'freeleech', 'personalrelease', 'unattended', 'manual_season', 'manual_episode', 'torrent_creation', 'qbit_tag', 'qbit_cat',
-            'skip_imghost_upload', 'imghost', 'manual_source', 'webdv', 'hardcoded-subs', 'dual_audio', 'manual_type', 'tvmaze_manual'
+            'skip_imghost_upload', 'imghost', 'manual_source', 'webdv', 'hardcoded-subs', 'dual_audio', 'manual_type', 'tvmaze_manual',
+            'spot_check'
         ]
         sanitized_saved_meta = {}
         for key, value in saved_meta.items():
@@ -97,20 +105,10 @@ async def process_meta(meta, base_dir):
             json.dump(meta, f, indent=4)
 
         torrent_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
-        if not os.path.exists(torrent_path):
-            reuse_torrent = None
-            if meta.get('rehash', False) is False:
-                reuse_torrent = await client.find_existing_torrent(meta)
-                if reuse_torrent is not None:
-                    await create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
-
-            if meta['nohash'] is False and reuse_torrent is None:
-                create_torrent(meta, Path(meta['path']), "BASE")
-            if meta['nohash']:
-                meta['client'] = "none"
-
-        elif os.path.exists(torrent_path) and meta.get('rehash', False) is True and meta['nohash'] is False:
-            create_torrent(meta, Path(meta['path']), "BASE")
+        torrent_missing = not os.path.exists(torrent_path)
+        await ensure_base_torrent(meta, client)
+        if torrent_missing and meta['nohash']:
+            meta['client'] = "none"
 
         if int(meta.get('randomized', 0)) >= 1:
             create_random_torrents(meta['base_dir'], meta['uuid'], meta['randomized'], meta['path'])
@@ -164,11 +162,22 @@ async def do_the_thing(base_dir):
     if not meta.get('path'):
         exit(0)
 
+    if meta.get('offline'):
+        set_offline(True)
+
     path = meta['path']
     path = os.path.abspath(path)
     if path.endswith('"'):
         path = path[:-1]
 
+    if meta.get('bench_hash'):
+        bench_hash(meta, path)
+        return
+
+    if meta.get('build_imdb_index'):
+        build_imdb_index(base_dir, path, meta.get('debug', False))
+        return
+
     queue, log_file = await handle_queue(path, meta, paths, base_dir)
 
     processed_files_count = 0
@@ -220,6 +229,8 @@ async def do_the_thing(base_dir):
             finish_time = time.time()
             console.print(f"Uploads processed in {finish_time - start_time:.4f} seconds")
 
+    await httpclient.close_all(base_meta['debug'])
+
 
 if __name__ == '__main__':
     pyver = platform.python_version_tuple()